@@ -0,0 +1,95 @@
+"""Замер декодирования входящих websocket-кадров (кадров/с на одно ядро).
+
+Запуск из каталога api-gateway:
+
+    python -m benchmarks.websocket_decode
+"""
+
+import json
+import time
+from typing import Union
+
+from pydantic import TypeAdapter
+
+from src.api.websocket import is_pong
+from src.schemas.websocket.websocket import (AddReactionEvent,
+                                             DeleteMessageEvent,
+                                             EditMessageEvent,
+                                             ForwardMessagesEvent,
+                                             ReadMessagesEvent,
+                                             RemoveReactionEvent,
+                                             SendMessageEvent,
+                                             incoming_message_adapter)
+
+# Прежний IncomingMessage: обычный Union без дискриминатора
+BaselineIncomingMessage = Union[
+    SendMessageEvent,
+    DeleteMessageEvent,
+    EditMessageEvent,
+    ReadMessagesEvent,
+    AddReactionEvent,
+    RemoveReactionEvent,
+    ForwardMessagesEvent,
+]
+
+FRAMES = [
+    json.dumps(
+        {
+            "event_type": "send_message",
+            "request_id": "req_12345",
+            "payload": {"chat_id": 123456, "content": "Hello, this is a test message"},
+        }
+    ),
+    json.dumps(
+        {
+            "event_type": "mark_as_read",
+            "request_id": "req_22222",
+            "payload": {
+                "chat_id": 123456,
+                "last_read_message": "68d2a5cf5d2c4c4f0f7f8a11",
+            },
+        }
+    ),
+    json.dumps(
+        {
+            "event_type": "forward_messages",
+            "request_id": "req_33333",
+            "payload": {
+                "chat_id": 123456,
+                "messages": ["68d2a5cf5d2c4c4f0f7f8a11", "68d2a5cf5d2c4c4f0f7f8a12"],
+            },
+        }
+    ),
+    json.dumps({"type": "pong"}),
+]
+
+
+def decode_before(raw: str):
+    # Как прежний обработчик: receive_json и новый TypeAdapter на каждый кадр
+    data = json.loads(raw)
+    if data == {"type": "pong"}:
+        return None
+    return TypeAdapter(BaselineIncomingMessage).validate_python(data)
+
+
+def decode_after(raw: str):
+    if is_pong(raw):
+        return None
+    return incoming_message_adapter.validate_json(raw)
+
+
+def run(decode, iterations: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        for frame in FRAMES:
+            decode(frame)
+    elapsed = time.perf_counter() - started_at
+    return iterations * len(FRAMES) / elapsed
+
+
+if __name__ == "__main__":
+    iterations = 20_000
+    for decode in (decode_before, decode_after):
+        decode(FRAMES[0])
+        rate = run(decode, iterations)
+        print(f"{decode.__name__}: {rate:,.0f} frames/s")
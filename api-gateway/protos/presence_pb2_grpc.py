@@ -45,11 +45,26 @@ class PresenceStub(object):
                 request_serializer=presence__pb2.Id.SerializeToString,
                 response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
                 _registered_method=True)
+        self.SetOnlineMany = channel.unary_unary(
+                '/presence.Presence/SetOnlineMany',
+                request_serializer=presence__pb2.SetOnlineManyRequest.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
+        self.SetOfflineMany = channel.unary_unary(
+                '/presence.Presence/SetOfflineMany',
+                request_serializer=presence__pb2.SetOfflineManyRequest.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
         self.RefreshOnline = channel.unary_unary(
                 '/presence.Presence/RefreshOnline',
                 request_serializer=presence__pb2.RefreshOnlineRequest.SerializeToString,
                 response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
                 _registered_method=True)
+        self.RefreshOnlineMany = channel.unary_unary(
+                '/presence.Presence/RefreshOnlineMany',
+                request_serializer=presence__pb2.RefreshOnlineManyRequest.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
         self.GetUserStatus = channel.unary_unary(
                 '/presence.Presence/GetUserStatus',
                 request_serializer=presence__pb2.Id.SerializeToString,
@@ -77,12 +92,30 @@ class PresenceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SetOnlineMany(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetOfflineMany(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def RefreshOnline(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def RefreshOnlineMany(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetUserStatus(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -108,11 +141,26 @@ def add_PresenceServicer_to_server(servicer, server):
                     request_deserializer=presence__pb2.Id.FromString,
                     response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
             ),
+            'SetOnlineMany': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetOnlineMany,
+                    request_deserializer=presence__pb2.SetOnlineManyRequest.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
+            'SetOfflineMany': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetOfflineMany,
+                    request_deserializer=presence__pb2.SetOfflineManyRequest.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
             'RefreshOnline': grpc.unary_unary_rpc_method_handler(
                     servicer.RefreshOnline,
                     request_deserializer=presence__pb2.RefreshOnlineRequest.FromString,
                     response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
             ),
+            'RefreshOnlineMany': grpc.unary_unary_rpc_method_handler(
+                    servicer.RefreshOnlineMany,
+                    request_deserializer=presence__pb2.RefreshOnlineManyRequest.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
             'GetUserStatus': grpc.unary_unary_rpc_method_handler(
                     servicer.GetUserStatus,
                     request_deserializer=presence__pb2.Id.FromString,
@@ -188,6 +236,60 @@ class Presence(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def SetOnlineMany(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/presence.Presence/SetOnlineMany',
+            presence__pb2.SetOnlineManyRequest.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SetOfflineMany(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/presence.Presence/SetOfflineMany',
+            presence__pb2.SetOfflineManyRequest.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def RefreshOnline(request,
             target,
@@ -215,6 +317,33 @@ class Presence(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def RefreshOnlineMany(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/presence.Presence/RefreshOnlineMany',
+            presence__pb2.RefreshOnlineManyRequest.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetUserStatus(request,
             target,
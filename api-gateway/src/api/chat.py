@@ -1,17 +1,35 @@
 from fastapi import APIRouter, Depends
+from loguru import logger
 
-from src.dependencies import get_chat_service, get_user_id
+from src.dependencies import get_chat_service, get_rpc_message_service, get_user_id
 from src.infrastructure.grpc_clients.chat import RpcChatService
+from src.infrastructure.grpc_clients.message import RpcMessageService
 from src.schemas.api.chat import *
+from src.utils.exceptions import GrpcError
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
 
 @router.get("/me")
 async def get_chat_by_user_id(
-    user_id=Depends(get_user_id), _service: RpcChatService = Depends(get_chat_service)
+    user_id=Depends(get_user_id),
+    _service: RpcChatService = Depends(get_chat_service),
+    _message_service: RpcMessageService = Depends(get_rpc_message_service),
 ) -> MultipleChatsResponse:
     response = await _service.get_chats_by_user_id(user_id)
+    if not response.chats:
+        return response
+
+    try:
+        unread_counts = await _message_service.get_unread_counts(
+            user_id, [chat.id for chat in response.chats]
+        )
+    except GrpcError as e:
+        # Список чатов важнее бейджей - отдаем его без счетчиков
+        logger.warning(f"Не удалось получить счетчики непрочитанных: {e.detail}")
+        return response
+    for chat in response.chats:
+        chat.unread_count = unread_counts.get(chat.id, 0)
     return response
 
 
@@ -2,26 +2,34 @@ import asyncio
 
 from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect
 from loguru import logger
-from pydantic import TypeAdapter, ValidationError
+from pydantic import ValidationError
+from pydantic_core import from_json
 
-from src.dependencies import (get_connection_manager, get_presence_service,
-                              get_user_id_for_websocket, get_websocket_handler)
-from src.infrastructure.grpc_clients.presence import RpcPresenceService
+from src.dependencies import (get_connection_manager, get_user_id_for_websocket,
+                              get_websocket_handler)
 from src.infrastructure.websocket.handler import WebsocketHandler
 from src.infrastructure.websocket.manager import ConnectionManager
 from src.schemas.websocket.websocket import *
-from src.utils.exceptions import GrpcError
 
 router = APIRouter(prefix="/ws", tags=["Websockets"])
 
 PING_INTERVAL = 30
 
 
+def is_pong(raw: str) -> bool:
+    # Полный разбор JSON только для кадров, похожих на pong
+    if '"pong"' not in raw:
+        return False
+    try:
+        return from_json(raw) == {"type": "pong"}
+    except ValueError:
+        return False
+
+
 @router.websocket("")
 async def connection(
     ws: WebSocket,
     user_id=Depends(get_user_id_for_websocket),
-    _presence_service: RpcPresenceService = Depends(get_presence_service),
     _websocket_manager: WebsocketHandler = Depends(get_websocket_handler),
     _connection_manager: ConnectionManager = Depends(get_connection_manager),
 ):
@@ -30,21 +38,17 @@ async def connection(
     try:
         while True:
             try:
-                recieve_data = await asyncio.wait_for(
-                    ws.receive_json(), timeout=PING_INTERVAL
+                raw_data = await asyncio.wait_for(
+                    ws.receive_text(), timeout=PING_INTERVAL
                 )
-                try:
-                    await _presence_service.refresh_online(user_id)
-                except GrpcError as e:
-                    logger.warning(f"Failed to refresh online status: {e.detail}")
-                if recieve_data == {"type": "pong"}:
+                _connection_manager.heartbeat(user_id)
+                if is_pong(raw_data):
                     continue
 
                 try:
-                    message: IncomingMessage = TypeAdapter(
-                        IncomingMessage
-                    ).validate_python(recieve_data)
-                    print(message)
+                    message: IncomingMessage = incoming_message_adapter.validate_json(
+                        raw_data
+                    )
                 except ValidationError as e:
                     await ws.send_json(
                         ErrorResponse(
@@ -53,6 +57,7 @@ async def connection(
                             )
                         ).model_dump()
                     )
+                    continue
 
                 result = await _websocket_manager.handle_incoming_message(
                     user_id, message
@@ -1,5 +1,10 @@
+import socket
+
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from src.utils.enums.websocket_enums import OverflowPolicyEnum
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env")
@@ -20,6 +25,9 @@ class Settings(BaseSettings):
     # --- KAFKA ---
     KAFKA_HOST: str = "localhost"
     KAFKA_PORT: int = 9092
+    # Пакетное чтение message.events: записей за раз и ожидание пачки
+    KAFKA_MESSAGE_BATCH_SIZE: int = 500
+    KAFKA_MESSAGE_BATCH_TIMEOUT_MS: int = 20
 
     # --- REDIS ---
     REDIS_HOST: str = "localhost"
@@ -29,6 +37,24 @@ class Settings(BaseSettings):
     def REDIS_URL(self):
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}"
 
+    REDIS_PUBLISH_BATCH_SIZE: int = 500
+
+    # --- GATEWAY ---
+    GATEWAY_NODE_ID: str = Field(default_factory=socket.gethostname)
+    GATEWAY_ROUTE_TTL: int = 90
+
+    # --- WEBSOCKET ---
+    WS_SEND_QUEUE_SIZE: int = 256
+    WS_OVERFLOW_POLICY: OverflowPolicyEnum = OverflowPolicyEnum.DROP_OLDEST
+    WS_STATS_INTERVAL: float = 60.0
+
+    # --- PRESENCE ---
+    PRESENCE_TTL: int = 60
+    # Доля TTL, после которой heartbeat соединения снова отправляется в presence
+    PRESENCE_REFRESH_FRACTION: float = 0.5
+    PRESENCE_FLUSH_INTERVAL: float = 5.0
+    PRESENCE_TRANSITION_LINGER: float = 0.2
+
     # --- JWT ---
     SECRET_KEY: str = "Secret key"
     JWT_ALGORITHM: str = "HS256"
@@ -15,6 +15,9 @@ from src.infrastructure.grpc_clients.message import RpcMessageService
 from src.infrastructure.grpc_clients.presence import RpcPresenceService
 from src.infrastructure.grpc_clients.user import RpcUserService
 from src.infrastructure.redis_publishers.notifier import RedisNotifier
+from src.infrastructure.redis_registry.connections import connection_registry
+from src.infrastructure.redis_subscribers.listener import notification_listener
+from src.infrastructure.websocket.heartbeat import presence_heartbeat
 from src.infrastructure.websocket.handler import WebsocketHandler
 from src.infrastructure.websocket.manager import ConnectionManager
 from src.utils.utils import decode_jwt
@@ -97,8 +100,14 @@ def get_kafka_router():
     return kafka_router
 
 
-def get_redis_publisher(redis=Depends(get_redis)):
-    return RedisNotifier(redis)
+def get_connection_registry():
+    return connection_registry
+
+
+def get_redis_publisher(
+    redis=Depends(get_redis), registry=Depends(get_connection_registry)
+):
+    return RedisNotifier(redis, registry)
 
 
 def get_message_service(
@@ -131,9 +140,16 @@ def get_websocket_handler(message_service=Depends(get_rpc_message_service)):
     return WebsocketHandler(message_service)
 
 
+def get_notification_listener():
+    return notification_listener
+
+
+def get_presence_heartbeat():
+    return presence_heartbeat
+
+
 def get_connection_manager(
-    presence_service=Depends(get_presence_service), redis_client=Depends(get_redis)
+    listener=Depends(get_notification_listener),
+    heartbeat=Depends(get_presence_heartbeat),
 ):
-    return ConnectionManager(
-        presence_service=presence_service, redis_client=redis_client
-    )
+    return ConnectionManager(listener=listener, heartbeat=heartbeat)
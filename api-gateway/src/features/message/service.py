@@ -1,138 +1,140 @@
-from collections import defaultdict
 from typing import Union
 
 from faststream.kafka import KafkaRouter
 from loguru import logger
-from pydantic import TypeAdapter
 
-from src.infrastructure.redis_publishers.notifier import RedisNotifier
+from src.infrastructure.redis_publishers.notifier import (Notification,
+                                                          RedisNotifier)
 from src.schemas.events.message import (AddReactionEvent,
                                         CreatedManyMessagesEvent,
                                         CreatedMessageEvent,
-                                        DeleteMessageEvent, MessagesReadEvent,
+                                        DeleteMessageEvent, IncomingMessage,
+                                        MessagesReadEvent,
                                         RemoveReactionEvent,
                                         UpdateMessageEvent)
 
 
 class MessageService:
+    """Превращает события message.events в уведомления пользователям.
+
+    Каждое событие дает список пар (получатели, кадр); уведомления всей
+    пачки Kafka-записей уходят в Redis одной рассылкой.
+    """
+
     def __init__(self, router: KafkaRouter, redis_publisher: RedisNotifier):
         self.router = router
         self.read_message_pub = self.router.publisher("api_gateway.messages_read")
         self.redis_publisher = redis_publisher
-
-    async def send_message(self, data: CreatedMessageEvent):
-        logger.info(f"Пришло сообщение {data.event_type}")
-        # payload = data.data.model_dump(mode="json")
-        payload = data.data
+        self.handlers = {
+            "MessageCreated": self.message_created,
+            "MessagesCreated": self.messages_created,
+            "MessageUpdated": self.message_updated,
+            "MessageDeleted": self.message_deleted,
+            "ReactionAdded": self.reaction_event,
+            "ReactionRemoved": self.reaction_event,
+            "MessagesRead": self.messages_read,
+        }
+
+    async def process_batch(self, events: list[IncomingMessage]):
+        notifications = []
+        for event in events:
+            handler = self.handlers.get(event.event_type)
+            if handler is None:
+                logger.warning(
+                    f"Пропущено событие неизвестного типа {event.event_type}"
+                )
+                continue
+            notifications.extend(handler(event))
+        await self.redis_publisher.broadcast_many(notifications)
+
+    def message_created(self, data: CreatedMessageEvent) -> list[Notification]:
         sender_id = data.sender_id
         recievers = [x for x in data.recievers if x != sender_id]
+        return [
+            (recievers, {"event_type": "new_message", "payload": data.data}),
+            (
+                [sender_id],
+                {
+                    "event_type": "message_sended",
+                    "payload": data.data,
+                    "request_id": data.request_id,
+                },
+            ),
+        ]
 
-        await self.redis_publisher.broadcast(
-            recievers, {"event_type": "new_message", "payload": payload}
-        )
-
-        personal_payload = payload.copy()
-        await self.redis_publisher.publish_to_user(
-            user_id=sender_id,
-            data={
-                "event_type": "message_sended",
-                "payload": personal_payload,
-                "request_id": data.request_id,
-            },
-        )
-
-    async def forward_messages(self, data: CreatedManyMessagesEvent):
-        logger.info(f"Пришло сообщение {data.event_type}")
-        # payload = data.data.model_dump(mode="json")
-        payload = data.data
+    def messages_created(self, data: CreatedManyMessagesEvent) -> list[Notification]:
         sender_id = data.sender_id
         recievers = [x for x in data.recievers if x != sender_id]
+        return [
+            (recievers, {"event_type": "new_messages", "payload": data.data}),
+            (
+                [sender_id],
+                {
+                    "event_type": "messages_sended",
+                    "payload": data.data,
+                    "request_id": data.request_id,
+                },
+            ),
+        ]
 
-        await self.redis_publisher.broadcast(
-            recievers, {"event_type": "new_messages", "payload": payload}
-        )
-
-        personal_payload = payload.copy()
-        await self.redis_publisher.publish_to_user(
-            user_id=sender_id,
-            data={
-                "event_type": "messages_sended",
-                "payload": personal_payload,
-                "request_id": data.request_id,
-            },
-        )
-
-    async def update_message(self, data: UpdateMessageEvent):
-        logger.info(f"Пришло сообщение {data.event_type}")
+    def message_updated(self, data: UpdateMessageEvent) -> list[Notification]:
         payload = data.data.model_dump(mode="json")
         sender_id = data.sender_id
         recievers = [x for x in data.recievers if x != sender_id]
+        return [
+            (recievers, {"event_type": "update_message", "payload": payload}),
+            (
+                [sender_id],
+                {
+                    "event_type": "message_updated",
+                    "payload": payload,
+                    "request_id": data.request_id,
+                },
+            ),
+        ]
 
-        await self.redis_publisher.broadcast(
-            recievers, {"event_type": "update_message", "payload": payload}
-        )
-
-        await self.redis_publisher.publish_to_user(
-            user_id=sender_id,
-            data={
-                "event_type": "message_updated",
-                "payload": payload,
-                "request_id": data.request_id,
-            },
-        )
-
-    async def delete_message(self, data: DeleteMessageEvent):
-        logger.info(f"Пришло сообщение {data.event_type}")
+    def message_deleted(self, data: DeleteMessageEvent) -> list[Notification]:
         payload = data.data.model_dump(mode="json")
         sender_id = data.sender_id
         recievers = [x for x in data.recievers if x != sender_id]
-
-        await self.redis_publisher.broadcast(
-            recievers, {"event_type": "delete_message", "payload": payload}
-        )
-
-        await self.redis_publisher.publish_to_user(
-            user_id=sender_id,
-            data={
-                "event_type": "message_deleted",
-                "payload": payload,
-                "request_id": data.request_id,
-            },
-        )
-
-    async def mark_as_read(self, data: MessagesReadEvent):
-        logger.info(f"Пришло сообщение {data.event_type}")
-        data_payload = data.data
-
-        logger.info(data_payload)
-
-        for message in data_payload:
-            message_id = message.id
-            author = message.sender_id
-            await self.redis_publisher.publish_to_user(
-                user_id=author,
-                data={
+        return [
+            (recievers, {"event_type": "delete_message", "payload": payload}),
+            (
+                [sender_id],
+                {
+                    "event_type": "message_deleted",
+                    "payload": payload,
+                    "request_id": data.request_id,
+                },
+            ),
+        ]
+
+    def messages_read(self, data: MessagesReadEvent) -> list[Notification]:
+        return [
+            (
+                [message.sender_id],
+                {
                     "event_type": "read_cursor_updated",
-                    "payload": {"cursor_id": message_id},
+                    "payload": {"cursor_id": message.id},
                 },
             )
-
-    async def reaction_event(self, data: Union[AddReactionEvent, RemoveReactionEvent]):
-        logger.info(f"Пришло сообщение: {data.event_type}")
-        sender_id = data.sender_id
-        recievers = data.recievers
-        payload = data.data.model_dump(mode="json")
-
-        logger.info(payload)
-        await self.redis_publisher.broadcast(
-            recievers,
-            {
-                "event_type": (
-                    "add_reaction"
-                    if data.event_type == "ReactionAdded"
-                    else "remove_reaction"
-                ),
-                "payload": payload,
-                "sender_id": sender_id,
-            },
-        )
+            for message in data.data
+        ]
+
+    def reaction_event(
+        self, data: Union[AddReactionEvent, RemoveReactionEvent]
+    ) -> list[Notification]:
+        return [
+            (
+                data.recievers,
+                {
+                    "event_type": (
+                        "add_reaction"
+                        if data.event_type == "ReactionAdded"
+                        else "remove_reaction"
+                    ),
+                    "payload": data.data.model_dump(mode="json"),
+                    "sender_id": data.sender_id,
+                },
+            )
+        ]
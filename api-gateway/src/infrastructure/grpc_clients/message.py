@@ -130,3 +130,12 @@ class RpcMessageService:
         )
         response = await self.stub.ForwardMessage(request)
         return response
+
+    @handle_grpc_exceptions()
+    async def get_unread_counts(
+        self, user_id: int, chat_ids: list[int]
+    ) -> dict[int, int]:
+        request = message_pb2.GetUnreadCountsRequest(user_id=user_id, chat_ids=chat_ids)
+        response = await self.stub.GetUnreadCounts(request)
+        logger.info(f"Получены счетчики непрочитанных для {len(chat_ids)} чатов")
+        return {count.chat_id: count.unread_count for count in response.counts}
@@ -27,12 +27,30 @@ class RpcPresenceService:
         await self.stub.SetOffline(request)
         logger.info(f"Пользователь {user_id} не в сети")
 
+    @handle_grpc_exceptions()
+    async def set_online_many(self, user_ids: list[int], ttl: int | None = None):
+        request = presence_pb2.SetOnlineManyRequest(ids=user_ids, ttl=ttl)
+        await self.stub.SetOnlineMany(request)
+        logger.info(f"{len(user_ids)} пользователей в сети")
+
+    @handle_grpc_exceptions()
+    async def set_offline_many(self, user_ids: list[int]):
+        request = presence_pb2.SetOfflineManyRequest(ids=user_ids)
+        await self.stub.SetOfflineMany(request)
+        logger.info(f"{len(user_ids)} пользователей не в сети")
+
     @handle_grpc_exceptions()
     async def refresh_online(self, user_id: int, ttl: int | None = None):
         request = presence_pb2.RefreshOnlineRequest(id=user_id, ttl=ttl)
         await self.stub.RefreshOnline(request)
         logger.info(f"Обновлен онлайн статус для {user_id}")
 
+    @handle_grpc_exceptions()
+    async def refresh_online_many(self, user_ids: list[int], ttl: int | None = None):
+        request = presence_pb2.RefreshOnlineManyRequest(ids=user_ids, ttl=ttl)
+        await self.stub.RefreshOnlineMany(request)
+        logger.info(f"Обновлен онлайн статус для {len(user_ids)} пользователей")
+
     @handle_grpc_exceptions()
     async def get_user_status(self, user_id: int) -> UserStatus:
         request = presence_pb2.Id(id=user_id)
@@ -0,0 +1,72 @@
+import json
+
+from faststream.kafka import KafkaMessage
+from google.protobuf.json_format import MessageToDict
+from google.protobuf.message import DecodeError
+from loguru import logger
+
+from protos import message_pb2
+
+PROTOBUF_CONTENT_TYPE = "application/x-protobuf"
+
+
+def _message_payload(message: message_pb2.Message) -> dict:
+    """Повторяет JSON-форму MessagePayload из message-service."""
+    metadata = message.metadata
+    return {
+        "id": message.id,
+        "chat_id": message.chat_id,
+        "user_id": message.user_id,
+        "content": message.content,
+        "created_at": message.created_at.ToJsonString(),
+        "metadata": {
+            "is_edited": metadata.is_edited,
+            "is_pinned": metadata.is_pinned,
+            "reactions": {
+                reaction: list(reacted_by.users_id)
+                for reaction, reacted_by in metadata.reactions.items()
+            },
+            "reply_to": (
+                MessageToDict(metadata.reply_to, preserving_proto_field_name=True)
+                if metadata.HasField("reply_to")
+                else None
+            ),
+            "forward_from": (
+                MessageToDict(metadata.forward_from, preserving_proto_field_name=True)
+                if metadata.HasField("forward_from")
+                else None
+            ),
+            # В protobuf-событии превью ссылки нет
+            "url_preview": None,
+        },
+    }
+
+
+def decode_created_event(body: bytes) -> dict:
+    event = message_pb2.MessageCreatedEvent.FromString(body)
+    data = [_message_payload(message) for message in event.data]
+    return {
+        "event_type": event.event_type,
+        "version": event.version,
+        "recievers": list(event.recievers),
+        "data": data[0] if event.event_type == "MessageCreated" else data,
+        "request_id": event.request_id,
+        "sender_id": event.sender_id,
+    }
+
+
+async def decode_message_batch(msg: KafkaMessage, original_decoder) -> list[dict]:
+    """Декодер пачки message.events: protobuf или JSON по content-type записи.
+
+    Битая запись пропускается, остальные записи пачки обрабатываются.
+    """
+    records = []
+    for body, headers in zip(msg.body, msg.batch_headers):
+        try:
+            if headers.get("content-type") == PROTOBUF_CONTENT_TYPE:
+                records.append(decode_created_event(body))
+            else:
+                records.append(json.loads(body))
+        except (DecodeError, ValueError) as e:
+            logger.warning(f"Пропущена нечитаемая запись message.events: {e}")
+    return records
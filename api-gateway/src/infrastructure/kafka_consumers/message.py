@@ -1,30 +1,36 @@
-from fastapi import Depends
-from faststream.annotations import ContextRepo
-from faststream.kafka import KafkaRouter
-from pydantic import TypeAdapter
+from loguru import logger
+from pydantic import TypeAdapter, ValidationError
 
+from src.core.config import settings
 from src.core.kafka import router
-from src.dependencies import get_message_service
+from src.core.redis import redis
 from src.features.message.service import MessageService
-from src.schemas.events.message import *
+from src.infrastructure.kafka_consumers.decoders import decode_message_batch
+from src.infrastructure.redis_publishers.notifier import RedisNotifier
+from src.infrastructure.redis_registry.connections import connection_registry
+from src.schemas.events.message import IncomingMessage
+
+incoming_message_adapter = TypeAdapter(IncomingMessage)
+message_service = MessageService(
+    router=router, redis_publisher=RedisNotifier(redis, connection_registry)
+)
 
 
 @router.subscriber(
-    "message.events", group_id="api-gateway_message", auto_offset_reset="earliest"
+    "message.events",
+    group_id="api-gateway_message",
+    auto_offset_reset="earliest",
+    batch=True,
+    max_records=settings.KAFKA_MESSAGE_BATCH_SIZE,
+    batch_timeout_ms=settings.KAFKA_MESSAGE_BATCH_TIMEOUT_MS,
+    decoder=decode_message_batch,
 )
-async def message_event(
-    data: IncomingMessage, service: MessageService = Depends(get_message_service)
-):
-    message: IncomingMessage = TypeAdapter(IncomingMessage).validate_python(data)
-    if message.event_type == "MessageCreated":
-        await service.send_message(data)
-    elif message.event_type == "MessagesCreated":
-        await service.forward_messages(data)
-    elif message.event_type == "MessageUpdated":
-        await service.update_message(data)
-    elif message.event_type == "MessageDeleted":
-        await service.delete_message(data)
-    elif message.event_type in ["ReactionAdded", "ReactionRemoved"]:
-        await service.reaction_event(data)
-    elif message.event_type == "MessagesRead":
-        await service.mark_as_read(data)
+async def message_events(records: list[dict]):
+    events = []
+    for record in records:
+        try:
+            events.append(incoming_message_adapter.validate_python(record))
+        except ValidationError as e:
+            logger.warning(f"Пропущено некорректное событие message.events: {e}")
+    logger.info(f"Пришла пачка message.events: {len(events)}/{len(records)}")
+    await message_service.process_batch(events)
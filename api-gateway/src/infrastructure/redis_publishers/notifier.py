@@ -1,25 +1,102 @@
-import asyncio
 import json
+import time
+from collections import defaultdict
 
 from loguru import logger
 from redis.asyncio import Redis
 
+from src.core.config import settings
+from src.infrastructure.redis_registry.connections import (ConnectionRegistry,
+                                                           get_node_channel)
+
+# Получатели и кадр одного уведомления
+Notification = tuple[list[int], dict]
+
 
 class RedisNotifier:
-    def __init__(self, redis_client: Redis) -> None:
+    def __init__(
+        self,
+        redis_client: Redis,
+        registry: ConnectionRegistry,
+        batch_size: int = settings.REDIS_PUBLISH_BATCH_SIZE,
+    ) -> None:
         self.redis_client = redis_client
-
-    def _get_notification_channel(self, user_id: int):
-        return f"user_notifications:{user_id}"
+        self.registry = registry
+        self.batch_size = batch_size
 
     async def publish_to_user(self, user_id: int, data: dict):
-        channel_name = self._get_notification_channel(user_id)
-        json_data = json.dumps(data)
-        await self.redis_client.publish(channel_name, json_data)
+        await self.broadcast([user_id], data)
         logger.info(f"Отправлено сообщение пользователю {user_id}")
 
     async def broadcast(self, recievers: list[int], data: dict):
-        coros = []
-        for reciever in recievers:
-            coros.append(self.publish_to_user(reciever, data))
-        asyncio.gather(*coros)
+        """Отправляет один кадр на каждый узел шлюза, где есть сокеты получателей.
+
+        Получатели без активных подключений пропускаются.
+        """
+        if not recievers:
+            return
+        json_data = json.dumps(data)
+        for start in range(0, len(recievers), self.batch_size):
+            batch = recievers[start : start + self.batch_size]
+            started_at = time.perf_counter()
+            routes = await self.registry.lookup(batch)
+            if not routes:
+                continue
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for node_id, user_ids in routes.items():
+                    frame = ",".join(map(str, user_ids)) + "\n" + json_data
+                    pipe.publish(get_node_channel(node_id), frame)
+                await pipe.execute()
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            online_count = sum(len(user_ids) for user_ids in routes.values())
+            logger.info(
+                f"Отправлено сообщение {online_count}/{len(batch)} пользователям "
+                f"на {len(routes)} узлов за {elapsed_ms:.1f} мс"
+            )
+
+    async def broadcast_many(self, notifications: list[Notification]):
+        """Рассылает пачку уведомлений одним pipeline.
+
+        Маршруты ищутся один раз для всех получателей пачки. Каждый узел
+        получает один кадр, где уведомления для его пользователей идут
+        подряд в исходном порядке.
+        """
+        recipients = list(
+            {user_id for recievers, _ in notifications for user_id in recievers}
+        )
+        if not recipients:
+            return
+        started_at = time.perf_counter()
+        user_nodes = defaultdict(list)
+        for start in range(0, len(recipients), self.batch_size):
+            routes = await self.registry.lookup(
+                recipients[start : start + self.batch_size]
+            )
+            for node_id, user_ids in routes.items():
+                for user_id in user_ids:
+                    user_nodes[user_id].append(node_id)
+        if not user_nodes:
+            return
+
+        frames = defaultdict(list)
+        for recievers, data in notifications:
+            node_users = defaultdict(list)
+            for user_id in recievers:
+                for node_id in user_nodes.get(user_id, ()):
+                    node_users[node_id].append(user_id)
+            if not node_users:
+                continue
+            json_data = json.dumps(data)
+            for node_id, user_ids in node_users.items():
+                frames[node_id].append(",".join(map(str, user_ids)) + "\n" + json_data)
+
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for node_id, parts in frames.items():
+                pipe.publish(get_node_channel(node_id), "\n".join(parts))
+            await pipe.execute()
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        logger.info(
+            f"Отправлено уведомлений {len(notifications)} для {len(user_nodes)}/"
+            f"{len(recipients)} пользователей на {len(frames)} узлов "
+            f"за {elapsed_ms:.1f} мс"
+        )
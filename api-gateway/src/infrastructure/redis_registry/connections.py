@@ -0,0 +1,70 @@
+import time
+from collections import defaultdict
+
+from redis.asyncio import Redis
+
+from src.core.config import settings
+from src.core.redis import redis
+
+
+def get_node_channel(node_id: str) -> str:
+    return f"gateway_notifications:{node_id}"
+
+
+class ConnectionRegistry:
+    """Реестр узлов шлюза, на которых открыты сокеты пользователя.
+
+    Для каждого пользователя хранится sorted set `gateway_routes:{user_id}`,
+    где member - идентификатор узла, а score - момент истечения записи.
+    Запись продлевается вместе с heartbeat присутствия, поэтому узлы, упавшие
+    без отписки, перестают получать уведомления после истечения TTL.
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        node_id: str = settings.GATEWAY_NODE_ID,
+        ttl: int = settings.GATEWAY_ROUTE_TTL,
+    ):
+        self.redis_client = redis_client
+        self.node_id = node_id
+        self.ttl = ttl
+
+    def _get_routes_key(self, user_id: int) -> str:
+        return f"gateway_routes:{user_id}"
+
+    async def register(self, user_id: int) -> None:
+        await self.refresh([user_id])
+
+    async def refresh(self, user_ids: list[int]) -> None:
+        if not user_ids:
+            return
+        expires_at = time.time() + self.ttl
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                key = self._get_routes_key(user_id)
+                pipe.zadd(key, {self.node_id: expires_at})
+                pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def unregister(self, user_id: int) -> None:
+        await self.redis_client.zrem(self._get_routes_key(user_id), self.node_id)
+
+    async def lookup(self, user_ids: list[int]) -> dict[str, list[int]]:
+        """Группирует пользователей по узлам. Оффлайн-пользователи пропускаются."""
+        if not user_ids:
+            return {}
+        now = time.time()
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.zrangebyscore(self._get_routes_key(user_id), now, "+inf")
+            results = await pipe.execute()
+
+        routes = defaultdict(list)
+        for user_id, nodes in zip(user_ids, results):
+            for node_id in nodes:
+                routes[node_id].append(user_id)
+        return routes
+
+
+connection_registry = ConnectionRegistry(redis)
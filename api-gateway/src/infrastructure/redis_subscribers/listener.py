@@ -0,0 +1,117 @@
+import asyncio
+from collections import defaultdict
+from typing import Optional
+
+from fastapi import WebSocket
+from loguru import logger
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+
+from src.core.config import settings
+from src.core.redis import redis
+from src.infrastructure.redis_registry.connections import (
+    ConnectionRegistry, connection_registry, get_node_channel)
+from src.infrastructure.websocket.writer import SocketWriter
+
+
+class NotificationListener:
+    """Одно pubsub-соединение на процесс шлюза.
+
+    Узел подписан только на свой канал `gateway_notifications:{node_id}`.
+    Пользователь регистрируется в ConnectionRegistry при подключении первого
+    локального сокета и удаляется оттуда после отключения последнего.
+    Кадр канала имеет вид `{id1},{id2},...\\n{payload}`: payload раздается
+    локальным сокетам перечисленных пользователей через таблицу маршрутизации.
+    Пачка уведомлений приходит одним кадром из нескольких таких пар подряд
+    (JSON payload не содержит переводов строк).
+    Доставка идет через очереди SocketWriter, поэтому медленный сокет не
+    блокирует чтение из pubsub.
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        registry: ConnectionRegistry,
+        poll_timeout: float = 1.0,
+    ):
+        self.redis_client = redis_client
+        self.registry = registry
+        self.channel = get_node_channel(registry.node_id)
+        self.poll_timeout = poll_timeout
+        self.connections: dict[int, list[SocketWriter]] = defaultdict(list)
+        self.pubsub: Optional[PubSub] = None
+        self.listener_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self.pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        await self.pubsub.subscribe(self.channel)
+        self.listener_task = asyncio.create_task(self._listen())
+        logger.info(f"Redis-слушатель уведомлений запущен: {self.channel}")
+
+    async def stop(self):
+        if self.listener_task:
+            self.listener_task.cancel()
+            try:
+                await self.listener_task
+            except asyncio.CancelledError:
+                pass
+        if self.pubsub:
+            await self.pubsub.aclose()
+        for user_id, writers in self.connections.items():
+            await self.registry.unregister(user_id)
+            for writer in writers:
+                await writer.stop()
+        self.connections.clear()
+        logger.info("Redis-слушатель уведомлений остановлен")
+
+    async def add(self, user_id: int, websocket: WebSocket) -> bool:
+        """Регистрирует сокет. Возвращает True для первого сокета пользователя."""
+        is_first = user_id not in self.connections
+        writer = SocketWriter(
+            websocket,
+            max_size=settings.WS_SEND_QUEUE_SIZE,
+            policy=settings.WS_OVERFLOW_POLICY,
+        )
+        writer.start()
+        self.connections[user_id].append(writer)
+        if is_first:
+            await self.registry.register(user_id)
+        return is_first
+
+    async def remove(self, user_id: int, websocket: WebSocket) -> bool:
+        """Удаляет сокет. Возвращает True, если у пользователя не осталось сокетов."""
+        writers = self.connections.get(user_id, [])
+        writer = next((w for w in writers if w.websocket is websocket), None)
+        if not writer:
+            return False
+        writers.remove(writer)
+        await writer.stop()
+        if writers:
+            return False
+        del self.connections[user_id]
+        await self.registry.unregister(user_id)
+        return True
+
+    async def _listen(self):
+        while True:
+            try:
+                message = await self.pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=self.poll_timeout
+                )
+                if message and message["type"] == "message":
+                    await self._dispatch(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ошибка в Redis-слушателе уведомлений: {e}")
+                await asyncio.sleep(self.poll_timeout)
+
+    async def _dispatch(self, data: str):
+        lines = data.split("\n")
+        for header, payload in zip(lines[::2], lines[1::2]):
+            for user_id in header.split(","):
+                for writer in self.connections.get(int(user_id), []):
+                    writer.put(payload)
+
+
+notification_listener = NotificationListener(redis, connection_registry)
@@ -0,0 +1,152 @@
+import asyncio
+import time
+from typing import Optional
+
+from loguru import logger
+
+from src.core.config import settings
+from src.infrastructure.grpc_clients.presence import RpcPresenceService
+from src.infrastructure.redis_registry.connections import (
+    ConnectionRegistry,
+    connection_registry,
+)
+
+
+class PresenceHeartbeat:
+    """Дебаунс heartbeat-ов и переходов online/offline.
+
+    Входящие кадры только отмечают пользователя. Пользователь попадает в
+    очередь на обновление, если с прошлого обновления прошло больше
+    `ttl * refresh_fraction` секунд, а фоновая задача раз в `flush_interval`
+    секунд отправляет всю очередь одним вызовом RefreshOnlineMany и продлевает
+    маршруты в ConnectionRegistry.
+
+    Переходы online/offline тоже копятся в очередях (побеждает последний) и
+    уходят через SetOnlineMany/SetOfflineMany не позже чем через
+    `transition_linger` секунд, поэтому массовое переподключение после
+    рестарта шлюза превращается в несколько пакетных вызовов.
+    """
+
+    def __init__(
+        self,
+        registry: ConnectionRegistry,
+        ttl: int = settings.PRESENCE_TTL,
+        refresh_fraction: float = settings.PRESENCE_REFRESH_FRACTION,
+        flush_interval: float = settings.PRESENCE_FLUSH_INTERVAL,
+        transition_linger: float = settings.PRESENCE_TRANSITION_LINGER,
+    ):
+        self.registry = registry
+        self.ttl = ttl
+        self.refresh_after = ttl * refresh_fraction
+        self.flush_interval = flush_interval
+        self.transition_linger = transition_linger
+        self.last_refresh: dict[int, float] = {}
+        self.pending: set[int] = set()
+        self.pending_online: set[int] = set()
+        self.pending_offline: set[int] = set()
+        self.wakeup = asyncio.Event()
+        self.presence_service: Optional[RpcPresenceService] = None
+        self.flusher_task: Optional[asyncio.Task] = None
+
+    async def start(self, presence_service: RpcPresenceService):
+        self.presence_service = presence_service
+        self.flusher_task = asyncio.create_task(self._run())
+        logger.info("Фоновая отправка heartbeat-ов присутствия запущена")
+
+    async def stop(self):
+        if self.flusher_task:
+            self.flusher_task.cancel()
+            try:
+                await self.flusher_task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+    def mark_online(self, user_id: int):
+        self.last_refresh[user_id] = time.monotonic()
+        self.pending.discard(user_id)
+        self.pending_offline.discard(user_id)
+        self.pending_online.add(user_id)
+        self.wakeup.set()
+
+    def mark_offline(self, user_id: int):
+        self.last_refresh.pop(user_id, None)
+        self.pending.discard(user_id)
+        self.pending_online.discard(user_id)
+        self.pending_offline.add(user_id)
+        self.wakeup.set()
+
+    def touch(self, user_id: int):
+        now = time.monotonic()
+        if now - self.last_refresh.get(user_id, 0) >= self.refresh_after:
+            self.last_refresh[user_id] = now
+            self.pending.add(user_id)
+
+    async def flush(self):
+        if not self.presence_service:
+            return
+        await self._flush_transitions()
+        await self._flush_refresh()
+
+    async def _flush_transitions(self):
+        offline_ids = list(self.pending_offline)
+        online_ids = list(self.pending_online)
+        self.pending_offline.clear()
+        self.pending_online.clear()
+        try:
+            if offline_ids:
+                await self.presence_service.set_offline_many(offline_ids)
+            if online_ids:
+                await self.presence_service.set_online_many(online_ids, self.ttl)
+        except Exception as e:
+            logger.warning(f"Не удалось обновить статусы присутствия: {e}")
+            # Возвращаем в очередь только тех, чье состояние не менялось после снятия
+            self.pending_offline.update(
+                user_id
+                for user_id in offline_ids
+                if user_id not in self.last_refresh
+                and user_id not in self.pending_online
+            )
+            self.pending_online.update(
+                user_id
+                for user_id in online_ids
+                if user_id in self.last_refresh and user_id not in self.pending_offline
+            )
+
+    async def _flush_refresh(self):
+        if not self.pending:
+            return
+        user_ids = list(self.pending)
+        self.pending.clear()
+        try:
+            await self.registry.refresh(user_ids)
+            await self.presence_service.refresh_online_many(user_ids, self.ttl)
+        except Exception as e:
+            # Ошибка Redis или presence: маршруты и статусы продлеваются
+            # следующим сбросом, иначе они истекут до нового touch
+            logger.warning(f"Не удалось обновить онлайн статусы: {e}")
+            self.pending.update(
+                user_id for user_id in user_ids if user_id in self.last_refresh
+            )
+
+    async def _run(self):
+        next_refresh = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(next_refresh - time.monotonic(), 0)
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=timeout)
+                # Даем накопиться переходам соседних подключений
+                await asyncio.sleep(self.transition_linger)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            try:
+                await self._flush_transitions()
+                if time.monotonic() >= next_refresh:
+                    next_refresh = time.monotonic() + self.flush_interval
+                    await self._flush_refresh()
+            except Exception as e:
+                logger.error(f"Ошибка отправки heartbeat-ов присутствия: {e}")
+
+
+presence_heartbeat = PresenceHeartbeat(connection_registry)
@@ -0,0 +1,160 @@
+import asyncio
+import json
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import WebSocket
+from loguru import logger
+
+from src.utils.enums.status_code import WsCloseCodeEnum
+from src.utils.enums.websocket_enums import OverflowPolicyEnum
+
+# Для этих событий важно только последнее состояние по ключу из payload
+COALESCE_KEYS = {
+    "update_user_status": "user_id",
+    "update_message": "id",
+}
+
+
+@dataclass
+class OutboundStats:
+    enqueued: int = 0
+    sent: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    disconnected: int = 0
+    queue_depth: int = 0
+
+    def log(self) -> None:
+        logger.info(
+            f"Исходящие кадры сокетов: в очередях {self.queue_depth}, "
+            f"поставлено {self.enqueued}, отправлено {self.sent}, "
+            f"отброшено {self.dropped}, склеено {self.coalesced}, "
+            f"отключено клиентов {self.disconnected}"
+        )
+
+
+outbound_stats = OutboundStats()
+
+
+def _coalesce_key(data: str) -> Optional[tuple]:
+    try:
+        message = json.loads(data)
+    except ValueError:
+        return None
+    event_type = message.get("event_type")
+    field = COALESCE_KEYS.get(event_type)
+    if not field:
+        return None
+    payload = message.get("payload") or {}
+    return (event_type, payload.get(field))
+
+
+class SocketWriter:
+    """Ограниченная очередь исходящих сообщений и отдельная задача-писатель на сокет.
+
+    Медленный клиент копит отставание только в своей очереди и не задерживает
+    доставку другим сокетам пользователя. Ключ склейки считается один раз при
+    постановке в очередь и хранится рядом с кадром.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_size: int,
+        policy: OverflowPolicyEnum = OverflowPolicyEnum.DROP_OLDEST,
+    ):
+        self.websocket = websocket
+        self.max_size = max_size
+        self.policy = policy
+        self.buffer: deque[tuple[Optional[tuple], str]] = deque()
+        self.closed = False
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._close_task: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        return len(self.buffer)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self.closed = True
+        outbound_stats.queue_depth -= len(self.buffer)
+        self.buffer.clear()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def put(self, data: str) -> bool:
+        if self.closed:
+            return False
+        key = (
+            _coalesce_key(data) if self.policy == OverflowPolicyEnum.COALESCE else None
+        )
+        if len(self.buffer) >= self.max_size and not self._handle_overflow(key):
+            return False
+        self.buffer.append((key, data))
+        outbound_stats.enqueued += 1
+        outbound_stats.queue_depth += 1
+        self._ready.set()
+        return True
+
+    def _drop_oldest(self):
+        self.buffer.popleft()
+        outbound_stats.dropped += 1
+        outbound_stats.queue_depth -= 1
+
+    def _handle_overflow(self, key: Optional[tuple]) -> bool:
+        if self.policy == OverflowPolicyEnum.DISCONNECT:
+            logger.warning("Очередь сокета переполнена, отключаем медленного клиента")
+            outbound_stats.disconnected += 1
+            outbound_stats.dropped += len(self.buffer) + 1
+            outbound_stats.queue_depth -= len(self.buffer)
+            self.buffer.clear()
+            self.closed = True
+            self._close_task = asyncio.create_task(self._close())
+            return False
+
+        if self.policy == OverflowPolicyEnum.COALESCE and key is not None:
+            kept = deque(item for item in self.buffer if item[0] != key)
+            removed = len(self.buffer) - len(kept)
+            if removed:
+                self.buffer = kept
+                outbound_stats.coalesced += removed
+                outbound_stats.queue_depth -= removed
+                return True
+
+        self._drop_oldest()
+        return True
+
+    async def _run(self):
+        try:
+            while True:
+                if not self.buffer:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                _, data = self.buffer.popleft()
+                outbound_stats.queue_depth -= 1
+                await self.websocket.send_text(data)
+                outbound_stats.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Ошибка отправки в сокет: {e}")
+            self.closed = True
+
+    async def _close(self):
+        if self._task:
+            self._task.cancel()
+        try:
+            await self.websocket.close(code=WsCloseCodeEnum.TRY_AGAIN_LATER.value)
+        except Exception as e:
+            logger.warning(f"Не удалось закрыть сокет: {e}")
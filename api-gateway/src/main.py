@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 import uvicorn
@@ -8,17 +9,34 @@ from fastapi.responses import JSONResponse
 import src.infrastructure.kafka_consumers.message
 import src.infrastructure.kafka_consumers.presence
 from src.api import router
+from src.core.config import settings
 from src.core.kafka import router as kafka_router
 from src.infrastructure.grpc_clients import grpc_service
+from src.infrastructure.grpc_clients.presence import RpcPresenceService
+from src.infrastructure.redis_subscribers.listener import notification_listener
+from src.infrastructure.websocket.heartbeat import presence_heartbeat
+from src.infrastructure.websocket.writer import outbound_stats
 from src.utils.enums.status_code import CodeEnum
 from src.utils.exceptions import GrpcError
 
 
+async def log_outbound_stats():
+    while True:
+        await asyncio.sleep(settings.WS_STATS_INTERVAL)
+        outbound_stats.log()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await grpc_service.start()
+    await notification_listener.start()
+    await presence_heartbeat.start(RpcPresenceService(grpc_service.presence))
+    stats_task = asyncio.create_task(log_outbound_stats())
 
     yield
+    stats_task.cancel()
+    await presence_heartbeat.stop()
+    await notification_listener.stop()
     await grpc_service.stop()
 
 
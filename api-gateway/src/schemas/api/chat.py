@@ -15,6 +15,7 @@ class ChatResponse(BaseModel):
     last_message: Optional[str] = None
     last_message_at: Optional[datetime] = None
     interlocutor_id: Optional[int] = None
+    unread_count: int = 0
 
     model_config = ConfigDict(from_attributes=True)
 
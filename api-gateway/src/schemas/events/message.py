@@ -27,6 +27,7 @@ class Slimdict(BaseModel):
 
 class CreatedMessageEvent(BaseModel):
     event_type: Literal["MessageCreated"]
+    version: int = 1
     recievers: list[int]
     data: dict
     request_id: str
@@ -35,6 +36,7 @@ class CreatedMessageEvent(BaseModel):
 
 class CreatedManyMessagesEvent(BaseModel):
     event_type: str = "MessagesCreated"
+    version: int = 1
     recievers: list[int]
     data: list[dict]
     request_id: str
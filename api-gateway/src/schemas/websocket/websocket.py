@@ -1,6 +1,6 @@
-from typing import Literal, Optional, Union
+from typing import Annotated, Literal, Optional, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class PayloadBase(BaseModel):
@@ -93,12 +93,18 @@ class ForwardMessagesEvent(EventBase):
     payload: ForwardMessagesPayload
 
 
-IncomingMessage = Union[
-    SendMessageEvent,
-    DeleteMessageEvent,
-    EditMessageEvent,
-    ReadMessagesEvent,
-    AddReactionEvent,
-    RemoveReactionEvent,
-    ForwardMessagesEvent,
+IncomingMessage = Annotated[
+    Union[
+        SendMessageEvent,
+        DeleteMessageEvent,
+        EditMessageEvent,
+        ReadMessagesEvent,
+        AddReactionEvent,
+        RemoveReactionEvent,
+        ForwardMessagesEvent,
+    ],
+    Field(discriminator="event_type"),
 ]
+
+# Собирается один раз на процесс: построение адаптера дороже самой валидации
+incoming_message_adapter = TypeAdapter(IncomingMessage)
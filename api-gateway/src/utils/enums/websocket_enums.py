@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class OverflowPolicyEnum(str, Enum):
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
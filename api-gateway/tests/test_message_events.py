@@ -0,0 +1,106 @@
+import json
+from types import SimpleNamespace
+
+from faststream.kafka import KafkaRouter
+from pydantic import TypeAdapter
+
+from protos import message_pb2
+from src.features.message.service import MessageService
+from src.infrastructure.kafka_consumers.decoders import (PROTOBUF_CONTENT_TYPE,
+                                                         decode_message_batch)
+from src.schemas.events.message import CreatedMessageEvent, IncomingMessage
+
+adapter = TypeAdapter(IncomingMessage)
+
+
+class FakeNotifier:
+    def __init__(self):
+        self.sent = []
+
+    async def broadcast_many(self, notifications):
+        self.sent.extend(notifications)
+
+
+def batch(*records: tuple[bytes, dict]) -> SimpleNamespace:
+    return SimpleNamespace(
+        body=[body for body, _ in records],
+        batch_headers=[headers for _, headers in records],
+    )
+
+
+def created_event_bytes() -> bytes:
+    message = message_pb2.Message(id="m1", chat_id=1, user_id=2, content="hi")
+    message.created_at.FromJsonString("2025-01-01T00:00:00Z")
+    message.metadata.reply_to.CopyFrom(
+        message_pb2.ReplyData(message_id="m0", user_id=3, preview="q")
+    )
+    message.metadata.is_edited = True
+    message.metadata.reactions["+1"].users_id.extend([3, 4])
+    return message_pb2.MessageCreatedEvent(
+        version=2,
+        event_type="MessageCreated",
+        recievers=[2, 3],
+        data=[message],
+        request_id="r1",
+        sender_id=2,
+    ).SerializeToString()
+
+
+async def test_protobuf_record_decodes_to_created_event():
+    records = await decode_message_batch(
+        batch((created_event_bytes(), {"content-type": PROTOBUF_CONTENT_TYPE})), None
+    )
+
+    event = adapter.validate_python(records[0])
+    assert isinstance(event, CreatedMessageEvent)
+    assert event.version == 2 and event.recievers == [2, 3]
+    assert event.data["created_at"] == "2025-01-01T00:00:00Z"
+    assert event.data["metadata"] == {
+        "is_edited": True,
+        "is_pinned": False,
+        "reactions": {"+1": [3, 4]},
+        "reply_to": {"message_id": "m0", "user_id": 3, "preview": "q"},
+        "forward_from": None,
+        "url_preview": None,
+    }
+
+
+async def test_broken_records_are_dropped_from_batch():
+    valid = {"event_type": "MessagesRead", "data": []}
+    records = await decode_message_batch(
+        batch(
+            (b"{not json", {}),
+            (b"\xff\xff", {"content-type": PROTOBUF_CONTENT_TYPE}),
+            (json.dumps(valid).encode(), {}),
+        ),
+        None,
+    )
+
+    assert records == [valid]
+
+
+async def test_unknown_event_type_is_skipped():
+    notifier = FakeNotifier()
+    service = MessageService(router=KafkaRouter(), redis_publisher=notifier)
+    # CreatedManyMessagesEvent не фиксирует event_type: незнакомый тип проходит схему
+    unknown = adapter.validate_python(
+        {
+            "event_type": "MessageArchived",
+            "recievers": [1],
+            "data": [],
+            "request_id": "r1",
+            "sender_id": 1,
+        }
+    )
+    read = adapter.validate_python(
+        {"event_type": "MessagesRead", "data": [{"id": "m1", "sender_id": 5}]}
+    )
+
+    await service.process_batch([unknown, read])
+
+    assert notifier.sent == [
+        (
+            [5],
+            {"event_type": "read_cursor_updated", "payload": {"cursor_id": "m1"}},
+        )
+    ]
@@ -0,0 +1,98 @@
+import grpc
+from redis.exceptions import ConnectionError
+
+from src.infrastructure.websocket.heartbeat import PresenceHeartbeat
+from src.utils.exceptions import GrpcError
+
+
+class FakeRegistry:
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+        self.refreshed: list[list[int]] = []
+
+    async def refresh(self, user_ids: list[int]):
+        if self.error:
+            raise self.error
+        self.refreshed.append(user_ids)
+
+
+class FakePresence:
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+        self.calls: list[tuple[str, list[int]]] = []
+
+    async def _call(self, name: str, user_ids: list[int]):
+        if self.error:
+            raise self.error
+        self.calls.append((name, sorted(user_ids)))
+
+    async def set_online_many(self, user_ids, ttl):
+        await self._call("online", user_ids)
+
+    async def set_offline_many(self, user_ids):
+        await self._call("offline", user_ids)
+
+    async def refresh_online_many(self, user_ids, ttl):
+        await self._call("refresh", user_ids)
+
+
+def make_heartbeat(registry, presence) -> PresenceHeartbeat:
+    heartbeat = PresenceHeartbeat(registry, ttl=60, refresh_fraction=0.5)
+    heartbeat.presence_service = presence
+    return heartbeat
+
+
+async def test_touch_is_debounced():
+    presence = FakePresence()
+    heartbeat = make_heartbeat(FakeRegistry(), presence)
+    heartbeat.touch(1)
+    heartbeat.touch(1)
+    await heartbeat.flush()
+    heartbeat.touch(1)
+    await heartbeat.flush()
+    assert presence.calls == [("refresh", [1])]
+
+
+async def test_last_transition_wins():
+    presence = FakePresence()
+    heartbeat = make_heartbeat(FakeRegistry(), presence)
+    heartbeat.mark_online(1)
+    heartbeat.mark_offline(1)
+    heartbeat.mark_online(2)
+    await heartbeat.flush()
+    assert presence.calls == [("offline", [1]), ("online", [2])]
+
+
+async def test_refresh_requeued_on_redis_error():
+    registry = FakeRegistry(error=ConnectionError("redis down"))
+    heartbeat = make_heartbeat(registry, FakePresence())
+    heartbeat.touch(1)
+    heartbeat.touch(2)
+    await heartbeat.flush()
+    assert heartbeat.pending == {1, 2}
+
+    registry.error = None
+    await heartbeat.flush()
+    assert heartbeat.pending == set()
+    assert sorted(registry.refreshed[0]) == [1, 2]
+
+
+async def test_refresh_not_requeued_after_disconnect():
+    presence = FakePresence(error=GrpcError(grpc.StatusCode.UNAVAILABLE, "down"))
+    heartbeat = make_heartbeat(FakeRegistry(), presence)
+    heartbeat.touch(1)
+    heartbeat.touch(2)
+    # Пользователь 2 отключился, пока шел сброс
+    heartbeat.last_refresh.pop(2)
+    await heartbeat._flush_refresh()
+    assert heartbeat.pending == {1}
+
+
+async def test_transitions_requeued_on_error():
+    presence = FakePresence(error=RuntimeError("boom"))
+    heartbeat = make_heartbeat(FakeRegistry(), presence)
+    heartbeat.mark_online(1)
+    heartbeat.mark_offline(2)
+    await heartbeat._flush_transitions()
+    assert heartbeat.pending_online == {1}
+    assert heartbeat.pending_offline == {2}
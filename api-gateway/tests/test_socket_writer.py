@@ -0,0 +1,123 @@
+import asyncio
+import json
+
+from src.infrastructure.websocket.writer import OutboundStats, SocketWriter
+from src.utils.enums.websocket_enums import OverflowPolicyEnum
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent: list[str] = []
+        self.close_code = None
+
+    async def send_text(self, data: str):
+        self.sent.append(data)
+
+    async def close(self, code: int):
+        self.close_code = code
+
+
+def frame(event_type: str, **payload) -> str:
+    return json.dumps({"event_type": event_type, "payload": payload})
+
+
+def queued(writer: SocketWriter) -> list[str]:
+    return [data for _, data in writer.buffer]
+
+
+async def test_drop_oldest_keeps_newest_frames():
+    writer = SocketWriter(FakeWebSocket(), max_size=2)
+    for i in range(3):
+        assert writer.put(frame("new_message", id=str(i)))
+    assert queued(writer) == [
+        frame("new_message", id="1"),
+        frame("new_message", id="2"),
+    ]
+
+
+async def test_coalesce_replaces_frames_with_same_key():
+    writer = SocketWriter(
+        FakeWebSocket(), max_size=3, policy=OverflowPolicyEnum.COALESCE
+    )
+    writer.put(frame("update_user_status", user_id=1, status="online"))
+    writer.put(frame("new_message", id="a"))
+    writer.put(frame("update_user_status", user_id=2, status="online"))
+
+    assert writer.put(frame("update_user_status", user_id=1, status="offline"))
+    assert queued(writer) == [
+        frame("new_message", id="a"),
+        frame("update_user_status", user_id=2, status="online"),
+        frame("update_user_status", user_id=1, status="offline"),
+    ]
+
+
+async def test_coalesce_falls_back_to_drop_oldest():
+    writer = SocketWriter(
+        FakeWebSocket(), max_size=2, policy=OverflowPolicyEnum.COALESCE
+    )
+    writer.put(frame("new_message", id="a"))
+    writer.put(frame("update_message", id="b", content="x"))
+
+    assert writer.put(frame("new_message", id="c"))
+    assert queued(writer) == [
+        frame("update_message", id="b", content="x"),
+        frame("new_message", id="c"),
+    ]
+
+
+async def test_coalesce_ignores_non_json_frames():
+    writer = SocketWriter(
+        FakeWebSocket(), max_size=1, policy=OverflowPolicyEnum.COALESCE
+    )
+    writer.put("not json")
+    assert writer.put("still not json")
+    assert queued(writer) == ["still not json"]
+
+
+async def test_disconnect_closes_slow_socket():
+    websocket = FakeWebSocket()
+    writer = SocketWriter(websocket, max_size=1, policy=OverflowPolicyEnum.DISCONNECT)
+    writer.put(frame("new_message", id="a"))
+
+    assert not writer.put(frame("new_message", id="b"))
+    assert writer.closed and not writer.buffer
+    await writer._close_task
+    assert websocket.close_code is not None
+    assert not writer.put(frame("new_message", id="c"))
+
+
+async def test_writer_sends_in_order():
+    websocket = FakeWebSocket()
+    writer = SocketWriter(websocket, max_size=10)
+    writer.start()
+    for i in range(3):
+        writer.put(frame("new_message", id=str(i)))
+    await asyncio.sleep(0.01)
+    await writer.stop()
+    assert websocket.sent == [frame("new_message", id=str(i)) for i in range(3)]
+
+
+async def test_overflow_updates_outbound_stats(monkeypatch):
+    stats = OutboundStats()
+    monkeypatch.setattr("src.infrastructure.websocket.writer.outbound_stats", stats)
+
+    dropping = SocketWriter(FakeWebSocket(), max_size=1)
+    dropping.put(frame("new_message", id="a"))
+    dropping.put(frame("new_message", id="b"))
+
+    coalescing = SocketWriter(
+        FakeWebSocket(), max_size=1, policy=OverflowPolicyEnum.COALESCE
+    )
+    coalescing.put(frame("update_user_status", user_id=1, status="online"))
+    coalescing.put(frame("update_user_status", user_id=1, status="offline"))
+
+    disconnecting = SocketWriter(
+        FakeWebSocket(), max_size=1, policy=OverflowPolicyEnum.DISCONNECT
+    )
+    disconnecting.put(frame("new_message", id="a"))
+    disconnecting.put(frame("new_message", id="b"))
+    await disconnecting._close_task
+
+    assert stats == OutboundStats(
+        enqueued=5, dropped=3, coalesced=1, disconnected=1, queue_depth=2
+    )
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: message.proto
+# Protobuf Python Version: 6.31.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    6,
+    31,
+    1,
+    '',
+    'message.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
+from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rmessage.proto\x12\x07message\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x1bgoogle/protobuf/empty.proto\"\x1f\n\tMessageId\x12\x12\n\nmessage_id\x18\x01 \x01(\t\"H\n\x08UserData\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x10\n\x08username\x18\x02 \x01(\t\x12\x13\n\x06\x61vatar\x18\x03 \x01(\tH\x00\x88\x01\x01\x42\t\n\x07_avatar\"\x7f\n\x12SendMessageRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\x05\x12\x0f\n\x07\x63hat_id\x18\x03 \x01(\x05\x12\x0f\n\x07\x63ontent\x18\x04 \x01(\t\x12\x12\n\nrequest_id\x18\x05 \x01(\t\x12\x15\n\x08reply_to\x18\x07 \x01(\tH\x00\x88\x01\x01\x42\x0b\n\t_reply_to\"Y\n\x13SendMessageResponse\x12\x12\n\nmessage_id\x18\x02 \x01(\t\x12.\n\ncreated_at\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"f\n\x14UpdateMessageRequest\x12\x12\n\nmessage_id\x18\x01 \x01(\t\x12\x13\n\x0bnew_content\x18\x02 \x01(\t\x12\x12\n\nrequest_id\x18\x03 \x01(\t\x12\x11\n\tsender_id\x18\x04 \x01(\x05\"Q\n\x14\x44\x65leteMessageRequest\x12\x12\n\nmessage_id\x18\x01 \x01(\t\x12\x12\n\nrequest_id\x18\x02 \x01(\t\x12\x11\n\tsender_id\x18\x03 \x01(\x05\"\'\n\x15\x44\x65leteMessageResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\"\xaf\x01\n\x07Message\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07\x63hat_id\x18\x02 \x01(\x05\x12\x0f\n\x07user_id\x18\x03 \x01(\x05\x12\x0f\n\x07\x63ontent\x18\x04 \x01(\t\x12.\n\ncreated_at\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12(\n\x08metadata\x18\x07 \x01(\x0b\x32\x11.message.MetadataH\x00\x88\x01\x01\x42\x0b\n\t_metadata\"\xe0\x01\n\x11GetContextRequest\x12\x0f\n\x07\x63hat_id\x18\x01 \x01(\x05\x12\x0f\n\x07user_id\x18\x02 \x01(\x05\x12\x16\n\tcursor_id\x18\x03 \x01(\tH\x00\x88\x01\x01\x12;\n\tdirection\x18\x04 \x01(\x0e\x32(.message.GetContextRequest.DirectionEnum\x12\r\n\x05limit\x18\x05 \x01(\x05\"7\n\rDirectionEnum\x12\x0f\n\x0bUNSPECIFIED\x10\x00\x12\n\n\x06\x42\x45\x46ORE\x10\x01\x12\t\n\x05\x41\x46TER\x10\x02\x42\x0c\n\n_cursor_id\"\xbc\x01\n\x0f\x43ontextResponse\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\x12\x14\n\x0cunread_count\x18\x02 \x01(\x05\x12!\n\x14last_read_message_id\x18\x03 \x01(\tH\x00\x88\x01\x01\x12\"\n\x08messages\x18\x04 \x03(\x0b\x32\x10.message.Message\x12$\n\tuser_data\x18\x05 \x03(\x0b\x32\x11.message.UserDataB\x17\n\x15_last_read_message_id\"\x1d\n\tReactedBy\x12\x10\n\x08users_id\x18\x01 \x03(\x05\"A\n\tReplyData\x12\x12\n\nmessage_id\x18\x01 \x01(\t\x12\x0f\n\x07user_id\x18\x02 \x01(\x05\x12\x0f\n\x07preview\x18\x04 \x01(\t\"T\n\x0b\x46orwardData\x12\x17\n\x0f\x66rom_message_id\x18\x01 \x01(\t\x12\x14\n\x0c\x66rom_chat_id\x18\x02 \x01(\x05\x12\x16\n\x0esender_user_id\x18\x03 \x01(\x05\"\xa5\x02\n\x08Metadata\x12\x11\n\tis_edited\x18\x01 \x01(\x08\x12\x11\n\tis_pinned\x18\x02 \x01(\x08\x12)\n\x08reply_to\x18\x03 \x01(\x0b\x32\x12.message.ReplyDataH\x00\x88\x01\x01\x12/\n\x0c\x66orward_from\x18\x04 \x01(\x0b\x32\x14.message.ForwardDataH\x01\x88\x01\x01\x12\x33\n\treactions\x18\x05 \x03(\x0b\x32 .message.Metadata.ReactionsEntry\x1a\x44\n\x0eReactionsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.message.ReactedBy:\x02\x38\x01\x42\x0b\n\t_reply_toB\x0f\n\r_forward_from\"\xc8\x01\n\x0f\x46ullMessageData\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07\x63hat_id\x18\x02 \x01(\x05\x12\x0f\n\x07user_id\x18\x03 \x01(\x05\x12\x0f\n\x07\x63ontent\x18\x04 \x01(\t\x12\x0f\n\x07read_by\x18\x06 \x03(\x05\x12.\n\ncreated_at\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12(\n\x08metadata\x18\x08 \x01(\x0b\x32\x11.message.MetadataH\x00\x88\x01\x01\x42\x0b\n\t_metadata\"k\n\x13\x46ullMessageResponse\x12.\n\x0cmessage_data\x18\x01 \x01(\x0b\x32\x18.message.FullMessageData\x12$\n\tuser_data\x18\x02 \x03(\x0b\x32\x11.message.UserData\"@\n\x08Reaction\x12\x12\n\nmessage_id\x18\x01 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x02 \x01(\x05\x12\x10\n\x08reaction\x18\x03 \x01(\t\"\x81\x01\n\x15\x46orwardMessageRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\x05\x12\x0f\n\x07\x63hat_id\x18\x02 \x01(\x05\x12\x12\n\nrequest_id\x18\x03 \x01(\t\x12\x10\n\x08messages\x18\x04 \x03(\t\x12\x14\n\x07\x63ontent\x18\x05 \x01(\tH\x00\x88\x01\x01\x42\n\n\x08_content\"H\n\x16\x46orwardMessageResponse\x12.\n\x08messages\x18\x01 \x03(\x0b\x32\x1c.message.SendMessageResponse\";\n\x16GetUnreadCountsRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\x05\x12\x10\n\x08\x63hat_ids\x18\x02 \x03(\x05\"4\n\x0bUnreadCount\x12\x0f\n\x07\x63hat_id\x18\x01 \x01(\x05\x12\x14\n\x0cunread_count\x18\x02 \x01(\x05\"<\n\x14UnreadCountsResponse\x12$\n\x06\x63ounts\x18\x01 \x03(\x0b\x32\x14.message.UnreadCount\"\x94\x01\n\x13MessageCreatedEvent\x12\x0f\n\x07version\x18\x01 \x01(\x05\x12\x12\n\nevent_type\x18\x02 \x01(\t\x12\x11\n\trecievers\x18\x03 \x03(\x05\x12\x1e\n\x04\x64\x61ta\x18\x04 \x03(\x0b\x32\x10.message.Message\x12\x12\n\nrequest_id\x18\x05 \x01(\t\x12\x11\n\tsender_id\x18\x06 \x01(\x05\x32\xa5\x05\n\x0eMessageService\x12J\n\x0bSendMessage\x12\x1b.message.SendMessageRequest\x1a\x1c.message.SendMessageResponse\"\x00\x12\x44\n\rUpdateMessage\x12\x1d.message.UpdateMessageRequest\x1a\x12.message.MessageId\"\x00\x12P\n\rDeleteMessage\x12\x1d.message.DeleteMessageRequest\x1a\x1e.message.DeleteMessageResponse\"\x00\x12\x44\n\nGetContext\x12\x1a.message.GetContextRequest\x1a\x18.message.ContextResponse\"\x00\x12\x44\n\x0eGetMessageData\x12\x12.message.MessageId\x1a\x1c.message.FullMessageResponse\"\x00\x12:\n\x0b\x41\x64\x64Reaction\x12\x11.message.Reaction\x1a\x16.google.protobuf.Empty\"\x00\x12=\n\x0eRemoveReaction\x12\x11.message.Reaction\x1a\x16.google.protobuf.Empty\"\x00\x12S\n\x0e\x46orwardMessage\x12\x1e.message.ForwardMessageRequest\x1a\x1f.message.ForwardMessageResponse\"\x00\x12S\n\x0fGetUnreadCounts\x12\x1f.message.GetUnreadCountsRequest\x1a\x1d.message.UnreadCountsResponse\"\x00\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'message_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_METADATA_REACTIONSENTRY']._loaded_options = None
+  _globals['_METADATA_REACTIONSENTRY']._serialized_options = b'8\001'
+  _globals['_MESSAGEID']._serialized_start=88
+  _globals['_MESSAGEID']._serialized_end=119
+  _globals['_USERDATA']._serialized_start=121
+  _globals['_USERDATA']._serialized_end=193
+  _globals['_SENDMESSAGEREQUEST']._serialized_start=195
+  _globals['_SENDMESSAGEREQUEST']._serialized_end=322
+  _globals['_SENDMESSAGERESPONSE']._serialized_start=324
+  _globals['_SENDMESSAGERESPONSE']._serialized_end=413
+  _globals['_UPDATEMESSAGEREQUEST']._serialized_start=415
+  _globals['_UPDATEMESSAGEREQUEST']._serialized_end=517
+  _globals['_DELETEMESSAGEREQUEST']._serialized_start=519
+  _globals['_DELETEMESSAGEREQUEST']._serialized_end=600
+  _globals['_DELETEMESSAGERESPONSE']._serialized_start=602
+  _globals['_DELETEMESSAGERESPONSE']._serialized_end=641
+  _globals['_MESSAGE']._serialized_start=644
+  _globals['_MESSAGE']._serialized_end=819
+  _globals['_GETCONTEXTREQUEST']._serialized_start=822
+  _globals['_GETCONTEXTREQUEST']._serialized_end=1046
+  _globals['_GETCONTEXTREQUEST_DIRECTIONENUM']._serialized_start=977
+  _globals['_GETCONTEXTREQUEST_DIRECTIONENUM']._serialized_end=1032
+  _globals['_CONTEXTRESPONSE']._serialized_start=1049
+  _globals['_CONTEXTRESPONSE']._serialized_end=1237
+  _globals['_REACTEDBY']._serialized_start=1239
+  _globals['_REACTEDBY']._serialized_end=1268
+  _globals['_REPLYDATA']._serialized_start=1270
+  _globals['_REPLYDATA']._serialized_end=1335
+  _globals['_FORWARDDATA']._serialized_start=1337
+  _globals['_FORWARDDATA']._serialized_end=1421
+  _globals['_METADATA']._serialized_start=1424
+  _globals['_METADATA']._serialized_end=1717
+  _globals['_METADATA_REACTIONSENTRY']._serialized_start=1619
+  _globals['_METADATA_REACTIONSENTRY']._serialized_end=1687
+  _globals['_FULLMESSAGEDATA']._serialized_start=1720
+  _globals['_FULLMESSAGEDATA']._serialized_end=1920
+  _globals['_FULLMESSAGERESPONSE']._serialized_start=1922
+  _globals['_FULLMESSAGERESPONSE']._serialized_end=2029
+  _globals['_REACTION']._serialized_start=2031
+  _globals['_REACTION']._serialized_end=2095
+  _globals['_FORWARDMESSAGEREQUEST']._serialized_start=2098
+  _globals['_FORWARDMESSAGEREQUEST']._serialized_end=2227
+  _globals['_FORWARDMESSAGERESPONSE']._serialized_start=2229
+  _globals['_FORWARDMESSAGERESPONSE']._serialized_end=2301
+  _globals['_GETUNREADCOUNTSREQUEST']._serialized_start=2303
+  _globals['_GETUNREADCOUNTSREQUEST']._serialized_end=2362
+  _globals['_UNREADCOUNT']._serialized_start=2364
+  _globals['_UNREADCOUNT']._serialized_end=2416
+  _globals['_UNREADCOUNTSRESPONSE']._serialized_start=2418
+  _globals['_UNREADCOUNTSRESPONSE']._serialized_end=2478
+  _globals['_MESSAGECREATEDEVENT']._serialized_start=2481
+  _globals['_MESSAGECREATEDEVENT']._serialized_end=2629
+  _globals['_MESSAGESERVICE']._serialized_start=2632
+  _globals['_MESSAGESERVICE']._serialized_end=3309
+# @@protoc_insertion_point(module_scope)
@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -26,5 +28,10 @@ class Settings(BaseSettings):
     KAFKA_HOST: str = "localhost"
     KAFKA_PORT: int = 9092
 
+    # --- KAFKA PRODUCER ---
+    KAFKA_LINGER_MS: int = 5
+    KAFKA_MAX_BATCH_SIZE: int = 128 * 1024
+    KAFKA_COMPRESSION: Optional[Literal["gzip", "snappy", "lz4", "zstd"]] = "gzip"
+
 
 settings = Settings()
@@ -4,6 +4,7 @@ from src.schemas.user import IncomingUserEvent
 from src.schemas.chat import ApiGatewayReadEvent
 from src.schemas.message import MessageEvent
 from src.routers.kafka import broker
+from src.routers.kafka.decoders import decode_message_event
 from src.core.deps import user_service, chat_service
 
 
@@ -24,7 +25,8 @@ async def user_event(data: IncomingUserEvent):
 @broker.subscriber(
         'message.events',
         group_id='chat_service_messages',
-        auto_offset_reset='earliest'
+        auto_offset_reset='earliest',
+        decoder=decode_message_event
     )
 async def message_event(data: MessageEvent):
     event = data.event_type
@@ -0,0 +1,31 @@
+from datetime import timezone
+
+from faststream.kafka import KafkaMessage
+
+from protos import message_pb2
+
+PROTOBUF_CONTENT_TYPE = 'application/x-protobuf'
+
+
+async def decode_message_event(msg: KafkaMessage, original_decoder):
+    """Декодер message.events: protobuf по заголовку content-type, иначе JSON.
+
+    Из бинарного события берутся только поля, которые читает MessageEvent.
+    """
+    if msg.content_type != PROTOBUF_CONTENT_TYPE:
+        return await original_decoder(msg)
+
+    event = message_pb2.MessageCreatedEvent.FromString(msg.body)
+    data = [
+        {
+            'id': message.id,
+            'chat_id': message.chat_id,
+            'content': message.content,
+            'created_at': message.created_at.ToDatetime(tzinfo=timezone.utc),
+        }
+        for message in event.data
+    ]
+    return {
+        'event_type': event.event_type,
+        'data': data[0] if event.event_type == 'MessageCreated' else data,
+    }
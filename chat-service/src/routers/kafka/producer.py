@@ -18,11 +18,17 @@ class KafkaPublisher:
         self.topic = topic
         self.logger = logger
 
+    @staticmethod
+    def _key(chat_id: int) -> bytes:
+        # События одного чата попадают в одну партицию и не обгоняют друг друга
+        return str(chat_id).encode()
+
     async def create(self, data: ChatDataBase) -> None:
         event_data = CreateChatEvent(data=data)
         await self.broker.publish(
             message=event_data,
-            topic=self.topic
+            topic=self.topic,
+            key=self._key(data.id)
         )
         self.logger.info(f"Уведомление о создании чата {data.id} отправлено")
 
@@ -30,7 +36,8 @@ class KafkaPublisher:
         event_data = UpdateChatEvent(data=data)
         await self.broker.publish(
             message=event_data,
-            topic=self.topic
+            topic=self.topic,
+            key=self._key(data.id)
         )
         self.logger.info(f"Уведомление об обновлении {data.id} отправлено")
 
@@ -39,6 +46,7 @@ class KafkaPublisher:
         event_data = DeleteChatEvent(data=data)
         await self.broker.publish(
             message=event_data,
-            topic=self.topic
+            topic=self.topic,
+            key=self._key(chat_id)
         )
         self.logger.info(f"Уведомление об удалении {data.id} отправлено")
@@ -0,0 +1,183 @@
+"""Пропускная способность продюсера message.events при разных настройках.
+
+Без аргументов работает офлайн: события MessageCreated раскладываются по
+партициям тем же партиционером, что у aiokafka, и собираются в батчи
+формата Kafka v2 с выбранным сжатием - ровно то, что продюсер отправляет
+брокеру. Печатает событий/с на одно ядро, байт на событие и число батчей.
+
+С --bootstrap те же события публикуются через KafkaBroker в живой брокер
+(локальный Kafka или совместимый с ним, например Redpanda):
+
+    python -m benchmarks.kafka_producer
+    python -m benchmarks.kafka_producer --bootstrap localhost:9092 --topic bench.events
+
+Запуск из каталога message-service (нужен .env сервиса).
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from aiokafka.codec import has_gzip, has_lz4, has_snappy, has_zstd
+from aiokafka.partitioner import DefaultPartitioner
+from aiokafka.record.default_records import (
+    DefaultRecordBatch,
+    DefaultRecordBatchBuilder,
+)
+from bson import ObjectId
+from faststream.broker.message import encode_message
+from faststream.kafka import KafkaBroker
+
+from src.mappers.grpc_mapper import mapper
+from src.models import MetaData
+from src.schemas.message import CreatedMessageEvent, MessagePayload
+
+PARTITIONS = 12
+CHATS = 2_000
+CODECS = {
+    None: (lambda: True, DefaultRecordBatch.CODEC_NONE),
+    "gzip": (has_gzip, DefaultRecordBatch.CODEC_GZIP),
+    "snappy": (has_snappy, DefaultRecordBatch.CODEC_SNAPPY),
+    "lz4": (has_lz4, DefaultRecordBatch.CODEC_LZ4),
+    "zstd": (has_zstd, DefaultRecordBatch.CODEC_ZSTD),
+}
+# (сжатие, max_batch_size): прежние настройки по умолчанию и варианты
+CONFIGS = [
+    (None, 16 * 1024),
+    ("gzip", 128 * 1024),
+    ("snappy", 128 * 1024),
+    ("lz4", 128 * 1024),
+    ("zstd", 128 * 1024),
+]
+
+
+def make_events(count: int, encoding: str) -> list[tuple[bytes, bytes]]:
+    """Пары (ключ, тело) событий MessageCreated в групповых чатах."""
+    rnd = random.Random(42)
+    events = []
+    for _ in range(count):
+        chat_id = int(rnd.paretovariate(1.2)) % CHATS
+        members = rnd.randint(2, 60)
+        event = CreatedMessageEvent(
+            recievers=list(range(chat_id, chat_id + members)),
+            data=MessagePayload(
+                id=str(ObjectId()),
+                chat_id=chat_id,
+                user_id=chat_id + 1,
+                content="Сообщение в чат " + "текст " * rnd.randint(1, 40),
+                created_at=datetime.now(timezone.utc),
+                metadata=MetaData(),
+            ),
+            request_id=f"req_{rnd.getrandbits(32)}",
+            sender_id=chat_id + 1,
+        )
+        if encoding == "protobuf":
+            body = mapper.message_created_event(event).SerializeToString()
+        else:
+            body, _ = encode_message(event)
+        events.append((str(chat_id).encode(), body))
+    return events
+
+
+def build_batches(
+    events: list[tuple[bytes, bytes]], codec: int, batch_size: int
+) -> tuple[int, int]:
+    """Собирает батчи по партициям, как аккумулятор продюсера."""
+    partitioner = DefaultPartitioner()
+    partitions = list(range(PARTITIONS))
+    builders: dict[int, DefaultRecordBatchBuilder] = {}
+    offsets: dict[int, int] = defaultdict(int)
+    total_bytes = batches = 0
+
+    def new_builder() -> DefaultRecordBatchBuilder:
+        return DefaultRecordBatchBuilder(
+            magic=2,
+            compression_type=codec,
+            is_transactional=False,
+            producer_id=-1,
+            producer_epoch=-1,
+            base_sequence=-1,
+            batch_size=batch_size,
+        )
+
+    now_ms = int(time.time() * 1000)
+    for key, value in events:
+        partition = partitioner(key, partitions, partitions)
+        builder = builders.get(partition) or new_builder()
+        builders[partition] = builder
+        if builder.append(offsets[partition], now_ms, key, value, []) is None:
+            total_bytes += len(builder.build())
+            batches += 1
+            builder = builders[partition] = new_builder()
+            offsets[partition] = 0
+            builder.append(0, now_ms, key, value, [])
+        offsets[partition] += 1
+
+    for builder in builders.values():
+        total_bytes += len(builder.build())
+        batches += 1
+    return total_bytes, batches
+
+
+def run_offline(count: int) -> None:
+    for encoding in ("json", "protobuf"):
+        events = make_events(count, encoding)
+        raw = sum(len(key) + len(value) for key, value in events)
+        print(f"{encoding}: {count} событий, {raw / count:.0f} байт/событие до сжатия")
+        for compression, batch_size in CONFIGS:
+            available, codec = CODECS[compression]
+            name = f"{compression or 'none'}/{batch_size // 1024}KB"
+            if not available():
+                print(f"  {name}: кодек не установлен")
+                continue
+            started_at = time.perf_counter()
+            total_bytes, batches = build_batches(events, codec, batch_size)
+            elapsed = time.perf_counter() - started_at
+            print(
+                f"  {name}: {count / elapsed:,.0f} событий/с, "
+                f"{total_bytes / count:.0f} байт/событие, {batches} батчей"
+            )
+
+
+async def run_live(args: argparse.Namespace) -> None:
+    events = make_events(args.count, args.encoding)
+    for compression, batch_size in CONFIGS:
+        if not CODECS[compression][0]():
+            continue
+        broker = KafkaBroker(
+            args.bootstrap,
+            linger_ms=args.linger_ms,
+            max_batch_size=batch_size,
+            compression_type=compression,
+        )
+        async with broker:
+            await broker.publish(b"", args.topic)
+            started_at = time.perf_counter()
+            for start in range(0, len(events), args.concurrency):
+                chunk = events[start : start + args.concurrency]
+                await asyncio.gather(
+                    *(broker.publish(body, args.topic, key=key) for key, body in chunk)
+                )
+            elapsed = time.perf_counter() - started_at
+        print(
+            f"{compression or 'none'}/{batch_size // 1024}KB, "
+            f"linger {args.linger_ms} мс: {args.count / elapsed:,.0f} событий/с"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=20_000)
+    parser.add_argument("--encoding", choices=("json", "protobuf"), default="json")
+    parser.add_argument("--bootstrap")
+    parser.add_argument("--topic", default="bench.message.events")
+    parser.add_argument("--linger-ms", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=500)
+    args = parser.parse_args()
+    if args.bootstrap:
+        asyncio.run(run_live(args))
+    else:
+        run_offline(args.count)
@@ -87,6 +87,12 @@ class MessageServiceStub(object):
             response_deserializer=message__pb2.ForwardMessageResponse.FromString,
             _registered_method=True,
         )
+        self.GetUnreadCounts = channel.unary_unary(
+            "/message.MessageService/GetUnreadCounts",
+            request_serializer=message__pb2.GetUnreadCountsRequest.SerializeToString,
+            response_deserializer=message__pb2.UnreadCountsResponse.FromString,
+            _registered_method=True,
+        )
 
 
 class MessageServiceServicer(object):
@@ -140,6 +146,12 @@ class MessageServiceServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def GetUnreadCounts(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_MessageServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -183,6 +195,11 @@ def add_MessageServiceServicer_to_server(servicer, server):
             request_deserializer=message__pb2.ForwardMessageRequest.FromString,
             response_serializer=message__pb2.ForwardMessageResponse.SerializeToString,
         ),
+        "GetUnreadCounts": grpc.unary_unary_rpc_method_handler(
+            servicer.GetUnreadCounts,
+            request_deserializer=message__pb2.GetUnreadCountsRequest.FromString,
+            response_serializer=message__pb2.UnreadCountsResponse.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
         "message.MessageService", rpc_method_handlers
@@ -434,3 +451,33 @@ class MessageService(object):
             metadata,
             _registered_method=True,
         )
+
+    @staticmethod
+    def GetUnreadCounts(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/message.MessageService/GetUnreadCounts",
+            message__pb2.GetUnreadCountsRequest.SerializeToString,
+            message__pb2.UnreadCountsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
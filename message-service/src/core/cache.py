@@ -0,0 +1,113 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+from cachetools import TTLCache
+from loguru import logger
+
+from src.core.config import settings
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class _CountingTTLCache(TTLCache):
+    def __init__(self, maxsize: int, ttl: float, stats: CacheStats):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.stats = stats
+
+    def popitem(self):
+        # Вызывается только при вытеснении по размеру (LRU)
+        self.stats.evictions += 1
+        return super().popitem()
+
+
+class ReplicaCache:
+    """LRU-кэш реплик с TTL в памяти процесса.
+
+    Заполняется лениво репозиториями. Каждый экземпляр получает все события
+    user.events/chat.events и сбрасывает по ним свои записи через `evict`.
+    Реплику в базе при этом пишет только один экземпляр из consumer group,
+    поэтому после `evict` ключ `hold` секунд не кэшируется: чтения идут в
+    базу, пока туда не попадет новая версия. Локальная запись в реплику
+    снимает это ограничение через `invalidate`. Если запись отстает дольше
+    `hold`, устаревание ограничено TTL.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float, hold: float):
+        self.name = name
+        self.stats = CacheStats()
+        self.cache = _CountingTTLCache(maxsize=maxsize, ttl=ttl, stats=self.stats)
+        self.held = TTLCache(maxsize=maxsize, ttl=hold)
+
+    def get(self, key: Hashable) -> Any | None:
+        value = self.cache.get(key)
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    def get_many(
+        self, keys: list[Hashable]
+    ) -> tuple[dict[Hashable, Any], list[Hashable]]:
+        found, missing = {}, []
+        for key in keys:
+            value = self.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                found[key] = value
+        return found, missing
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if key not in self.held:
+            self.cache[key] = value
+
+    def invalidate(self, key: Hashable) -> None:
+        """Сбрасывает запись после записи в реплику этим экземпляром."""
+        self.held.pop(key, None)
+        if self.cache.pop(key, None) is not None:
+            self.stats.invalidations += 1
+
+    def evict(self, key: Hashable) -> None:
+        """Сбрасывает запись по событию, реплику обновит другой экземпляр."""
+        self.held[key] = True
+        if self.cache.pop(key, None) is not None:
+            self.stats.invalidations += 1
+
+    def evict_where(self, predicate: Callable[[Any], bool]) -> None:
+        for key, value in list(self.cache.items()):
+            if predicate(value):
+                self.evict(key)
+
+    def log_stats(self) -> None:
+        logger.info(
+            f"Кэш {self.name}: {self.cache.currsize}/{self.cache.maxsize}, "
+            f"hit rate {self.stats.hit_rate:.1%} "
+            f"(hits={self.stats.hits}, misses={self.stats.misses}), "
+            f"evictions={self.stats.evictions}, invalidations={self.stats.invalidations}"
+        )
+
+
+user_cache = ReplicaCache(
+    "users",
+    maxsize=settings.REPLICA_CACHE_SIZE,
+    ttl=settings.REPLICA_CACHE_TTL,
+    hold=settings.REPLICA_CACHE_HOLD,
+)
+chat_cache = ReplicaCache(
+    "chats",
+    maxsize=settings.REPLICA_CACHE_SIZE,
+    ttl=settings.REPLICA_CACHE_TTL,
+    hold=settings.REPLICA_CACHE_HOLD,
+)
@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -20,6 +22,41 @@ class Settings(BaseSettings):
     # --- KAFKA ---
     KAFKA_HOST: str = 'localhost'
     KAFKA_PORT: int = 9092
+    # json или protobuf; protobuf включать, когда все потребители message.events его читают
+    MESSAGE_EVENTS_ENCODING: Literal['json', 'protobuf'] = 'json'
+
+    # --- KAFKA PRODUCER ---
+    # lz4/zstd/snappy требуют aiokafka с соответствующим extra
+    KAFKA_LINGER_MS: int = 5
+    KAFKA_MAX_BATCH_SIZE: int = 128 * 1024
+    KAFKA_COMPRESSION: Optional[Literal['gzip', 'snappy', 'lz4', 'zstd']] = 'gzip'
+
+    # --- CACHE ---
+    REPLICA_CACHE_SIZE: int = 10000
+    REPLICA_CACHE_TTL: float = 60
+    # Сколько секунд после события не кэшировать запись: реплику в базе
+    # обновляет другой экземпляр, и чтение до его записи вернет старые данные
+    REPLICA_CACHE_HOLD: float = 5
+    CACHE_STATS_INTERVAL: float = 60
+
+    # --- UNREAD ---
+    UNREAD_RECONCILE_INTERVAL: float = 30
+    # Чатов в одной агрегации при первом подсчете счетчиков списка чатов
+    UNREAD_COUNT_CHUNK_SIZE: int = 200
+    UNREAD_RECONCILE_BATCH_SIZE: int = 500
+    # Аренда сверки: столько секунд после остановки владельца ее никто не ведет
+    UNREAD_RECONCILE_LEASE: float = 90
+
+    # --- READ RECEIPTS ---
+    READ_FLUSH_INTERVAL: float = 1.0
+    READ_FLUSH_CONCURRENCY: int = 32
+
+    # --- OUTBOX ---
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_LINGER: float = 0.005
+    OUTBOX_POLL_INTERVAL: float = 1.0
+    OUTBOX_LEASE: float = 30
+    OUTBOX_RETENTION: int = 24 * 60 * 60
 
 
 settings = Settings()
@@ -1,5 +1,7 @@
 from src.repositories.chat import ChatRepository
+from src.repositories.lease import LeaseRepository
 from src.repositories.message import MessageRepository
+from src.repositories.outbox import OutboxRepository
 from src.repositories.read_progress import ReadProgressRepository
 from src.repositories.user import UserRepository
 from src.routers.grpc import Message
@@ -8,11 +10,23 @@ from src.routers.kafka.producer import KafkaPublisher
 from src.services.chat import ChatService
 from src.services.message import MessageService
 from src.services.policy import AccessPolicy
+from src.services.read_buffer import ReadCoalescer
+from src.services.unread import UnreadCounterReconciler
 from src.services.user import UserService
 
 
-def get_message_repository() -> MessageRepository:
-    return MessageRepository()
+def get_outbox_repository() -> OutboxRepository:
+    return OutboxRepository()
+
+
+def get_message_repository(
+    outbox_repo: OutboxRepository = get_outbox_repository(),
+) -> MessageRepository:
+    return MessageRepository(outbox_repo=outbox_repo)
+
+
+def get_lease_repository() -> LeaseRepository:
+    return LeaseRepository()
 
 
 def get_read_progress_repository() -> ReadProgressRepository:
@@ -53,6 +67,7 @@ def get_message_service(
     chat_service: ChatService = get_chat_service(),
     kafka_producer: KafkaPublisher = get_kafka_producer(),
     access_policy: AccessPolicy = get_access_policy(),
+    outbox_repo: OutboxRepository = get_outbox_repository(),
 ) -> MessageService:
     return MessageService(
         repo=repo,
@@ -61,6 +76,7 @@ def get_message_service(
         chat_service=chat_service,
         kafka_producer=kafka_producer,
         access_policy=access_policy,
+        outbox_repo=outbox_repo,
     )
 
 
@@ -69,3 +85,19 @@ def get_grpc_message_service(
     message_service: MessageService = get_message_service(),
 ) -> Message:
     return Message(chat_service=chat_service, message_service=message_service)
+
+
+def get_unread_reconciler(
+    repo: MessageRepository = get_message_repository(),
+    progress_repo: ReadProgressRepository = get_read_progress_repository(),
+    lease_repo: LeaseRepository = get_lease_repository(),
+) -> UnreadCounterReconciler:
+    return UnreadCounterReconciler(
+        repo=repo, progress_repo=progress_repo, lease_repo=lease_repo
+    )
+
+
+def get_read_coalescer(
+    message_service: MessageService = get_message_service(),
+) -> ReadCoalescer:
+    return ReadCoalescer(message_service=message_service)
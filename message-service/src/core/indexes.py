@@ -0,0 +1,53 @@
+from beanie import Document
+from loguru import logger
+
+from src.models import Message
+
+# Индексы, без которых запросы истории превращаются в сканирование коллекции
+REQUIRED_INDEXES: dict[type[Document], list[list[tuple[str, int]]]] = {
+    Message: [[("chat_id", 1), ("_id", -1)]],
+}
+
+
+def _plan_stages(plan: dict) -> set[str]:
+    stages = {plan.get("stage", "")}
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages |= _plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages |= _plan_stages(child)
+    return stages
+
+
+async def check_indexes() -> None:
+    """Предупреждает о недостающих индексах и неиндексном плане "последних N"."""
+    for model, required in REQUIRED_INDEXES.items():
+        collection = model.get_pymongo_collection()
+        info = await collection.index_information()
+        # Направление сравниваем как есть: у text/hashed/2dsphere это строка,
+        # а 1.0 == 1 для индексов, созданных с float-направлением
+        existing = {tuple((k, d) for k, d in index["key"]) for index in info.values()}
+        for keys in required:
+            if tuple(keys) not in existing:
+                logger.warning(
+                    f"В коллекции {model.get_collection_name()} нет индекса {keys}"
+                )
+
+    try:
+        explain = (
+            await Message.get_pymongo_collection()
+            .find({"chat_id": 0})
+            .sort("_id", -1)
+            .limit(1)
+            .explain()
+        )
+    except Exception as e:
+        logger.warning(f"Не удалось проверить план запроса истории: {e}")
+        return
+    stages = _plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+    if "COLLSCAN" in stages or "SORT" in stages:
+        logger.warning(
+            f"Выборка последних сообщений чата не использует индекс: {sorted(stages)}"
+        )
+    else:
+        logger.info("Индексы сообщений на месте")
@@ -0,0 +1,79 @@
+from bson import DBRef
+from loguru import logger
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import DeleteMany, UpdateOne
+
+BATCH_SIZE = 1000
+# Одиночные индексы старой схемы, их заменил chat_id_user_id
+LEGACY_READ_PROGRESS_INDEXES = ("chat_id_1", "user_id_1")
+
+
+async def migrate_read_progress(db: AsyncIOMotorDatabase) -> None:
+    """Приводит read_progress к текущей схеме. Запускается до init_beanie.
+
+    1. Курсор из DBRef на сообщение превращается в ObjectId.
+    2. Дубли (chat_id, user_id) схлопываются в запись с самым дальним
+       курсором - иначе не построится уникальный индекс.
+    3. Удаляются одиночные индексы по chat_id и user_id.
+
+    Повторный запуск ничего не меняет.
+    """
+    collection = db["read_progress"]
+
+    converted = 0
+    requests = []
+    async for doc in collection.find(
+        {"last_read_message_id": {"$type": "object"}},
+        projection={"last_read_message_id": 1},
+    ):
+        ref = doc["last_read_message_id"]
+        message_id = ref.id if isinstance(ref, DBRef) else ref.get("$id")
+        requests.append(
+            UpdateOne(
+                {"_id": doc["_id"]}, {"$set": {"last_read_message_id": message_id}}
+            )
+        )
+        if len(requests) >= BATCH_SIZE:
+            converted += (await collection.bulk_write(requests)).modified_count
+            requests = []
+    if requests:
+        converted += (await collection.bulk_write(requests)).modified_count
+
+    duplicates = collection.aggregate(
+        [
+            {"$sort": {"last_read_message_id": -1}},
+            {
+                "$group": {
+                    "_id": {"chat_id": "$chat_id", "user_id": "$user_id"},
+                    "ids": {"$push": "$_id"},
+                }
+            },
+            {"$match": {"ids.1": {"$exists": True}}},
+        ],
+        allowDiskUse=True,
+    )
+    # Первый _id в группе - запись с самым дальним курсором, остальные лишние
+    stale_ids = [
+        stale_id async for group in duplicates for stale_id in group["ids"][1:]
+    ]
+    removed = 0
+    if stale_ids:
+        result = await collection.bulk_write(
+            [
+                DeleteMany({"_id": {"$in": stale_ids[i : i + BATCH_SIZE]}})
+                for i in range(0, len(stale_ids), BATCH_SIZE)
+            ]
+        )
+        removed = result.deleted_count
+
+    indexes = await collection.index_information()
+    for name in LEGACY_READ_PROGRESS_INDEXES:
+        if name in indexes:
+            await collection.drop_index(name)
+            logger.info(f"Удален устаревший индекс read_progress: {name}")
+
+    if converted or removed:
+        logger.info(
+            f"Миграция read_progress: курсоров переведено в ObjectId {converted}, "
+            f"удалено дублей {removed}"
+        )
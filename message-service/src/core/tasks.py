@@ -0,0 +1,34 @@
+import asyncio
+from typing import Coroutine
+
+from loguru import logger
+
+
+class BackgroundTasks:
+    """Фоновые задачи, которые не должны задерживать ответ клиенту.
+
+    Держит ссылки на задачи, чтобы их не собрал сборщик мусора, логирует
+    ошибки и позволяет дождаться незавершенных задач при остановке.
+    """
+
+    def __init__(self):
+        self.tasks: set[asyncio.Task] = set()
+
+    def spawn(self, coro: Coroutine, name: str) -> asyncio.Task:
+        task = asyncio.create_task(coro, name=name)
+        self.tasks.add(task)
+        task.add_done_callback(self._done)
+        return task
+
+    def _done(self, task: asyncio.Task) -> None:
+        self.tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(f"Ошибка фоновой задачи {task.get_name()}: {task.exception()}")
+
+    async def drain(self) -> None:
+        if self.tasks:
+            logger.info(f"Ожидаем завершения фоновых задач: {len(self.tasks)}")
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+
+
+background_tasks = BackgroundTasks()
@@ -0,0 +1,31 @@
+import time
+from typing import Awaitable, TypeVar
+
+T = TypeVar("T")
+
+
+class StageTimer:
+    """Замеряет длительность этапов запроса, в том числе идущих параллельно."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.stages: dict[str, float] = {}
+
+    async def measure(self, stage: str, awaitable: Awaitable[T]) -> T:
+        started_at = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.stages[stage] = (time.perf_counter() - started_at) * 1000
+
+    def mark(self, stage: str) -> None:
+        """Запоминает время от начала запроса до текущего момента."""
+        self.stages[stage] = self.total_ms
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def summary(self) -> str:
+        stages = ", ".join(f"{name} {ms:.1f}" for name, ms in self.stages.items())
+        return f"{self.total_ms:.1f} мс ({stages})"
@@ -8,22 +8,40 @@ from loguru import logger
 from motor.motor_asyncio import AsyncIOMotorClient
 
 import src.routers.kafka.subscriber
+from src.routers.kafka.subscriber import read_coalescer
 from protos import message_pb2, message_pb2_grpc
+from src.core.cache import chat_cache, user_cache
 from src.core.config import settings
+from src.core.deps import get_chat_service, get_unread_reconciler
+from src.core.indexes import check_indexes
+from src.core.migrations import migrate_read_progress
+from src.core.tasks import background_tasks
 from src.core.deps import get_grpc_message_service as MessageRouter
 from src.models import Message as MessageModel
-from src.models import MetaData, ReadProgress
+from src.models import MetaData, OutboxEvent, ReadProgress
 from src.models.replications import ChatReplica, UserReplica
 from src.routers.kafka import broker
+from src.services.outbox import outbox_relay
 
 app = FastStream(broker)
 server: grpc.aio.Server | None = None
+cache_stats_task: asyncio.Task | None = None
+reconcile_task: asyncio.Task | None = None
+
+
+async def log_cache_stats():
+    while True:
+        await asyncio.sleep(settings.CACHE_STATS_INTERVAL)
+        user_cache.log_stats()
+        chat_cache.log_stats()
 
 
 @app.on_startup
 async def startup():
-    global server
+    global server, cache_stats_task, reconcile_task
     motor_client = AsyncIOMotorClient(settings.MONGO_URL)
+    # До init_beanie: уникальный индекс read_progress не построится на старых данных
+    await migrate_read_progress(motor_client["messages"])
     await init_beanie(
         database=motor_client["messages"],
         document_models=[
@@ -31,8 +49,11 @@ async def startup():
             UserReplica,
             ChatReplica,
             ReadProgress,
+            OutboxEvent,
         ],
     )
+    await check_indexes()
+    await get_chat_service().backfill_active_members()
 
     server = grpc.aio.server(futures.ThreadPoolExecutor(max_workers=10))
     message_pb2_grpc.add_MessageServiceServicer_to_server(MessageRouter(), server)
@@ -40,10 +61,21 @@ async def startup():
     await server.start()
     logger.info(f"Listening on port :{settings.GRPC_PORT}")
 
+    cache_stats_task = asyncio.create_task(log_cache_stats())
+    reconcile_task = asyncio.create_task(get_unread_reconciler().run())
+    await read_coalescer.start()
+    await outbox_relay.start()
+
 
 @app.on_shutdown
 async def shutdown():
+    for task in (cache_stats_task, reconcile_task):
+        if task:
+            task.cancel()
+    await read_coalescer.stop()
     await server.stop(1)
+    await background_tasks.drain()
+    await outbox_relay.stop()
 
 
 if __name__ == "__main__":
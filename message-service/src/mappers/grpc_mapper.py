@@ -5,6 +5,11 @@ from google.protobuf import empty_pb2
 from protos import message_pb2, message_pb2_grpc
 from src.dto import ManyMessagesDTO, MessageDTO
 from src.models.replications import UserReplica
+from src.schemas.message import (
+    CreatedManyMessagesEvent,
+    CreatedMessageEvent,
+    MessagePayload,
+)
 
 
 class GrpcMapper:
@@ -146,6 +151,57 @@ class GrpcMapper:
         response.messages.extend(response_lst)
         return response
 
+    @classmethod
+    def unread_counts(cls, counts: dict[int, int]) -> message_pb2.UnreadCountsResponse:
+        return message_pb2.UnreadCountsResponse(
+            counts=[
+                message_pb2.UnreadCount(chat_id=chat_id, unread_count=unread_count)
+                for chat_id, unread_count in counts.items()
+            ]
+        )
+
+    @classmethod
+    def _payload_obj(cls, payload: MessagePayload) -> message_pb2.Message:
+        obj = message_pb2.Message(
+            id=payload.id,
+            chat_id=payload.chat_id,
+            user_id=payload.user_id,
+            content=payload.content,
+        )
+        obj.created_at.FromDatetime(payload.created_at)
+        # Пустые метаданные не пишем, чтобы не тратить байты на каждое сообщение;
+        # url_preview в protobuf нет, потребитель восстанавливает его как None
+        metadata = payload.metadata
+        obj.metadata.is_edited = metadata.is_edited
+        obj.metadata.is_pinned = metadata.is_pinned
+        for reaction, reacted_by in metadata.reactions.items():
+            obj.metadata.reactions[reaction].users_id.extend(reacted_by)
+        reply_data = metadata.reply_to
+        forward_data = metadata.forward_from
+        if reply_data:
+            obj.metadata.reply_to.CopyFrom(
+                message_pb2.ReplyData(**reply_data.model_dump())
+            )
+        if forward_data:
+            obj.metadata.forward_from.CopyFrom(
+                message_pb2.ForwardData(**forward_data.model_dump())
+            )
+        return obj
+
+    @classmethod
+    def message_created_event(
+        cls, event: Union[CreatedMessageEvent, CreatedManyMessagesEvent]
+    ) -> message_pb2.MessageCreatedEvent:
+        payloads = event.data if isinstance(event.data, list) else [event.data]
+        return message_pb2.MessageCreatedEvent(
+            version=event.version,
+            event_type=event.event_type,
+            recievers=event.recievers,
+            data=[cls._payload_obj(payload) for payload in payloads],
+            request_id=event.request_id,
+            sender_id=event.sender_id,
+        )
+
 
 mapper = GrpcMapper
 
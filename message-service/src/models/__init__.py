@@ -1,8 +1,11 @@
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 
-from beanie import BackLink, Document, Indexed, Link
+from beanie import BackLink, Document, PydanticObjectId
 from pydantic import BaseModel, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from src.core.config import settings
 
 
 class ReplyData(BaseModel):
@@ -35,13 +38,68 @@ class Message(Document):
 
     class Settings:
         name = "messages"
-        indexes = ["chat_id", "user_id", ("chat_id", "-created_at")]
+        indexes = [
+            "user_id",
+            # Все выборки истории идут по chat_id с сортировкой по _id
+            IndexModel(
+                [("chat_id", ASCENDING), ("_id", DESCENDING)], name="chat_id_id"
+            ),
+        ]
 
 
 class ReadProgress(Document):
-    chat_id: Indexed(int)
-    user_id: Indexed(int)
-    last_read_message_id: Link[Message]
+    chat_id: int
+    user_id: int
+    # _id последнего прочитанного сообщения (раньше хранился как DBRef);
+    # None - пользователь ничего не читал, запись хранит только счетчик
+    last_read_message_id: Optional[PydanticObjectId] = None
+    # Непрочитанные чужие сообщения после курсора; None - счетчик еще не посчитан
+    unread_count: Optional[int] = None
 
     class Settings:
         name = "read_progress"
+        indexes = [
+            IndexModel(
+                [("chat_id", ASCENDING), ("user_id", ASCENDING)],
+                name="chat_id_user_id",
+                unique=True,
+            ),
+            # Кто прочитал сообщение и самый дальний курсор чата;
+            # user_id в конце делает выборку read_by покрывающей
+            IndexModel(
+                [
+                    ("chat_id", ASCENDING),
+                    ("last_read_message_id", DESCENDING),
+                    ("user_id", ASCENDING),
+                ],
+                name="chat_id_last_read",
+            ),
+        ]
+
+
+class OutboxEvent(Document):
+    """Событие Kafka, записанное вместе с данными и еще не доставленное."""
+
+    topic: str
+    key: Optional[bytes] = None
+    body: bytes
+    content_type: str = "application/json"
+    headers: Dict[str, str] = Field(default_factory=dict)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    delivered_at: Optional[datetime] = None
+    # Аренда записи экземпляром ретранслятора, чтобы соседи не публиковали ее же
+    locked_by: Optional[str] = None
+    locked_until: Optional[datetime] = None
+
+    class Settings:
+        name = "outbox"
+        indexes = [
+            IndexModel(
+                [("delivered_at", ASCENDING), ("_id", ASCENDING)], name="pending"
+            ),
+            IndexModel(
+                [("delivered_at", ASCENDING)],
+                name="delivered_ttl",
+                expireAfterSeconds=settings.OUTBOX_RETENTION,
+            ),
+        ]
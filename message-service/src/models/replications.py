@@ -12,6 +12,9 @@ class UserReplica(Document):
 class ChatReplica(Document):
     chat_id: int = Field(..., unique=True)
     members: list[int] = []
+    # Участники с активным аккаунтом, поддерживается подписчиками событий
+    active_members: list[int] = []
 
     class Settings:
         name = "chats_replica"
+        indexes = ["members", "active_members"]
@@ -1,12 +1,32 @@
 from loguru import logger
+from beanie.operators import AddToSet, NE, Pull
 
+from src.core.cache import chat_cache
 from src.models.replications import ChatReplica
 
 
 class ChatRepository:
     async def get(self, chat_id: int):
+        chat = chat_cache.get(chat_id)
+        if chat:
+            return chat
+        try:
+            chat = await ChatReplica.find_one(ChatReplica.chat_id == chat_id)
+            if chat:
+                chat_cache.set(chat_id, chat)
+            return chat
+        except Exception as e:
+            logger.error(f'Database Error', e)
+            raise e
+
+    async def get_member_chat_ids(self, user_id: int, chat_ids: list[int]) -> list[int]:
+        """Те chat_ids, в репликах которых user_id есть среди участников."""
         try:
-            return await ChatReplica.find_one(ChatReplica.chat_id == chat_id)
+            chats = await ChatReplica.get_pymongo_collection().find(
+                {'chat_id': {'$in': chat_ids}, 'members': user_id},
+                projection={'chat_id': 1, '_id': 0}
+            ).to_list(None)
+            return [chat['chat_id'] for chat in chats]
         except Exception as e:
             logger.error(f'Database Error', e)
             raise e
@@ -14,21 +34,69 @@ class ChatRepository:
     async def upsert_data(self, data: dict):
         try:
             chat_id = data.pop('id')
-            print(data)
             chat = await ChatReplica.find_one(ChatReplica.chat_id == chat_id).upsert(
                 {"$set": {
-                    'members': data['members']
+                    'members': data['members'],
+                    'active_members': data['active_members']
                 }},
-                on_insert=ChatReplica(chat_id=chat_id, members=data['members'])
+                on_insert=ChatReplica(
+                    chat_id=chat_id,
+                    members=data['members'],
+                    active_members=data['active_members']
+                )
             )
+            chat_cache.invalidate(chat_id)
             return chat
         except Exception as e:
             logger.error(f'Database Error', e)
             raise e
         
+    async def set_member_active(self, user_id: int, is_active: bool) -> list[int]:
+        """Добавляет пользователя в active_members его чатов или убирает оттуда.
+
+        Возвращает id измененных чатов.
+        """
+        try:
+            if is_active:
+                query = ChatReplica.find(
+                    ChatReplica.members == user_id,
+                    NE(ChatReplica.active_members, user_id)
+                )
+                update = AddToSet({ChatReplica.active_members: user_id})
+            else:
+                query = ChatReplica.find(ChatReplica.active_members == user_id)
+                update = Pull({ChatReplica.active_members: user_id})
+            chat_ids = [chat.chat_id for chat in await query.to_list()]
+            if chat_ids:
+                await query.update(update)
+            for chat_id in chat_ids:
+                chat_cache.invalidate(chat_id)
+            return chat_ids
+        except Exception as e:
+            logger.error(f'Database Error', e)
+            raise e
+
+    async def get_without_active_members(self) -> list[ChatReplica]:
+        try:
+            return await ChatReplica.find({'active_members': {'$exists': False}}).to_list()
+        except Exception as e:
+            logger.error(f'Database Error', e)
+            raise e
+
+    async def set_active_members(self, chat_id: int, active_members: list[int]):
+        try:
+            await ChatReplica.find_one(ChatReplica.chat_id == chat_id).update(
+                {"$set": {'active_members': active_members}}
+            )
+            chat_cache.invalidate(chat_id)
+        except Exception as e:
+            logger.error(f'Database Error', e)
+            raise e
+
     async def delete(self, chat_id: int): 
         try:
             chat = await ChatReplica.find_one(ChatReplica.chat_id == chat_id).delete()
+            chat_cache.invalidate(chat_id)
         except Exception as e:
             logger.error(f'Database Error', e)
             raise e
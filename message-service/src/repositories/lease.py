@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta, timezone
+
+from loguru import logger
+from pymongo.errors import DuplicateKeyError
+
+from src.models import ReadProgress
+
+
+class LeaseRepository:
+    """Аренды фоновых задач в коллекции `leases` (по документу на задачу).
+
+    Аренду продлевает текущий владелец; после истечения ее забирает любой
+    экземпляр, так что задача выполняется одним экземпляром сервиса.
+    """
+
+    COLLECTION = "leases"
+
+    def _collection(self):
+        return ReadProgress.get_pymongo_collection().database[self.COLLECTION]
+
+    async def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        now = datetime.now(timezone.utc)
+        try:
+            await self._collection().update_one(
+                {
+                    "_id": name,
+                    "$or": [{"owner": owner}, {"expires_at": {"$lt": now}}],
+                },
+                {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=ttl)}},
+                upsert=True,
+            )
+            return True
+        except DuplicateKeyError:
+            # Документ есть, но аренда чужая и еще жива
+            return False
+        except Exception as e:
+            logger.error(f"Database Error", e)
+            raise e
@@ -1,17 +1,56 @@
 import asyncio
-from typing import Optional
+from typing import Callable, Optional
 
 import pymongo
-from beanie.operators import AddToSet, In, Pull, Set, Unset
+from beanie import PydanticObjectId
+from beanie.operators import AddToSet, Pull, Set, Unset
 from bson import ObjectId
 from loguru import logger
 
 from src.exceptions.message import MessageNotFoundError
 from src.formatters.text_formatter import slim_text_formatter
-from src.models import ForwardData, Message, MetaData, ReadProgress, ReplyData
+from src.models import (
+    ForwardData,
+    Message,
+    MetaData,
+    OutboxEvent,
+    ReadProgress,
+    ReplyData,
+)
+from src.repositories.outbox import OutboxRepository
+
+# Поля, которые нужны GrpcMapper для истории чата
+CONTEXT_PROJECTION = {
+    "user_id": 1,
+    "chat_id": 1,
+    "content": 1,
+    "created_at": 1,
+    "metadata.is_edited": 1,
+    "metadata.is_pinned": 1,
+    "metadata.reactions": 1,
+    "metadata.reply_to": 1,
+    "metadata.forward_from": 1,
+}
 
 
 class MessageRepository:
+    def __init__(self, outbox_repo: OutboxRepository):
+        self.outbox_repo = outbox_repo
+
+    async def _insert_with_outbox(
+        self,
+        messages: list[Message],
+        outbox: Callable[[list[Message]], OutboxEvent] | None,
+    ) -> None:
+        # _id назначается заранее, чтобы событие в outbox ссылалось на сообщения
+        for message in messages:
+            message.id = PydanticObjectId()
+        events = [outbox(messages)] if outbox else []
+        async with self.outbox_repo.transaction() as session:
+            await Message.insert_many(messages, session=session)
+            if events:
+                await self.outbox_repo.add(events, session=session)
+
     async def get(self, message_id: str) -> Message | None:
         try:
             message = await Message.get(message_id)
@@ -22,61 +61,76 @@ class MessageRepository:
             logger.error(f"Database Error {e}")
             raise e
 
+    @staticmethod
+    def _window_stage(chat_id: int, id_filter: dict, order: int, limit: int) -> dict:
+        return {
+            "$unionWith": {
+                "coll": Message.get_collection_name(),
+                "pipeline": [
+                    {"$match": {"chat_id": chat_id, "_id": id_filter}},
+                    {"$sort": {"_id": order}},
+                    {"$limit": limit},
+                ],
+            }
+        }
+
+    async def get_latest(self, chat_id: int, limit: int) -> list[Message]:
+        """Последние limit сообщений чата в хронологическом порядке."""
+        try:
+            messages = (
+                await Message.find(Message.chat_id == chat_id)
+                .sort(-Message.id)
+                .limit(limit)
+                .to_list()
+            )
+            messages.reverse()
+            return messages
+        except Exception as e:
+            logger.error(f"Database Error", e)
+            raise e
+
     async def get_context(
         self,
         chat_id: int,
         cursor_id: str | None,
         limit_before: int = 0,
         limit_after: int = 0,
-    ):
+        require_cursor: bool = False,
+    ) -> list[Message]:
         try:
             if not cursor_id:
-                messages = (
-                    await Message.find(Message.chat_id == chat_id)
-                    .limit(limit_after + limit_before + 1)
-                    .to_list()
+                return await self.get_latest(
+                    chat_id=chat_id, limit=limit_after + limit_before + 1
                 )
-                return messages
 
-            tasks = []
+            # Окно вокруг курсора одним запросом: сам курсор (он же проверка
+            # принадлежности чату) + $unionWith для сообщений до и после
             center_oid = ObjectId(cursor_id)
-
+            pipeline = [{"$match": {"_id": center_oid, "chat_id": chat_id}}]
             if limit_before > 0:
-                query_before = (
-                    Message.find(Message.chat_id == chat_id, Message.id < center_oid)
-                    .sort(-Message.id)
-                    .limit(limit_before)
+                pipeline.append(
+                    self._window_stage(chat_id, {"$lt": center_oid}, -1, limit_before)
                 )
-                tasks.append(query_before.to_list())
-
             if limit_after > 0:
-                query_after = (
-                    Message.find(Message.chat_id == chat_id, Message.id > center_oid)
-                    .sort(Message.id)
-                    .limit(limit_after)
+                pipeline.append(
+                    self._window_stage(chat_id, {"$gt": center_oid}, 1, limit_after)
                 )
-                tasks.append(query_after.to_list())
-
-            results = await asyncio.gather(*tasks)
+            pipeline.append({"$sort": {"_id": 1}})
+            pipeline.append({"$project": CONTEXT_PROJECTION})
 
-            messages_before = []
-            messages_after = []
-
-            task_index = 0
-            if limit_before > 0:
-                messages_before = results[task_index]
-                messages_before.reverse()
-                task_index += 1
-            if limit_after > 0:
-                messages_after = results[task_index]
-
-            center_message = await Message.get(center_oid)
-
-            return messages_before + [center_message] + messages_after
+            # Beanie 2 ждет awaitable-курсор pymongo, а сервис работает через motor
+            cursor = Message.get_pymongo_collection().aggregate(pipeline)
+            messages = [
+                Message.model_validate(doc) for doc in await cursor.to_list(None)
+            ]
         except Exception as e:
             logger.error(f"Database Error", e)
             raise e
 
+        if require_cursor and not any(m.id == center_oid for m in messages):
+            raise MessageNotFoundError(message_id=cursor_id)
+        return messages
+
     async def get_unread_count(
         self, chat_id: int, user_id: int, cursor_id: str | None = None
     ) -> int:
@@ -90,16 +144,81 @@ class MessageRepository:
             logger.error(f"Database Error", e)
             raise e
 
-    async def get_in_range(
-        self, chat_id: int, first_message_id: str | None, last_message_id: str
-    ) -> list[Message]:
+    async def get_unread_counts(
+        self, user_id: int, cursors: dict[int, ObjectId | None]
+    ) -> dict[int, int]:
+        """Число чужих сообщений после курсора для каждого чата одной агрегацией.
+
+        cursors - chat_id -> курсор пользователя (None, если он ничего не читал).
+        """
+        if not cursors:
+            return {}
         try:
-            conditions = [Message.chat_id == chat_id]
-            if first_message_id:
-                conditions.append(Message.id >= ObjectId(first_message_id))
-            conditions.append(Message.id <= ObjectId(last_message_id))
-            messages = await Message.find_many(*conditions).to_list()
-            return messages
+            branches = [
+                (
+                    {"chat_id": chat_id, "_id": {"$gt": cursor}}
+                    if cursor
+                    else {"chat_id": chat_id}
+                )
+                for chat_id, cursor in cursors.items()
+            ]
+            pipeline = [
+                {
+                    "$match": {
+                        "chat_id": {"$in": list(cursors)},
+                        "user_id": {"$ne": user_id},
+                        "$or": branches,
+                    }
+                },
+                {"$group": {"_id": "$chat_id", "count": {"$sum": 1}}},
+            ]
+            cursor = Message.get_pymongo_collection().aggregate(pipeline)
+            counts = dict.fromkeys(cursors, 0)
+            counts.update(
+                {doc["_id"]: doc["count"] for doc in await cursor.to_list(None)}
+            )
+            return counts
+        except Exception as e:
+            logger.error(f"Database Error", e)
+            raise e
+
+    async def get_last_by_authors(
+        self,
+        chat_id: int,
+        after_id: str | None,
+        until_id: str,
+        exclude_user_id: int,
+    ) -> list[tuple[int, ObjectId, int]]:
+        """Последнее сообщение и число сообщений каждого автора в (after_id, until_id].
+
+        Группировка идет на стороне базы, так что вместо документов
+        диапазона возвращаются только тройки (автор, id, количество).
+        """
+        try:
+            id_filter = {"$lte": ObjectId(until_id)}
+            if after_id:
+                id_filter["$gt"] = ObjectId(after_id)
+            pipeline = [
+                {
+                    "$match": {
+                        "chat_id": chat_id,
+                        "_id": id_filter,
+                        "user_id": {"$ne": exclude_user_id},
+                    }
+                },
+                {
+                    "$group": {
+                        "_id": "$user_id",
+                        "last_id": {"$max": "$_id"},
+                        "count": {"$sum": 1},
+                    }
+                },
+            ]
+            cursor = Message.get_pymongo_collection().aggregate(pipeline)
+            return [
+                (doc["_id"], doc["last_id"], doc["count"])
+                for doc in await cursor.to_list(None)
+            ]
         except Exception as e:
             logger.error(f"Database Error", e)
             raise e
@@ -110,7 +229,9 @@ class MessageRepository:
         chat_id: int,
         content: str,
         reply_to: Optional[Message] = None,
+        outbox: Callable[[Message], OutboxEvent] | None = None,
     ) -> Message:
+        """Сохраняет сообщение вместе с событием outbox(message), если оно передано."""
         try:
             metadata = MetaData()
             if reply_to:
@@ -123,20 +244,27 @@ class MessageRepository:
             message = Message(
                 user_id=user_id, chat_id=chat_id, content=content, metadata=metadata
             )
-            await message.insert()
+            await self._insert_with_outbox(
+                [message], (lambda messages: outbox(messages[0])) if outbox else None
+            )
             return message
         except Exception as e:
             logger.error(f"Database Error", e)
             raise e
 
-    async def delete(self, message: Message):
+    async def delete(self, message: Message, outbox: OutboxEvent | None = None):
         try:
-            await message.delete()
+            async with self.outbox_repo.transaction() as session:
+                await message.delete(session=session)
+                if outbox:
+                    await self.outbox_repo.add([outbox], session=session)
         except Exception as e:
             logger.error(f"Database Error", e)
             raise e
 
-    async def update(self, message: Message, new_content: str):
+    async def update(
+        self, message: Message, new_content: str, outbox: OutboxEvent | None = None
+    ):
         try:
             update_data = {
                 Message.content: new_content,
@@ -146,7 +274,10 @@ class MessageRepository:
                 update_data[Message.metadata.reply_to.preview] = (
                     new_content if len(new_content) <= 50 else new_content[:47] + "..."
                 )
-            message = await message.update(Set(update_data))
+            async with self.outbox_repo.transaction() as session:
+                message = await message.update(Set(update_data), session=session)
+                if outbox:
+                    await self.outbox_repo.add([outbox], session=session)
             return message
         except Exception as e:
             logger.error(f"Database Error", e)
@@ -172,32 +303,59 @@ class MessageRepository:
             logger.error(f"Database Error", e)
             raise e
 
-    async def add_reaction(self, message_id: str, reaction: str, author: int) -> bool:
+    async def add_reaction(
+        self,
+        message_id: str,
+        reaction: str,
+        author: int,
+        outbox: OutboxEvent | None = None,
+    ) -> bool:
+        """Событие outbox пишется, только если реакция действительно добавлена."""
         try:
-            result = await Message.find_one(Message.id == ObjectId(message_id)).update(
-                AddToSet({Message.metadata.reactions[reaction]: author})
-            )
-            if result.matched_count == 0:
-                raise MessageNotFoundError(message_id)
+            async with self.outbox_repo.transaction() as session:
+                result = await Message.find_one(
+                    Message.id == ObjectId(message_id), session=session
+                ).update(
+                    AddToSet({Message.metadata.reactions[reaction]: author}),
+                    session=session,
+                )
+                if result.matched_count == 0:
+                    raise MessageNotFoundError(message_id)
+                if result.modified_count > 0 and outbox:
+                    await self.outbox_repo.add([outbox], session=session)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Database Error", e)
             raise e
 
     async def remove_reaction(
-        self, message_id: str, reaction: str, author: int
+        self,
+        message_id: str,
+        reaction: str,
+        author: int,
+        outbox: OutboxEvent | None = None,
     ) -> bool:
+        """Событие outbox пишется, только если реакция действительно снята."""
         try:
-            result = await Message.find_one(Message.id == ObjectId(message_id)).update(
-                Pull({Message.metadata.reactions[reaction]: author})
-            )
-            if result.matched_count == 0:
-                raise MessageNotFoundError(message_id)
-            if result.modified_count > 0:
-                await Message.find_one(
-                    Message.id == ObjectId(message_id),
-                    {f"metadata.reactions.{reaction}": {"$size": 0}},
-                ).update(Unset({f"metadata.reactions.{reaction}": ""}))
+            async with self.outbox_repo.transaction() as session:
+                result = await Message.find_one(
+                    Message.id == ObjectId(message_id), session=session
+                ).update(
+                    Pull({Message.metadata.reactions[reaction]: author}),
+                    session=session,
+                )
+                if result.matched_count == 0:
+                    raise MessageNotFoundError(message_id)
+                if result.modified_count > 0:
+                    await Message.find_one(
+                        Message.id == ObjectId(message_id),
+                        {f"metadata.reactions.{reaction}": {"$size": 0}},
+                        session=session,
+                    ).update(
+                        Unset({f"metadata.reactions.{reaction}": ""}), session=session
+                    )
+                    if outbox:
+                        await self.outbox_repo.add([outbox], session=session)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Database Error", e)
@@ -209,6 +367,7 @@ class MessageRepository:
         chat_id: int,
         messages_data: list[Message],
         content: str | None = None,
+        outbox: Callable[[list[Message]], OutboxEvent] | None = None,
     ) -> list[Message]:
         try:
             messages = []
@@ -229,9 +388,8 @@ class MessageRepository:
                 messages.append(
                     Message(user_id=user_id, chat_id=chat_id, content=content)
                 )
-            result = await Message.insert_many(messages)
-            response = await Message.find(In(Message.id, result.inserted_ids)).to_list()
-            return response
+            await self._insert_with_outbox(messages, outbox)
+            return messages
         except Exception as e:
             logger.error(f"Database Error", e)
             raise e
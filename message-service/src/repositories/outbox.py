@@ -0,0 +1,112 @@
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
+
+from bson import ObjectId
+from loguru import logger
+from motor.motor_asyncio import AsyncIOMotorClientSession
+
+from src.models import OutboxEvent
+
+
+class OutboxRepository:
+    # Определяется при первой записи: транзакции есть только у replica set/mongos
+    supports_transactions: bool | None = None
+
+    @classmethod
+    async def _check_transactions(cls) -> bool:
+        if cls.supports_transactions is None:
+            hello = await OutboxEvent.get_pymongo_collection().database.command("hello")
+            cls.supports_transactions = (
+                "setName" in hello or hello.get("msg") == "isdbgrid"
+            )
+            if not cls.supports_transactions:
+                logger.warning(
+                    "MongoDB без replica set: сообщения и outbox пишутся без транзакции"
+                )
+        return cls.supports_transactions
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[AsyncIOMotorClientSession | None]:
+        """Сессия с транзакцией, если сервер их поддерживает, иначе None."""
+        if not await self._check_transactions():
+            yield None
+            return
+        client = OutboxEvent.get_pymongo_collection().database.client
+        async with await client.start_session() as session:
+            async with session.start_transaction():
+                yield session
+
+    async def add(
+        self,
+        events: list[OutboxEvent],
+        session: AsyncIOMotorClientSession | None = None,
+    ) -> None:
+        try:
+            await OutboxEvent.insert_many(events, session=session)
+        except Exception as e:
+            logger.error(f"Database Error", e)
+            raise e
+
+    async def claim_pending(self, limit: int, lease: float) -> list[OutboxEvent]:
+        """Берет в аренду до limit недоставленных событий в порядке записи."""
+        now = datetime.now(timezone.utc)
+        available = {
+            "delivered_at": None,
+            "$or": [{"locked_until": None}, {"locked_until": {"$lt": now}}],
+        }
+        collection = OutboxEvent.get_pymongo_collection()
+        try:
+            cursor = (
+                collection.find(available, projection={"_id": 1})
+                .sort("_id", 1)
+                .limit(limit)
+            )
+            ids = [doc["_id"] for doc in await cursor.to_list(None)]
+            if not ids:
+                return []
+
+            token = uuid.uuid4().hex
+            await collection.update_many(
+                {"_id": {"$in": ids}, **available},
+                {
+                    "$set": {
+                        "locked_by": token,
+                        "locked_until": now + timedelta(seconds=lease),
+                    }
+                },
+            )
+            return (
+                await OutboxEvent.find({"_id": {"$in": ids}, "locked_by": token})
+                .sort(OutboxEvent.id)
+                .to_list()
+            )
+        except Exception as e:
+            logger.error(f"Database Error", e)
+            raise e
+
+    async def mark_delivered(self, event_ids: list[ObjectId]) -> None:
+        if not event_ids:
+            return
+        try:
+            await OutboxEvent.get_pymongo_collection().update_many(
+                {"_id": {"$in": event_ids}},
+                {"$set": {"delivered_at": datetime.now(timezone.utc)}},
+            )
+        except Exception as e:
+            logger.error(f"Database Error", e)
+            raise e
+
+    async def release(self, event_ids: list[ObjectId]) -> None:
+        """Снимает аренду, чтобы неотправленные события ушли со следующей пачкой."""
+        if not event_ids:
+            return
+        try:
+            await OutboxEvent.get_pymongo_collection().update_many(
+                {"_id": {"$in": event_ids}},
+                {"$set": {"locked_by": None, "locked_until": None}},
+            )
+        except Exception as e:
+            logger.error(f"Database Error", e)
+            raise e
@@ -1,29 +1,61 @@
-from beanie.operators import Set
+from beanie.operators import In
 from bson import ObjectId
 from loguru import logger
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
 from src.models import Message, ReadProgress
 
 
 class ReadProgressRepository:
+    @staticmethod
+    def get_cursor(progress: ReadProgress | None) -> str | None:
+        return (
+            str(progress.last_read_message_id)
+            if progress and progress.last_read_message_id
+            else None
+        )
+
+    async def get(self, chat_id: int, user_id: int) -> ReadProgress | None:
+        try:
+            return await ReadProgress.find_one(
+                ReadProgress.chat_id == chat_id,
+                ReadProgress.user_id == user_id,
+            )
+        except Exception as e:
+            logger.error(f"Database Error: {e}")
+            raise e
+
+    async def get_many(self, user_id: int, chat_ids: list[int]) -> list[ReadProgress]:
+        try:
+            return await ReadProgress.find(
+                In(ReadProgress.chat_id, chat_ids),
+                ReadProgress.user_id == user_id,
+            ).to_list()
+        except Exception as e:
+            logger.error(f"Database Error: {e}")
+            raise e
+
     async def get_last_read_chat_message(
-        self, chat_id: int, user_id: int
+        self, chat_id: int, user_id: int, author_id: int | None = None
     ) -> str | None:
+        """Самый дальний курсор чата среди остальных участников.
+
+        author_id тоже исключается: курсор автора всегда стоит на его
+        собственных сообщениях и не говорит о том, прочитал ли их кто-то.
+        """
+        excluded = [user_id] if author_id is None else [user_id, author_id]
         try:
-            progress = (
-                await ReadProgress.find(
-                    ReadProgress.chat_id == chat_id,
-                    ReadProgress.user_id != user_id,
-                    sort=[("_id", -1)],
-                )
-                .limit(1)
-                .to_list()
-            )
-            return (
-                str(progress[0].last_read_message_id.ref.id)
-                if progress and progress[0].last_read_message_id
-                else None
+            progress = await ReadProgress.get_pymongo_collection().find_one(
+                {
+                    "chat_id": chat_id,
+                    "user_id": {"$nin": excluded},
+                    "last_read_message_id": {"$ne": None},
+                },
+                projection={"last_read_message_id": 1},
+                sort=[("last_read_message_id", -1)],
             )
+            return str(progress["last_read_message_id"]) if progress else None
 
         except Exception as e:
             logger.error(f"Database Error: {e}")
@@ -33,15 +65,12 @@ class ReadProgressRepository:
         self, chat_id: int, user_id: int
     ) -> str | None:
         try:
-            progress = await ReadProgress.find_one(
-                ReadProgress.chat_id == chat_id,
-                ReadProgress.user_id == user_id,
-            )
-            return (
-                str(progress.last_read_message_id.ref.id)
-                if progress and progress.last_read_message_id
-                else None
+            progress = await ReadProgress.get_pymongo_collection().find_one(
+                {"chat_id": chat_id, "user_id": user_id},
+                projection={"last_read_message_id": 1},
             )
+            cursor = progress.get("last_read_message_id") if progress else None
+            return str(cursor) if cursor else None
         except Exception as e:
             logger.error(f"Database Error: {e}")
             raise e
@@ -50,34 +79,203 @@ class ReadProgressRepository:
         self, chat_id: int, message_id: str
     ) -> list[int]:
         try:
-            cursors = await ReadProgress.find(
-                ReadProgress.chat_id == chat_id,
-                ReadProgress.last_read_message_id >= ObjectId(message_id),
-            ).to_list()
-            return [cursor.user_id for cursor in cursors]
+            # Ответ целиком берется из индекса chat_id_last_read
+            cursor = ReadProgress.get_pymongo_collection().find(
+                {
+                    "chat_id": chat_id,
+                    "last_read_message_id": {"$gte": ObjectId(message_id)},
+                },
+                projection={"_id": 0, "user_id": 1},
+            )
+            return [doc["user_id"] for doc in await cursor.to_list(None)]
 
         except Exception as e:
             logger.error(f"Database Error", e)
             raise e
 
+    @staticmethod
+    def _cursor_update(
+        chat_id: int, user_id: int, message_id: ObjectId, reset_unread: bool = False
+    ) -> tuple[dict, list[dict]]:
+        # Курсор только растет: $max по _id отбрасывает устаревшие переходы
+        fields = {
+            "last_read_message_id": {"$max": ["$last_read_message_id", message_id]}
+        }
+        if reset_unread:
+            fields["unread_count"] = 0
+        return {"chat_id": chat_id, "user_id": user_id}, [{"$set": fields}]
+
     async def set_last_read_message(
-        self, chat_id: int, user_id: int, message_id: str
+        self,
+        chat_id: int,
+        user_id: int,
+        message_id: str,
+        reset_unread: bool = False,
+        verify: bool = True,
+    ) -> None:
+        """Двигает курсор одним условным upsert.
+
+        verify=False для только что вставленных сообщений: тогда проверка
+        существования (запрос только по индексу _id) пропускается.
+        """
+        oid = ObjectId(message_id)
+        try:
+            if verify:
+                exists = await Message.get_pymongo_collection().find_one(
+                    {"_id": oid, "chat_id": chat_id}, projection={"_id": 1}
+                )
+                if not exists:
+                    raise ValueError(f"Message with id {message_id} not found")
+
+            await ReadProgress.get_pymongo_collection().update_one(
+                *self._cursor_update(chat_id, user_id, oid, reset_unread), upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Database Error", e)
+            raise e
+
+    async def set_last_read_many(self, cursors: list[tuple[int, int, str]]) -> None:
+        """Применяет много переходов курсора (chat_id, user_id, message_id) одним bulk_write."""
+        if not cursors:
+            return
+        try:
+            await ReadProgress.get_pymongo_collection().bulk_write(
+                [
+                    UpdateOne(
+                        *self._cursor_update(chat_id, user_id, ObjectId(message_id)),
+                        upsert=True,
+                    )
+                    for chat_id, user_id, message_id in cursors
+                ],
+                ordered=False,
+            )
+        except Exception as e:
+            logger.error(f"Database Error", e)
+            raise e
+
+    async def increment_unread(self, chat_id: int, sender_id: int, count: int) -> None:
+        """Увеличивает счетчики всех участников чата, кроме отправителя."""
+        try:
+            await ReadProgress.find(
+                ReadProgress.chat_id == chat_id,
+                ReadProgress.user_id != sender_id,
+                {"unread_count": {"$ne": None}},
+            ).update({"$inc": {"unread_count": count}})
+        except Exception as e:
+            logger.error(f"Database Error", e)
+            raise e
+
+    async def decrement_unread(self, chat_id: int, user_id: int, count: int) -> None:
+        try:
+            await ReadProgress.get_pymongo_collection().update_one(
+                {"chat_id": chat_id, "user_id": user_id, "unread_count": {"$ne": None}},
+                [
+                    {
+                        "$set": {
+                            "unread_count": {
+                                "$max": [0, {"$subtract": ["$unread_count", count]}]
+                            }
+                        }
+                    }
+                ],
+            )
+        except Exception as e:
+            logger.error(f"Database Error", e)
+            raise e
+
+    async def decrement_unread_for_deleted(
+        self, chat_id: int, author_id: int, message_id: str
+    ) -> None:
+        """Уменьшает счетчики тех, у кого удаленное сообщение было непрочитанным."""
+        oid = ObjectId(message_id)
+        try:
+            await ReadProgress.get_pymongo_collection().update_many(
+                {
+                    "chat_id": chat_id,
+                    "user_id": {"$ne": author_id},
+                    "unread_count": {"$gt": 0},
+                    "$or": [
+                        {"last_read_message_id": {"$lt": oid}},
+                        {"last_read_message_id": None},
+                    ],
+                },
+                {"$inc": {"unread_count": -1}},
+            )
+        except Exception as e:
+            logger.error(f"Database Error", e)
+            raise e
+
+    async def set_unread(
+        self,
+        chat_id: int,
+        user_id: int,
+        count: int,
+        expected: int | None,
+        cursor: ObjectId | None,
+    ) -> bool:
+        """Записывает пересчитанный счетчик, если запись не менялась с момента чтения.
+
+        Сравнение с прочитанными счетчиком и курсором не дает затереть $inc
+        или сброс при прочтении, пришедшие между подсчетом и записью.
+        """
+        try:
+            result = await ReadProgress.get_pymongo_collection().update_one(
+                {
+                    "chat_id": chat_id,
+                    "user_id": user_id,
+                    "unread_count": expected,
+                    "last_read_message_id": cursor,
+                },
+                {"$set": {"unread_count": count}},
+            )
+            return result.modified_count > 0
+        except Exception as e:
+            logger.error(f"Database Error", e)
+            raise e
+
+    async def init_unread_many(
+        self, user_id: int, counters: dict[int, tuple[ObjectId | None, int]]
     ) -> None:
+        """Заводит счетчики chat_id -> (курсор, число) одним bulk_write с upsert.
+
+        Для чата, где пользователь ничего не читал, создается запись без
+        курсора. Условие на пустой счетчик и прочитанный курсор не дает
+        затереть прочтение или уже заведенный счетчик: такие строки
+        упираются в уникальный индекс и пропускаются.
+        """
+        if not counters:
+            return
+        requests = [
+            UpdateOne(
+                {
+                    "chat_id": chat_id,
+                    "user_id": user_id,
+                    "unread_count": None,
+                    "last_read_message_id": cursor,
+                },
+                {"$set": {"unread_count": count}},
+                upsert=True,
+            )
+            for chat_id, (cursor, count) in counters.items()
+        ]
         try:
-            message_obj = await Message.get(ObjectId(message_id))
-            if not message_obj:
-                raise ValueError(f"Message with id {message_id} not found")
-
-            await ReadProgress.find_one(
-                ReadProgress.chat_id == chat_id, ReadProgress.user_id == user_id
-            ).upsert(
-                Set({ReadProgress.last_read_message_id: message_obj.id}),
-                on_insert=ReadProgress(
-                    user_id=user_id,
-                    chat_id=chat_id,
-                    last_read_message_id=message_obj.id,
-                ),
+            await ReadProgress.get_pymongo_collection().bulk_write(
+                requests, ordered=False
             )
+        except BulkWriteError as e:
+            if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+                logger.error(f"Database Error", e)
+                raise e
+        except Exception as e:
+            logger.error(f"Database Error", e)
+            raise e
+
+    async def get_batch(
+        self, after_id: ObjectId | None, limit: int
+    ) -> list[ReadProgress]:
+        try:
+            query = ReadProgress.find(ReadProgress.id > after_id if after_id else {})
+            return await query.sort(ReadProgress.id).limit(limit).to_list()
         except Exception as e:
             logger.error(f"Database Error", e)
             raise e
@@ -1,24 +1,46 @@
 from loguru import logger
 from beanie.operators import In
 
+from src.core.cache import user_cache
 from src.models.replications import UserReplica
 
 
 class UserRepository:
     async def get(self, id: int):
+        user = user_cache.get(id)
+        if user:
+            return user
         try:
             user = await UserReplica.find_one(UserReplica.user_id == id)
+            if user:
+                user_cache.set(id, user)
             return user
         except Exception as e:
             logger.error(f'Database Error', e)
             raise e
 
-    async def get_multiple(self, ids: list[int]) -> UserReplica:
+    async def get_multiple(self, ids: list[int]) -> list[UserReplica]:
+        cached, missing = user_cache.get_many(ids)
+        if not missing:
+            return list(cached.values())
+        try:
+            users = await UserReplica.find(
+                In(UserReplica.user_id, missing)
+            ).to_list()
+            for user in users:
+                user_cache.set(user.user_id, user)
+            return list(cached.values()) + users
+        except Exception as e:
+            logger.error(f'Database Error', e)
+            raise e
+
+    async def get_active_ids(self, ids: list[int]) -> set[int]:
         try:
             users = await UserReplica.find(
-                In(UserReplica.user_id, ids)
+                In(UserReplica.user_id, ids),
+                UserReplica.is_active == True
             ).to_list()
-            return users
+            return {user.user_id for user in users}
         except Exception as e:
             logger.error(f'Database Error', e)
             raise e
@@ -30,6 +52,7 @@ class UserRepository:
                 {"$set": {**data}},
                 on_insert=UserReplica(user_id=user_id, **data)
             )
+            user_cache.invalidate(user_id)
             return user
         except Exception as e:
             logger.error(f'Database Error', e)
@@ -44,6 +67,7 @@ class UserRepository:
                     }
                 }
             )
+            user_cache.invalidate(user_id)
             return user
         except Exception as e:
             logger.error(f'Database Error', e)
@@ -94,3 +94,10 @@ class Message(message_pb2_grpc.MessageServiceServicer):
         )
         response = mapper.forward_message(messages)
         return response
+
+    @handle_exceptions
+    async def GetUnreadCounts(self, request, context):
+        counts = await self.service.get_unread_counts(
+            user_id=request.user_id, chat_ids=list(request.chat_ids)
+        )
+        return mapper.unread_counts(counts)
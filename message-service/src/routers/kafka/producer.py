@@ -1,108 +1,144 @@
-from typing import Union
-
+from faststream.broker.message import encode_message
 from faststream.kafka import KafkaBroker
 from loguru import logger
 
-from src.models import Message
+from src.core.config import settings
+from src.mappers.grpc_mapper import mapper
+from src.models import Message, OutboxEvent
 from src.schemas.message import *
 
+PROTOBUF_CONTENT_TYPE = "application/x-protobuf"
+
 
 class KafkaPublisher:
-    def __init__(self, broker: KafkaBroker, topic="message.events"):
+    def __init__(
+        self,
+        broker: KafkaBroker,
+        topic="message.events",
+        encoding: str = settings.MESSAGE_EVENTS_ENCODING,
+    ):
         self.broker = broker
         self.topic = topic
+        self.encoding = encoding
         self.logger = logger
 
-    async def _publish(self, event: EventBase) -> None:
-        await self.broker.publish(event, self.topic)
+    @staticmethod
+    def _key(chat_id: int) -> bytes:
+        # Все события чата идут в одну партицию и сохраняют порядок
+        return str(chat_id).encode()
+
+    def _outbox(self, event: EventBase, chat_id: int) -> OutboxEvent:
+        """Запись outbox: все события message.events уходят через один ретранслятор.
 
-    async def create_message(
+        В protobuf кодируются только MessageCreated/MessagesCreated, остальные
+        события всегда идут в JSON.
+        """
+        headers = {}
+        created = isinstance(event, (CreatedMessageEvent, CreatedManyMessagesEvent))
+        if created:
+            headers["event-version"] = str(event.version)
+        if created and self.encoding == "protobuf":
+            body = mapper.message_created_event(event).SerializeToString()
+            content_type = PROTOBUF_CONTENT_TYPE
+        else:
+            # Сериализуем так же, как broker.publish: ретранслятор шлет байты как есть
+            body, content_type = encode_message(event)
+        return OutboxEvent(
+            topic=self.topic,
+            key=self._key(chat_id),
+            body=body,
+            content_type=content_type,
+            headers=headers,
+        )
+
+    def create_message(
         self, data: Message, recievers: list[int], request_id: str, sender_id: int
-    ) -> None:
-        self.logger.info("Публикуем событие создания сообщения в Kafka")
-        return await self._publish(
+    ) -> OutboxEvent:
+        """Событие создания сообщения для записи в outbox вместе с сообщением."""
+        return self._outbox(
             CreatedMessageEvent(
                 recievers=recievers,
-                data=data,
+                data=MessagePayload.from_message(data),
                 request_id=request_id,
                 sender_id=sender_id,
-            )
+            ),
+            chat_id=data.chat_id,
         )
 
-    async def create_many_messages(
+    def create_many_messages(
         self, data: list[Message], recievers: list[int], request_id: str, sender_id: int
-    ) -> None:
-        self.logger.info("Публикуем событие создания сообщения в Kafka")
-        return await self._publish(
+    ) -> OutboxEvent:
+        return self._outbox(
             CreatedManyMessagesEvent(
                 recievers=recievers,
-                data=data,
+                data=[MessagePayload.from_message(message) for message in data],
                 request_id=request_id,
                 sender_id=sender_id,
-            )
+            ),
+            chat_id=data[0].chat_id,
         )
 
-    async def update_message(
+    def update_message(
         self,
+        chat_id: int,
         data: UpdateMessagePayload,
         recievers: list[int],
         request_id: str,
         sender_id: int,
-    ) -> None:
-        self.logger.info("Публикуем событие обновления сообщения в Kafka")
-        return await self._publish(
+    ) -> OutboxEvent:
+        return self._outbox(
             UpdateMessageEvent(
                 recievers=recievers,
                 data=data,
                 request_id=request_id,
                 sender_id=sender_id,
-            )
+            ),
+            chat_id,
         )
 
-    async def delete_message(
+    def delete_message(
         self,
+        chat_id: int,
         data: MessageIdPayload,
         recievers: list[int],
         request_id: str,
         sender_id: int,
-    ) -> None:
-        self.logger.info("Публикуем событие удаления сообщения в Kafka")
-        return await self._publish(
+    ) -> OutboxEvent:
+        return self._outbox(
             DeleteMessageEvent(
                 recievers=recievers,
                 data=data,
                 request_id=request_id,
                 sender_id=sender_id,
-            )
+            ),
+            chat_id,
         )
 
-    async def read_message(self, data: list[SlimMessageData]) -> None:
-        self.logger.info("Публикуем событие чтения сообщений в Kafka")
-        self.logger.info(data)
-        return await self._publish(MessagesReadEvent(data=data))
+    def read_message(self, chat_id: int, data: list[SlimMessageData]) -> OutboxEvent:
+        return self._outbox(MessagesReadEvent(data=data), chat_id)
 
-    async def add_reaction(
-        self, data: Reaction, sender_id: int, recievers: list[int]
-    ) -> None:
-        self.logger.info("Публикуем событие о добавлении реакции сообщения")
-        return await self._publish(
+    def add_reaction(
+        self, chat_id: int, data: Reaction, sender_id: int, recievers: list[int]
+    ) -> OutboxEvent:
+        return self._outbox(
             ReactionEvent(
                 event_type="ReactionAdded",
                 data=data,
                 sender_id=sender_id,
                 recievers=recievers,
-            )
+            ),
+            chat_id,
         )
 
-    async def remove_reaction(
-        self, data: Reaction, sender_id: int, recievers: list[int]
-    ) -> None:
-        self.logger.info("Публикуем событие об удалении реакции на сообщение")
-        return await self._publish(
+    def remove_reaction(
+        self, chat_id: int, data: Reaction, sender_id: int, recievers: list[int]
+    ) -> OutboxEvent:
+        return self._outbox(
             ReactionEvent(
                 event_type="ReactionRemoved",
                 data=data,
                 sender_id=sender_id,
                 recievers=recievers,
-            )
+            ),
+            chat_id,
         )
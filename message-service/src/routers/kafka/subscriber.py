@@ -1,6 +1,7 @@
 from loguru import logger
 from faststream.kafka import KafkaRouter
 
+from src.core.cache import chat_cache, user_cache
 from src.routers.kafka import broker
 from src.schemas.user import IncomingUserEvent
 from src.schemas.chat import ChatEvent
@@ -8,12 +9,14 @@ from src.services.message import *
 from src.core.deps import (
     get_user_service,
     get_chat_service,
-    get_message_service
+    get_message_service,
+    get_read_coalescer
 )
 
 user_service = get_user_service()
 chat_service = get_chat_service()
 message_service = get_message_service()
+read_coalescer = get_read_coalescer(message_service)
 
 @broker.subscriber(
         'user.events',
@@ -26,8 +29,10 @@ async def user_event(data: IncomingUserEvent):
     logger.info(f"Получено уведомление о собынии в сервисе пользователей {event}")
     if event in ("UserCreated", "UserUpdated"):
         await user_service.create(data)
+        await chat_service.sync_member_status(data.id, data.is_active)
     elif event == 'UserDeactivated':
         await user_service.deactivate(data)
+        await chat_service.sync_member_status(data.id, False)
 
 @broker.subscriber(
         'chat.events',
@@ -44,6 +49,25 @@ async def chat_event(data: ChatEvent):
         await chat_service.delete(data)
         await message_service.delete_chat_messages(data.id)
 
+# Кэш реплик есть у каждого экземпляра, поэтому сбрасывается подписчиками без
+# consumer group: событие видит каждый экземпляр, а не один из группы
+@broker.subscriber(
+        'user.events',
+        auto_offset_reset='latest'
+    )
+async def user_cache_event(data: IncomingUserEvent):
+    user_id = data.data.id
+    user_cache.evict(user_id)
+    # active_members чатов пользователя тоже поменяются
+    chat_cache.evict_where(lambda chat: user_id in chat.members)
+
+@broker.subscriber(
+        'chat.events',
+        auto_offset_reset='latest'
+    )
+async def chat_cache_event(data: ChatEvent):
+    chat_cache.evict(data.data.id)
+
 
 @broker.subscriber(
     'api_gateway.mark_as_read',
@@ -51,12 +75,11 @@ async def chat_event(data: ChatEvent):
     auto_offset_reset='earliest' 
 )
 async def handle_readed_messages(data: ApiGatewayReadEvent):
-    logger.info("Получено уведомление о прочтении сообщений")
-    await message_service.mark_as_read(
+    logger.debug("Получено уведомление о прочтении сообщений")
+    read_coalescer.add(
         chat_id=data.chat_id,
         user_id=data.user_id,
         message_id=data.last_read_message_id
     )
-    logger.info(f"{data}")
     
 
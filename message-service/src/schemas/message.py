@@ -3,7 +3,10 @@ from typing import Literal, Union
 
 from pydantic import BaseModel
 
-from src.models import Message
+from src.models import Message, MetaData
+
+# Версия схемы MessageCreated/MessagesCreated, уходит в заголовке event-version
+MESSAGE_EVENT_VERSION = 2
 
 
 class EventBase(BaseModel):
@@ -40,18 +43,45 @@ class MessageIdPayload(BaseModel):
     id: str
 
 
+class MessagePayload(BaseModel):
+    """Новое сообщение в событии: поля документа без служебных полей Beanie.
+
+    metadata передается целиком - клиенты получают ее из data без изменений.
+    """
+
+    id: str
+    chat_id: int
+    user_id: int
+    content: str
+    created_at: datetime
+    metadata: MetaData
+
+    @classmethod
+    def from_message(cls, message: Message) -> "MessagePayload":
+        return cls(
+            id=str(message.id),
+            chat_id=message.chat_id,
+            user_id=message.user_id,
+            content=message.content,
+            created_at=message.created_at,
+            metadata=message.metadata,
+        )
+
+
 class CreatedMessageEvent(EventBase):
     event_type: str = "MessageCreated"
+    version: int = MESSAGE_EVENT_VERSION
     recievers: list[int]
-    data: Message
+    data: MessagePayload
     request_id: str
     sender_id: int
 
 
 class CreatedManyMessagesEvent(EventBase):
     event_type: str = "MessagesCreated"
+    version: int = MESSAGE_EVENT_VERSION
     recievers: list[int]
-    data: list[Message]
+    data: list[MessagePayload]
     request_id: str
     sender_id: int
 
@@ -23,8 +23,11 @@ class ChatService:
 
     async def upsert(self, data: ChatData):
         logger.info(f"Создаем (или обновляем чат) чат {data.id}")
-        print(data.model_dump())
-        new_chat = await self.repo.upsert_data(data.model_dump())
+        chat_data = data.model_dump()
+        chat_data["active_members"] = await self.user_service.get_active_ids(
+            data.members
+        )
+        new_chat = await self.repo.upsert_data(chat_data)
         logger.info(f"Чат создан (или обновлен): {data.id}")
 
     async def delete(self, data: IdSchema):
@@ -32,14 +35,30 @@ class ChatService:
         chat = await self.repo.delete(data.id)
         logger.info(f"Чат удален: {chat}")
 
-    async def get_active_members(self, chat_id: int):
+    async def get_active_members(self, chat_id: int) -> list[int]:
         logger.info(f"Получаем активных участников чата {chat_id}")
-
         chat = await self.get(chat_id)
+        return chat.active_members
+
+    async def get_member_chat_ids(self, user_id: int, chat_ids: list[int]) -> list[int]:
+        return await self.repo.get_member_chat_ids(user_id, chat_ids)
 
-        users = await self.user_service.get_multiple(chat.members)
-        active_recievers = [
-            member.user_id for member in users if member.is_active == True
-        ]
+    async def sync_member_status(self, user_id: int, is_active: bool):
+        chat_ids = await self.repo.set_member_active(user_id, is_active)
+        if chat_ids:
+            logger.info(
+                f"Статус пользователя {user_id} обновлен в {len(chat_ids)} чатах"
+            )
 
-        return active_recievers
+    async def backfill_active_members(self):
+        chats = await self.repo.get_without_active_members()
+        if not chats:
+            return
+        logger.info(f"Заполняем active_members для {len(chats)} чатов")
+        all_members = list({user_id for chat in chats for user_id in chat.members})
+        active = set(await self.user_service.get_active_ids(all_members))
+        for chat in chats:
+            await self.repo.set_active_members(
+                chat.chat_id, [user_id for user_id in chat.members if user_id in active]
+            )
+        logger.info(f"active_members заполнены для {len(chats)} чатов")
@@ -8,19 +8,24 @@ from bson import ObjectId
 from faststream.kafka import KafkaBroker
 from loguru import logger
 
+from src.core.config import settings
+from src.core.tasks import background_tasks
+from src.core.timing import StageTimer
 from src.dto import ManyMessagesDTO, MessageDTO
 from src.enums.grpc_enums import DirectionEnum
 from src.exceptions.chat import *
 from src.exceptions.message import *
 from src.exceptions.user import *
 from src.formatters.text_formatter import slim_text_formatter
-from src.models import Message, MetaData, ReplyData
+from src.models import Message, MetaData, ReadProgress, ReplyData
 from src.models.replications import UserReplica
 from src.repositories.message import MessageRepository
+from src.repositories.outbox import OutboxRepository
 from src.repositories.read_progress import ReadProgressRepository
 from src.routers.kafka.producer import KafkaPublisher
 from src.schemas.message import *
 from src.services.chat import ChatService
+from src.services.outbox import outbox_relay
 from src.services.policy import AccessPolicy
 from src.services.user import UserService
 
@@ -34,6 +39,7 @@ class MessageService:
         chat_service: ChatService,
         kafka_producer: KafkaPublisher,
         access_policy: AccessPolicy,
+        outbox_repo: OutboxRepository,
     ):
         self.repo = repo
         self.progress_repo = read_pregress_repo
@@ -41,6 +47,7 @@ class MessageService:
         self.chat_service = chat_service
         self.kafka_producer = kafka_producer
         self.access_policy = access_policy
+        self.outbox_repo = outbox_repo
 
     async def _get_model(self, message_id: str) -> Message:
         message = await self.repo.get(message_id)
@@ -72,6 +79,76 @@ class MessageService:
 
         return message_data
 
+    async def _init_unread_counts(
+        self, user_id: int, progresses: dict[int, ReadProgress | None]
+    ) -> dict[int, int]:
+        """Считает еще не заведенные счетчики и сохраняет их.
+
+        Чаты считаются пачками по `UNREAD_COUNT_CHUNK_SIZE` одной агрегацией
+        на пачку, пачки идут последовательно. Дальше счетчики
+        поддерживаются инкрементально.
+        """
+        cursors = {
+            chat_id: progress.last_read_message_id if progress else None
+            for chat_id, progress in progresses.items()
+        }
+        chat_ids = list(cursors)
+        counts = {}
+        for start in range(0, len(chat_ids), settings.UNREAD_COUNT_CHUNK_SIZE):
+            chunk = chat_ids[start : start + settings.UNREAD_COUNT_CHUNK_SIZE]
+            chunk_counts = await self.repo.get_unread_counts(
+                user_id, {chat_id: cursors[chat_id] for chat_id in chunk}
+            )
+            await self.progress_repo.init_unread_many(
+                user_id,
+                {
+                    chat_id: (cursors[chat_id], count)
+                    for chat_id, count in chunk_counts.items()
+                },
+            )
+            counts.update(chunk_counts)
+        return counts
+
+    async def _get_unread_count(
+        self, chat_id: int, user_id: int, progress: ReadProgress | None
+    ) -> int:
+        if progress and progress.unread_count is not None:
+            return progress.unread_count
+        counts = await self._init_unread_counts(user_id, {chat_id: progress})
+        return counts[chat_id]
+
+    async def get_unread_counts(
+        self, user_id: int, chat_ids: list[int]
+    ) -> dict[int, int]:
+        logger.info(f"Получаем счетчики непрочитанных для {len(chat_ids)} чатов")
+        # Чужие и несуществующие чаты получают 0, записи read_progress для них
+        # не заводятся
+        member_chat_ids = await self.chat_service.get_member_chat_ids(user_id, chat_ids)
+        foreign = set(chat_ids) - set(member_chat_ids)
+        if foreign:
+            logger.warning(
+                f"Пользователь {user_id} запросил счетчики чужих чатов: {len(foreign)}"
+            )
+        chat_ids = member_chat_ids
+        progresses = {
+            progress.chat_id: progress
+            for progress in await self.progress_repo.get_many(user_id, chat_ids)
+        }
+        counts = {
+            chat_id: progress.unread_count
+            for chat_id, progress in progresses.items()
+            if progress.unread_count is not None
+        }
+        missing = [chat_id for chat_id in chat_ids if chat_id not in counts]
+        if missing:
+            counts.update(
+                await self._init_unread_counts(
+                    user_id, {chat_id: progresses.get(chat_id) for chat_id in missing}
+                )
+            )
+        counts.update(dict.fromkeys(foreign, 0))
+        return counts
+
     async def get_context(
         self,
         chat_id: int,
@@ -87,32 +164,33 @@ class MessageService:
         logger.info(
             f"Получаем сообщения из чата {chat_id=} ({direction=}, {cursor_id=})"
         )
-        last_read_message = await self.progress_repo.get_last_read_message_by_user(
-            chat_id=chat_id, user_id=user_id
-        )
-        unread_count_coro = self.repo.get_unread_count(
-            chat_id=chat_id, user_id=user_id, cursor_id=last_read_message
+        progress = await self.progress_repo.get(chat_id=chat_id, user_id=user_id)
+        last_read_message = self.progress_repo.get_cursor(progress)
+        unread_count_coro = self._get_unread_count(
+            chat_id=chat_id, user_id=user_id, progress=progress
         )
         limit -= 1
 
+        # Переданный клиентом курсор проверяется в самом запросе контекста
+        require_cursor = bool(cursor_id)
         if not cursor_id:
             cursor_id = last_read_message
-        else:
-            cursor_message = await self.repo.get(message_id=cursor_id)
-            if not cursor_message or cursor_message.chat_id != chat_id:
-                raise MessageNotFoundError(message_id=cursor_id)
 
         if direction == DirectionEnum.BEFORE:
             messages_coro = self.repo.get_context(
                 chat_id=chat_id,
                 cursor_id=cursor_id if cursor_id else None,
                 limit_before=limit,
+                require_cursor=require_cursor,
             )
         elif direction == DirectionEnum.AFTER:
             if not cursor_id:
                 raise MessageNotFoundError(message_id=cursor_id)
             messages_coro = self.repo.get_context(
-                chat_id=chat_id, cursor_id=cursor_id, limit_after=limit
+                chat_id=chat_id,
+                cursor_id=cursor_id,
+                limit_after=limit,
+                require_cursor=require_cursor,
             )
         else:
             limit_after = limit // 2
@@ -124,6 +202,7 @@ class MessageService:
                 cursor_id=cursor_id,
                 limit_before=limit_before,
                 limit_after=limit_after,
+                require_cursor=require_cursor,
             )
 
         messages, unread_count = await asyncio.gather(messages_coro, unread_count_coro)
@@ -154,41 +233,71 @@ class MessageService:
         request_id: str,
         reply_to: Optional[str] = None,
     ) -> MessageDTO:
-        chat = await self.chat_service.get(chat_id)
-        user = await self.user_service.get(user_id)
-        self.access_policy.can_see_chat(user_id, chat)
-
-        reply_to_message = None
+        timer = StageTimer()
+        reads = [self.chat_service.get(chat_id), self.user_service.get(user_id)]
         if reply_to:
-            reply_to_message = await self._get_model(reply_to)
-            if not reply_to_message.chat_id == chat_id:
-                raise AccessDeniedError()
+            reads.append(self._get_model(reply_to))
+        chat, _, *reply = await timer.measure("чтение", asyncio.gather(*reads))
+        reply_to_message = reply[0] if reply else None
+        self.access_policy.can_see_chat(user_id, chat)
+        if reply_to_message and not reply_to_message.chat_id == chat_id:
+            raise AccessDeniedError()
 
-        message = await self.repo.insert(
-            user_id=user_id, chat_id=chat_id, content=content, reply_to=reply_to_message
+        message = await timer.measure(
+            "запись",
+            self.repo.insert(
+                user_id=user_id,
+                chat_id=chat_id,
+                content=content,
+                reply_to=reply_to_message,
+                outbox=lambda message: self.kafka_producer.create_message(
+                    recievers=chat.active_members,
+                    data=message,
+                    request_id=request_id,
+                    sender_id=user_id,
+                ),
+            ),
         )
+        outbox_relay.notify()
         logger.info(f"Добавлено сообщение {message.id=} в {chat_id=}")
+        timer.mark("до ответа")
 
-        await self.progress_repo.set_last_read_message(
-            chat_id=chat_id, user_id=user_id, message_id=str(message.id)
-        )
-        logger.info(
-            f"Счетчик последнего прочитанного сообщения обновлен ({user_id=}, {chat_id=}, {message.id=})"
+        # Сообщение и событие уже сохранены: курсоры догоняют ответ клиенту
+        background_tasks.spawn(
+            self._after_insert(message, timer), name=f"after_insert_{message.id}"
         )
+        return MessageDTO(message=message)
 
-        users = await self.user_service.get_multiple(chat.members)
-        active_recievers = [
-            member.user_id for member in users if member.is_active == True
-        ]
-
-        await self.kafka_producer.create_message(
-            recievers=active_recievers,
-            data=message,
-            request_id=request_id,
-            sender_id=user_id,
+    async def _after_insert(self, message: Message, timer: StageTimer) -> None:
+        """Курсор отправителя и счетчики непрочитанных после ответа клиенту.
+
+        При штатной остановке задачи дожидаются в background_tasks.drain(),
+        но при падении процесса обновления теряются. Курсор догонит
+        следующее прочтение, а потерянный $inc счетчиков исправит
+        UnreadCounterReconciler: полный круг сверки занимает
+        ceil(записей read_progress / UNREAD_RECONCILE_BATCH_SIZE) *
+        UNREAD_RECONCILE_INTERVAL секунд, до тех пор счетчик занижен.
+        """
+        chat_id, user_id = message.chat_id, message.user_id
+        await asyncio.gather(
+            timer.measure(
+                "курсор",
+                self.progress_repo.set_last_read_message(
+                    chat_id=chat_id,
+                    user_id=user_id,
+                    message_id=str(message.id),
+                    reset_unread=True,
+                    verify=False,
+                ),
+            ),
+            timer.measure(
+                "счетчики",
+                self.progress_repo.increment_unread(
+                    chat_id=chat_id, sender_id=user_id, count=1
+                ),
+            ),
         )
-
-        return MessageDTO(message=message)
+        logger.info(f"Отправка сообщения {message.id}: {timer.summary()}")
 
     async def update(
         self, message_id: str, new_content: str, request_id: str, sender_id: int
@@ -198,36 +307,39 @@ class MessageService:
         message_data = await self._get_model(message_id)
         message = message_data
         self.access_policy.can_modify(user_id=sender_id, message=message)
-        message = await self.repo.update(message, new_content)
-        logger.info(f"Обновлено сообщение: {message_id}")
-
         active_recievers = await self.chat_service.get_active_members(
             chat_id=message.chat_id
         )
-        event_data = UpdateMessagePayload(id=str(message.id), content=message.content)
-        await self.kafka_producer.update_message(
+        event = self.kafka_producer.update_message(
+            chat_id=message.chat_id,
             recievers=active_recievers,
-            data=event_data,
+            data=UpdateMessagePayload(id=str(message.id), content=new_content),
             request_id=request_id,
             sender_id=sender_id,
         )
-        logger.info(f"Уведомление об обновлении сообщения {message.id} отправлено")
+        message = await self.repo.update(message, new_content, outbox=event)
+        outbox_relay.notify()
+        logger.info(f"Обновлено сообщение: {message_id}")
         return MessageDTO(message=message)
 
     async def delete(self, message_id: str, request_id: str, sender_id: int) -> None:
         logger.info(f"Удаляем сообщение {message_id}")
         message = await self._get_model(message_id)
         self.access_policy.can_modify(sender_id, message)
-        await self.repo.delete(message)
-        logger.info(f"Удалено сообщение {message_id}")
-
         recievers = await self.chat_service.get_active_members(message.chat_id)
-        await self.kafka_producer.delete_message(
+        event = self.kafka_producer.delete_message(
+            chat_id=message.chat_id,
             recievers=recievers,
             data=MessageIdPayload(id=str(message_id)),
             request_id=request_id,
             sender_id=sender_id,
         )
+        await self.repo.delete(message, outbox=event)
+        outbox_relay.notify()
+        logger.info(f"Удалено сообщение {message_id}")
+        await self.progress_repo.decrement_unread_for_deleted(
+            chat_id=message.chat_id, author_id=message.user_id, message_id=message_id
+        )
 
     async def delete_chat_messages(self, chat_id: int) -> None:
         logger.info(f"Удаляем сообщения чата {chat_id}")
@@ -245,42 +357,56 @@ class MessageService:
         )
         await self.progress_repo.set_last_read_message(chat_id, user_id, message_id)
         logger.info(f"Последнее прочитанное сообщение пользователя {user_id} обновлено")
-        read_messages_list = await self.repo.get_in_range(
-            chat_id,
-            previous_read_message if previous_read_message else None,
-            message_id,
+        authors = await self.repo.get_last_by_authors(
+            chat_id=chat_id,
+            after_id=previous_read_message,
+            until_id=message_id,
+            exclude_user_id=user_id,
         )
-        read_messages_list = read_messages_list[1:]
-        authors = {}
-        for message in read_messages_list:
-            author_id = message.user_id
-            if author_id != user_id:
-                authors[author_id] = message
+        read_count = sum(count for _, _, count in authors)
+        if read_count:
+            await self.progress_repo.decrement_unread(chat_id, user_id, read_count)
         if authors:
-            last_read_chat_message = (
-                await self.progress_repo.get_last_read_chat_message(
-                    chat_id=chat_id, user_id=user_id
+            # Событие нужно только для сообщений, которые до этого никто не читал:
+            # порог считается для каждого автора без него самого и читателя
+            thresholds = await asyncio.gather(
+                *(
+                    self.progress_repo.get_last_read_chat_message(
+                        chat_id=chat_id, user_id=user_id, author_id=author
+                    )
+                    for author, _, _ in authors
                 )
             )
             event_data = []
-            for author, message in authors.items():
-                if message.id > ObjectId(last_read_chat_message):
+            for (author, last_id, _), threshold in zip(authors, thresholds):
+                if threshold is None or last_id > ObjectId(threshold):
                     event_data.append(
-                        SlimMessageData(id=str(message.id), sender_id=author)
+                        SlimMessageData(id=str(last_id), sender_id=author)
                     )
-            await self.kafka_producer.read_message(data=event_data)
+            if event_data:
+                # Курсор уже сохранен: при падении до записи в outbox событие
+                # прочтения теряется, но порядок с событиями чата сохраняется
+                await self.outbox_repo.add(
+                    [self.kafka_producer.read_message(chat_id=chat_id, data=event_data)]
+                )
+                outbox_relay.notify()
 
     async def add_reaction(self, message_id: str, reaction: str, author: int) -> None:
         await self.user_service.get(author)
         message = await self._get_model(message_id)
         logger.info(f"Добавляем реакцию в сообщение: {message_id}")
-        result = await self.repo.add_reaction(message_id, reaction, author)
+        recievers = await self.chat_service.get_active_members(message.chat_id)
+        event = self.kafka_producer.add_reaction(
+            chat_id=message.chat_id,
+            data=Reaction(message_id=message_id, reaction=reaction),
+            sender_id=author,
+            recievers=recievers,
+        )
+        result = await self.repo.add_reaction(
+            message_id, reaction, author, outbox=event
+        )
         if result > 0:
-            recievers = await self.chat_service.get_active_members(message.chat_id)
-            event_data = Reaction(message_id=message_id, reaction=reaction)
-            await self.kafka_producer.add_reaction(
-                data=event_data, sender_id=author, recievers=recievers
-            )
+            outbox_relay.notify()
         else:
             raise ReacionAlreadyExists()
 
@@ -290,13 +416,18 @@ class MessageService:
         await self.user_service.get(author)
         message = await self._get_model(message_id)
         logger.info(f"Удаляем реакцию реакцию из сообщения: {message_id}")
-        result = await self.repo.remove_reaction(message_id, reaction, author)
+        recievers = await self.chat_service.get_active_members(message.chat_id)
+        event = self.kafka_producer.remove_reaction(
+            chat_id=message.chat_id,
+            data=Reaction(message_id=message_id, reaction=reaction),
+            sender_id=author,
+            recievers=recievers,
+        )
+        result = await self.repo.remove_reaction(
+            message_id, reaction, author, outbox=event
+        )
         if result > 0:
-            recievers = await self.chat_service.get_active_members(message.chat_id)
-            event_data = Reaction(message_id=message_id, reaction=reaction)
-            await self.kafka_producer.remove_reaction(
-                data=event_data, sender_id=author, recievers=recievers
-            )
+            outbox_relay.notify()
         else:
             raise ReacionAlreadyExists()
 
@@ -343,27 +474,32 @@ class MessageService:
             )
 
         new_messages = await self.repo.forward_messages(
-            user_id, chat_id, messages_data, content
+            user_id,
+            chat_id,
+            messages_data,
+            content,
+            outbox=lambda messages: self.kafka_producer.create_many_messages(
+                recievers=chat.active_members,
+                data=messages,
+                request_id=request_id,
+                sender_id=user_id,
+            ),
         )
+        outbox_relay.notify()
         logger.info(f"Добавлено сообщений {len(new_messages)}")
 
         await self.progress_repo.set_last_read_message(
-            chat_id=chat_id, user_id=user_id, message_id=str(new_messages[-1].id)
+            chat_id=chat_id,
+            user_id=user_id,
+            message_id=str(new_messages[-1].id),
+            reset_unread=True,
+            verify=False,
+        )
+        await self.progress_repo.increment_unread(
+            chat_id=chat_id, sender_id=user_id, count=len(new_messages)
         )
         logger.info(
             f"Счетчик последнего прочитанного сообщения обновлен ({user_id=}, {chat_id=}, {new_messages[-1].id})"
         )
 
-        users = await self.user_service.get_multiple(chat.members)
-        active_recievers = [
-            member.user_id for member in users if member.is_active == True
-        ]
-
-        await self.kafka_producer.create_many_messages(
-            recievers=active_recievers,
-            data=new_messages,
-            request_id=request_id,
-            sender_id=user_id,
-        )
-
         return ManyMessagesDTO(messages=new_messages)
@@ -0,0 +1,109 @@
+import asyncio
+
+from faststream.kafka import KafkaBroker
+from loguru import logger
+
+from src.core.config import settings
+from src.models import OutboxEvent
+from src.repositories.outbox import OutboxRepository
+from src.routers.kafka import broker
+
+
+class OutboxRelay:
+    """Переносит события из outbox в Kafka (at-least-once).
+
+    Забирает недоставленные записи пачками до `batch_size`, публикует их
+    параллельно - продюсер сам склеивает их в батчи по партициям - и
+    помечает доставленными только подтвержденные брокером. Новые записи
+    этого экземпляра будят ретранслятор сразу (с задержкой `linger`, чтобы
+    собрать пачку), записи остальных подбираются раз в `poll_interval`.
+    """
+
+    def __init__(
+        self,
+        repo: OutboxRepository,
+        broker: KafkaBroker,
+        batch_size: int = settings.OUTBOX_BATCH_SIZE,
+        linger: float = settings.OUTBOX_LINGER,
+        poll_interval: float = settings.OUTBOX_POLL_INTERVAL,
+        lease: float = settings.OUTBOX_LEASE,
+    ):
+        self.repo = repo
+        self.broker = broker
+        self.batch_size = batch_size
+        self.linger = linger
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.wakeup = asyncio.Event()
+        self.relay_task: asyncio.Task | None = None
+
+    def notify(self) -> None:
+        self.wakeup.set()
+
+    async def start(self):
+        self.relay_task = asyncio.create_task(self._run())
+        logger.info("Ретранслятор outbox запущен")
+
+    async def stop(self):
+        if self.relay_task:
+            self.relay_task.cancel()
+            try:
+                await self.relay_task
+            except asyncio.CancelledError:
+                pass
+        # Последняя попытка отправить то, что успело накопиться
+        try:
+            await self.relay_batch()
+        except Exception as e:
+            logger.error(f"Ошибка ретранслятора outbox: {e}")
+
+    async def _publish(self, event: OutboxEvent) -> None:
+        await self.broker.publish(
+            event.body,
+            event.topic,
+            key=event.key,
+            headers={"content-type": event.content_type, **event.headers},
+        )
+
+    async def relay_batch(self) -> tuple[int, int]:
+        """Возвращает число доставленных и неотправленных событий."""
+        events = await self.repo.claim_pending(self.batch_size, self.lease)
+        if not events:
+            return 0, 0
+        results = await asyncio.gather(
+            *(self._publish(event) for event in events), return_exceptions=True
+        )
+        delivered, failed = [], []
+        for event, result in zip(events, results):
+            (failed if isinstance(result, Exception) else delivered).append(event.id)
+        await self.repo.mark_delivered(delivered)
+        if failed:
+            logger.warning(
+                f"Не удалось опубликовать события outbox: {len(failed)}, "
+                f"первая ошибка: {next(r for r in results if isinstance(r, Exception))}"
+            )
+            await self.repo.release(failed)
+        return len(delivered), len(failed)
+
+    async def _run(self):
+        while True:
+            try:
+                delivered, failed = await self.relay_batch()
+            except Exception as e:
+                logger.error(f"Ошибка ретранслятора outbox: {e}")
+                delivered, failed = 0, 1
+            if delivered == self.batch_size and not failed:
+                continue
+
+            if not failed:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(self.poll_interval)
+            self.wakeup.clear()
+            await asyncio.sleep(self.linger)
+
+
+outbox_relay = OutboxRelay(repo=OutboxRepository(), broker=broker)
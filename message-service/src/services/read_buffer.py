@@ -0,0 +1,82 @@
+import asyncio
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from loguru import logger
+
+from src.core.config import settings
+from src.services.message import MessageService
+
+
+class ReadCoalescer:
+    """Склеивает поток mark_as_read по паре (chat_id, user_id).
+
+    В окне `flush_interval` секунд для пары остается только самый дальний
+    курсор, затем окно сбрасывается: каждая пара дает одну запись курсора и
+    одно событие о прочтении. Одновременно обрабатывается не больше
+    `concurrency` пар.
+    """
+
+    def __init__(
+        self,
+        message_service: MessageService,
+        flush_interval: float = settings.READ_FLUSH_INTERVAL,
+        concurrency: int = settings.READ_FLUSH_CONCURRENCY,
+    ):
+        self.message_service = message_service
+        self.flush_interval = flush_interval
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.pending: dict[tuple[int, int], ObjectId] = {}
+        self.flusher_task: asyncio.Task | None = None
+
+    def add(self, chat_id: int, user_id: int, message_id: str) -> None:
+        try:
+            cursor = ObjectId(message_id)
+        except InvalidId:
+            logger.warning(f"Некорректный id прочитанного сообщения: {message_id}")
+            return
+        key = (chat_id, user_id)
+        current = self.pending.get(key)
+        if current is None or cursor > current:
+            self.pending[key] = cursor
+
+    async def start(self):
+        self.flusher_task = asyncio.create_task(self._run())
+        logger.info("Буфер прочтений запущен")
+
+    async def stop(self):
+        if self.flusher_task:
+            self.flusher_task.cancel()
+            try:
+                await self.flusher_task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+    async def flush(self):
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, {}
+        await asyncio.gather(
+            *(
+                self._mark(chat_id, user_id, str(cursor))
+                for (chat_id, user_id), cursor in batch.items()
+            )
+        )
+        logger.info(f"Применено прочтений: {len(batch)}")
+
+    async def _mark(self, chat_id: int, user_id: int, message_id: str):
+        async with self.semaphore:
+            try:
+                await self.message_service.mark_as_read(
+                    chat_id=chat_id, user_id=user_id, message_id=message_id
+                )
+            except Exception as e:
+                logger.error(
+                    f"Не удалось отметить прочтение ({chat_id=}, {user_id=}): {e}"
+                )
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
@@ -0,0 +1,78 @@
+import asyncio
+import uuid
+
+from bson import ObjectId
+from loguru import logger
+
+from src.core.config import settings
+from src.repositories.lease import LeaseRepository
+from src.repositories.message import MessageRepository
+from src.repositories.read_progress import ReadProgressRepository
+
+
+class UnreadCounterReconciler:
+    """Фоновая сверка счетчиков непрочитанных с реальным числом сообщений.
+
+    Раз в `interval` секунд пересчитывает очередные `batch_size` записей
+    ReadProgress (по кругу в порядке _id) и исправляет разошедшиеся счетчики.
+    Сверку ведет один экземпляр - владелец аренды `LEASE_NAME`; аренда
+    продлевается каждый проход и переходит к другому экземпляру через
+    `lease` секунд после остановки владельца.
+    """
+
+    LEASE_NAME = "unread_reconciler"
+
+    def __init__(
+        self,
+        repo: MessageRepository,
+        progress_repo: ReadProgressRepository,
+        lease_repo: LeaseRepository,
+        batch_size: int = settings.UNREAD_RECONCILE_BATCH_SIZE,
+        interval: float = settings.UNREAD_RECONCILE_INTERVAL,
+        lease: float = settings.UNREAD_RECONCILE_LEASE,
+    ):
+        self.repo = repo
+        self.progress_repo = progress_repo
+        self.lease_repo = lease_repo
+        self.batch_size = batch_size
+        self.interval = interval
+        self.lease = lease
+        self.owner = uuid.uuid4().hex
+        self.last_id: ObjectId | None = None
+
+    async def run(self):
+        logger.info("Сверка счетчиков непрочитанных запущена")
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                if await self.lease_repo.acquire(
+                    self.LEASE_NAME, self.owner, self.lease
+                ):
+                    await self.reconcile_batch()
+                else:
+                    self.last_id = None
+            except Exception as e:
+                logger.error(f"Ошибка сверки счетчиков непрочитанных: {e}")
+
+    async def reconcile_batch(self) -> int:
+        batch = await self.progress_repo.get_batch(self.last_id, self.batch_size)
+        self.last_id = batch[-1].id if len(batch) == self.batch_size else None
+
+        fixed = 0
+        for progress in batch:
+            actual = await self.repo.get_unread_count(
+                chat_id=progress.chat_id,
+                user_id=progress.user_id,
+                cursor_id=self.progress_repo.get_cursor(progress),
+            )
+            if actual != progress.unread_count and await self.progress_repo.set_unread(
+                progress.chat_id,
+                progress.user_id,
+                actual,
+                expected=progress.unread_count,
+                cursor=progress.last_read_message_id,
+            ):
+                fixed += 1
+        if fixed:
+            logger.info(f"Исправлено счетчиков непрочитанных: {fixed}/{len(batch)}")
+        return fixed
@@ -26,6 +26,11 @@ class UserService:
         logger.info(f"Получены пользователи {str_list}")
         return users
 
+    async def get_active_ids(self, ids: list[int]) -> list[int]:
+        # Без реплики пользователь не активен; UserCreated добавит его позже
+        active = await self.repo.get_active_ids(ids)
+        return [user_id for user_id in ids if user_id in active]
+
     async def create(self, data: UserData):
         logger.info(f"Создаем пользователя {data.id}")
 
@@ -0,0 +1,65 @@
+import os
+from types import SimpleNamespace
+
+import mongomock
+import pytest
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient
+from pymongo import DeleteMany, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+# Настройки читаются при импорте модулей сервиса, сама MongoDB в тестах не нужна
+for name, value in {
+    "MONGO_USER": "test",
+    "MONGO_PASS": "test",
+    "MONGO_HOST": "localhost",
+    "MONGO_PORT": "27017",
+}.items():
+    os.environ.setdefault(name, value)
+
+from src.core.cache import chat_cache, user_cache
+from src.models import Message, OutboxEvent, ReadProgress
+from src.models.replications import ChatReplica, UserReplica
+from src.repositories.outbox import OutboxRepository
+
+
+def _bulk_write(self, requests, ordered=True, **kwargs):
+    """bulk_write mongomock несовместим с текущим pymongo: выполняем по одному."""
+    modified = deleted = 0
+    errors = []
+    for index, request in enumerate(requests):
+        try:
+            if isinstance(request, UpdateOne):
+                result = self.update_one(
+                    request._filter, request._doc, upsert=request._upsert
+                )
+                modified += result.modified_count
+            elif isinstance(request, DeleteMany):
+                deleted += self.delete_many(request._filter).deleted_count
+            else:
+                raise NotImplementedError(type(request))
+        except DuplicateKeyError as e:
+            errors.append({"index": index, "code": 11000, "errmsg": str(e)})
+            if ordered:
+                break
+    if errors:
+        raise BulkWriteError({"writeErrors": errors})
+    return SimpleNamespace(modified_count=modified, deleted_count=deleted)
+
+
+@pytest.fixture
+async def db(monkeypatch):
+    """Beanie поверх mongomock: каждая проверка получает пустую базу."""
+    monkeypatch.setattr(mongomock.collection.Collection, "bulk_write", _bulk_write)
+    # mongomock не знает команду hello: outbox пишется без транзакции
+    monkeypatch.setattr(OutboxRepository, "supports_transactions", False)
+    # Кэши реплик общие для процесса: база новая, значит и кэш пустой
+    for cache in (user_cache, chat_cache):
+        cache.cache.clear()
+        cache.held.clear()
+    database = AsyncMongoMockClient()["messages"]
+    await init_beanie(
+        database=database,
+        document_models=[Message, UserReplica, ChatReplica, ReadProgress, OutboxEvent],
+    )
+    return database
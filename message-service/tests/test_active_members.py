@@ -0,0 +1,26 @@
+from src.core.deps import get_chat_service
+from src.models.replications import ChatReplica, UserReplica
+from src.schemas.chat import ChatData
+
+
+async def test_members_without_replica_are_not_active(db):
+    service = get_chat_service()
+    await UserReplica(user_id=1, username="active", is_active=True).insert()
+    await UserReplica(user_id=2, username="inactive", is_active=False).insert()
+
+    await service.upsert(ChatData(id=1, members=[1, 2, 3]))
+
+    chat = await ChatReplica.find_one(ChatReplica.chat_id == 1)
+    assert chat.active_members == [1]
+
+
+async def test_late_user_created_joins_active_members(db):
+    service = get_chat_service()
+    await service.upsert(ChatData(id=1, members=[3]))
+
+    # Так подписчик обрабатывает UserCreated, пришедший после события чата
+    await UserReplica(user_id=3, username="late", is_active=True).insert()
+    await service.sync_member_status(3, True)
+
+    chat = await ChatReplica.find_one(ChatReplica.chat_id == 1)
+    assert chat.active_members == [3]
@@ -0,0 +1,50 @@
+import time
+
+from src.core.cache import ReplicaCache
+from src.models.replications import ChatReplica
+
+
+def make_cache(ttl: float = 60, hold: float = 5) -> ReplicaCache:
+    return ReplicaCache("test", maxsize=10, ttl=ttl, hold=hold)
+
+
+def test_get_set_and_stats():
+    cache = make_cache()
+    assert cache.get(1) is None
+    cache.set(1, "user")
+    assert cache.get(1) == "user"
+    found, missing = cache.get_many([1, 2])
+    assert found == {1: "user"} and missing == [2]
+    assert cache.stats.hits == 2 and cache.stats.misses == 2
+
+
+def test_evict_holds_key_until_local_write():
+    cache = make_cache()
+    cache.set(1, "old")
+    cache.evict(1)
+    assert cache.get(1) is None
+    # Чтение до записи реплики другим экземпляром не попадает в кэш
+    cache.set(1, "old")
+    assert cache.get(1) is None
+    # Запись реплики этим экземпляром снимает ограничение
+    cache.invalidate(1)
+    cache.set(1, "new")
+    assert cache.get(1) == "new"
+
+
+def test_hold_expires():
+    cache = make_cache(hold=0.01)
+    cache.evict(1)
+    time.sleep(0.02)
+    cache.set(1, "new")
+    assert cache.get(1) == "new"
+
+
+def test_evict_where_drops_chats_of_user(db):
+    cache = make_cache()
+    cache.set(1, ChatReplica(chat_id=1, members=[10, 11], active_members=[10, 11]))
+    cache.set(2, ChatReplica(chat_id=2, members=[11], active_members=[11]))
+    cache.evict_where(lambda chat: 10 in chat.members)
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
+    assert cache.stats.invalidations == 1
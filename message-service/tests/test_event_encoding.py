@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+
+from protos import message_pb2
+from src.mappers.grpc_mapper import mapper
+from src.models import MetaData, ReplyData
+from src.schemas.message import (
+    CreatedManyMessagesEvent,
+    CreatedMessageEvent,
+    MessagePayload,
+)
+
+CREATED_AT = datetime(2025, 1, 1, 12, 30, tzinfo=timezone.utc)
+
+
+def payload(message_id: str, reply: bool = False) -> MessagePayload:
+    return MessagePayload(
+        id=message_id,
+        chat_id=1,
+        user_id=2,
+        content="hi",
+        created_at=CREATED_AT,
+        metadata=MetaData(
+            is_edited=True,
+            reactions={"+1": [3, 4]},
+            reply_to=(
+                ReplyData(message_id="m0", user_id=3, preview="q") if reply else None
+            ),
+        ),
+    )
+
+
+def parse(event) -> message_pb2.MessageCreatedEvent:
+    parsed = message_pb2.MessageCreatedEvent()
+    parsed.ParseFromString(mapper.message_created_event(event).SerializeToString())
+    return parsed
+
+
+def test_message_created_encoding():
+    parsed = parse(
+        CreatedMessageEvent(
+            recievers=[2, 3],
+            data=payload("m1", reply=True),
+            request_id="r1",
+            sender_id=2,
+        )
+    )
+
+    assert parsed.event_type == "MessageCreated"
+    assert parsed.version == CreatedMessageEvent.model_fields["version"].default
+    assert list(parsed.recievers) == [2, 3]
+    assert (parsed.request_id, parsed.sender_id) == ("r1", 2)
+    (message,) = parsed.data
+    assert (message.id, message.chat_id, message.user_id, message.content) == (
+        "m1",
+        1,
+        2,
+        "hi",
+    )
+    assert message.created_at.ToDatetime(tzinfo=timezone.utc) == CREATED_AT
+    assert message.metadata.is_edited and not message.metadata.is_pinned
+    assert list(message.metadata.reactions["+1"].users_id) == [3, 4]
+    assert message.metadata.reply_to.message_id == "m0"
+    assert not message.metadata.HasField("forward_from")
+
+
+def test_messages_created_keeps_order():
+    parsed = parse(
+        CreatedManyMessagesEvent(
+            recievers=[2, 3],
+            data=[payload("m1"), payload("m2", reply=True)],
+            request_id="r1",
+            sender_id=2,
+        )
+    )
+
+    assert parsed.event_type == "MessagesCreated"
+    assert [message.id for message in parsed.data] == ["m1", "m2"]
+    assert not parsed.data[0].metadata.HasField("reply_to")
+    assert parsed.data[1].metadata.HasField("reply_to")
@@ -0,0 +1,61 @@
+from loguru import logger
+
+from src.core.indexes import check_indexes
+from src.models import Message
+
+
+class FakeCursor:
+    def sort(self, *args):
+        return self
+
+    def limit(self, *args):
+        return self
+
+    async def explain(self):
+        return {"queryPlanner": {"winningPlan": {"stage": "IXSCAN"}}}
+
+
+class FakeCollection:
+    def __init__(self, info: dict):
+        self.info = info
+
+    async def index_information(self):
+        return self.info
+
+    def find(self, *args):
+        return FakeCursor()
+
+
+async def run_check(monkeypatch, info: dict) -> list[str]:
+    monkeypatch.setattr(
+        Message, "get_pymongo_collection", classmethod(lambda cls: FakeCollection(info))
+    )
+    monkeypatch.setattr(
+        Message, "get_collection_name", classmethod(lambda cls: "messages")
+    )
+    warnings = []
+    handler = logger.add(warnings.append, level="WARNING", format="{message}")
+    try:
+        await check_indexes()
+    finally:
+        logger.remove(handler)
+    return warnings
+
+
+async def test_non_numeric_index_keys_do_not_crash(monkeypatch):
+    warnings = await run_check(
+        monkeypatch,
+        {
+            "_id_": {"key": [("_id", 1)]},
+            "content_text": {"key": [("_fts", "text"), ("_ftsx", 1)]},
+            "user_hashed": {"key": [("user_id", "hashed")]},
+            "chat_id_1__id_-1": {"key": [("chat_id", 1.0), ("_id", -1.0)]},
+        },
+    )
+    assert warnings == []
+
+
+async def test_missing_index_is_reported(monkeypatch):
+    warnings = await run_check(monkeypatch, {"_id_": {"key": [("_id", 1)]}})
+    assert len(warnings) == 1
+    assert "chat_id" in warnings[0]
@@ -0,0 +1,55 @@
+import pytest
+
+from src.core.deps import get_message_service
+from src.core.tasks import background_tasks
+from src.exceptions import AccessDeniedError
+from src.models import Message, OutboxEvent
+from src.models.replications import ChatReplica, UserReplica
+
+
+@pytest.fixture
+async def chat(db):
+    for user_id in (10, 20):
+        await UserReplica(
+            user_id=user_id, username=f"user{user_id}", is_active=True
+        ).insert()
+    await ChatReplica(chat_id=1, members=[10, 20], active_members=[10, 20]).insert()
+    await ChatReplica(chat_id=2, members=[10], active_members=[10]).insert()
+
+
+async def test_insert_writes_message_and_outbox_event(chat):
+    service = get_message_service()
+    dto = await service.insert(user_id=10, chat_id=1, content="hi", request_id="r1")
+    await background_tasks.drain()
+
+    assert (await Message.get(dto.message.id)).content == "hi"
+    events = await OutboxEvent.find_all().to_list()
+    assert len(events) == 1 and bytes(events[0].key) == b"1"
+
+
+async def test_insert_reply_in_same_chat(chat):
+    service = get_message_service()
+    original = await service.insert(user_id=20, chat_id=1, content="q", request_id="r1")
+    reply = await service.insert(
+        user_id=10,
+        chat_id=1,
+        content="a",
+        request_id="r2",
+        reply_to=str(original.message.id),
+    )
+    await background_tasks.drain()
+    assert reply.message.metadata.reply_to.message_id == str(original.message.id)
+
+
+async def test_insert_reply_from_other_chat_is_denied(chat):
+    service = get_message_service()
+    other = await service.insert(user_id=10, chat_id=2, content="x", request_id="r1")
+    with pytest.raises(AccessDeniedError):
+        await service.insert(
+            user_id=10,
+            chat_id=1,
+            content="a",
+            request_id="r2",
+            reply_to=str(other.message.id),
+        )
+    await background_tasks.drain()
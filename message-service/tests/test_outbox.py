@@ -0,0 +1,76 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.core.deps import get_message_service
+from src.core.tasks import background_tasks
+from src.models import OutboxEvent
+from src.models.replications import ChatReplica, UserReplica
+from src.repositories.outbox import OutboxRepository
+
+
+def _event(key: bytes = b"1") -> OutboxEvent:
+    return OutboxEvent(
+        topic="message.events",
+        key=key,
+        body=b"{}",
+        content_type="application/json",
+    )
+
+
+async def test_claim_skips_leased_events_until_lease_expires(db):
+    repo = OutboxRepository()
+    await repo.add([_event(), _event()])
+
+    first = await repo.claim_pending(limit=10, lease=30)
+    assert len(first) == 2
+    assert await repo.claim_pending(limit=10, lease=30) == []
+
+    # Аренда упавшего ретранслятора истекла: события забирает следующий
+    await OutboxEvent.get_pymongo_collection().update_many(
+        {},
+        {"$set": {"locked_until": datetime.now(timezone.utc) - timedelta(seconds=1)}},
+    )
+    second = await repo.claim_pending(limit=10, lease=30)
+    assert [event.id for event in second] == [event.id for event in first]
+    assert second[0].locked_by != first[0].locked_by
+
+
+async def test_release_and_mark_delivered(db):
+    repo = OutboxRepository()
+    await repo.add([_event(), _event()])
+    delivered, failed = await repo.claim_pending(limit=10, lease=30)
+
+    await repo.mark_delivered([delivered.id])
+    await repo.release([failed.id])
+
+    assert [event.id for event in await repo.claim_pending(10, 30)] == [failed.id]
+
+
+@pytest.fixture
+async def chat(db):
+    await UserReplica(user_id=10, username="user10", is_active=True).insert()
+    await ChatReplica(chat_id=1, members=[10], active_members=[10]).insert()
+
+
+async def test_message_events_go_through_outbox_in_order(chat):
+    service = get_message_service()
+    dto = await service.insert(user_id=10, chat_id=1, content="a", request_id="r1")
+    message_id = str(dto.message.id)
+    await service.update(message_id, "b", request_id="r2", sender_id=10)
+    await service.add_reaction(message_id, "+1", author=10)
+    await service.remove_reaction(message_id, "+1", author=10)
+    await service.delete(message_id, request_id="r3", sender_id=10)
+    await background_tasks.drain()
+
+    events = await OutboxEvent.find_all().sort(OutboxEvent.id).to_list()
+    assert [json.loads(event.body)["event_type"] for event in events] == [
+        "MessageCreated",
+        "MessageUpdated",
+        "ReactionAdded",
+        "ReactionRemoved",
+        "MessageDeleted",
+    ]
+    assert {bytes(event.key) for event in events} == {b"1"}
+    assert "event-version" not in events[1].headers
@@ -0,0 +1,59 @@
+import asyncio
+
+from bson import ObjectId
+
+from src.services.read_buffer import ReadCoalescer
+
+
+class FakeMessageService:
+    def __init__(self, fail_chat: int | None = None):
+        self.fail_chat = fail_chat
+        self.marked: list[tuple[int, int, str]] = []
+        self.running = self.max_running = 0
+
+    async def mark_as_read(self, chat_id: int, user_id: int, message_id: str):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0)
+        self.running -= 1
+        if chat_id == self.fail_chat:
+            raise RuntimeError("db down")
+        self.marked.append((chat_id, user_id, message_id))
+
+
+async def test_keeps_furthest_cursor_per_pair():
+    service = FakeMessageService()
+    coalescer = ReadCoalescer(service, flush_interval=60, concurrency=4)
+    first, second, other = ObjectId(), ObjectId(), ObjectId()
+
+    coalescer.add(1, 10, str(second))
+    coalescer.add(1, 10, str(first))
+    coalescer.add(2, 10, str(other))
+    coalescer.add(1, 10, "not-an-id")
+    await coalescer.flush()
+
+    assert sorted(service.marked) == [(1, 10, str(second)), (2, 10, str(other))]
+    assert coalescer.pending == {}
+
+
+async def test_flush_respects_concurrency_and_survives_errors():
+    service = FakeMessageService(fail_chat=0)
+    coalescer = ReadCoalescer(service, flush_interval=60, concurrency=2)
+    for chat_id in range(6):
+        coalescer.add(chat_id, 10, str(ObjectId()))
+
+    await coalescer.flush()
+
+    assert service.max_running == 2
+    assert sorted(chat_id for chat_id, _, _ in service.marked) == [1, 2, 3, 4, 5]
+
+
+async def test_stop_flushes_pending():
+    service = FakeMessageService()
+    coalescer = ReadCoalescer(service, flush_interval=60, concurrency=4)
+    await coalescer.start()
+    coalescer.add(1, 10, str(ObjectId()))
+
+    await coalescer.stop()
+
+    assert len(service.marked) == 1
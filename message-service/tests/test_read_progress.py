@@ -0,0 +1,56 @@
+import pytest
+from bson import ObjectId
+
+from src.models import Message, ReadProgress
+from src.repositories.read_progress import ReadProgressRepository
+
+
+async def cursor(chat_id: int, user_id: int) -> ObjectId | None:
+    progress = await ReadProgress.find_one(
+        ReadProgress.chat_id == chat_id, ReadProgress.user_id == user_id
+    )
+    return progress.last_read_message_id if progress else None
+
+
+async def test_cursor_only_moves_forward(db):
+    repo = ReadProgressRepository()
+    older, newer = ObjectId(), ObjectId()
+
+    await repo.set_last_read_message(1, 10, str(newer), verify=False)
+    await repo.set_last_read_message(1, 10, str(older), verify=False)
+
+    assert await cursor(1, 10) == newer
+    assert await ReadProgress.find_all().count() == 1
+
+
+async def test_reset_unread_on_upsert(db):
+    repo = ReadProgressRepository()
+    await ReadProgress(chat_id=1, user_id=10, unread_count=4).insert()
+
+    await repo.set_last_read_message(
+        1, 10, str(ObjectId()), reset_unread=True, verify=False
+    )
+
+    progress = await ReadProgress.find_one(ReadProgress.user_id == 10)
+    assert progress.unread_count == 0
+
+
+async def test_cursor_to_missing_message_is_rejected(db):
+    repo = ReadProgressRepository()
+    message = Message(chat_id=2, user_id=20, content="x")
+    await message.insert()
+
+    with pytest.raises(ValueError):
+        await repo.set_last_read_message(1, 10, str(message.id))
+    assert await cursor(1, 10) is None
+
+
+async def test_set_last_read_many_keeps_furthest_cursor(db):
+    repo = ReadProgressRepository()
+    first, second = ObjectId(), ObjectId()
+
+    await repo.set_last_read_many([(1, 10, str(second)), (1, 20, str(first))])
+    await repo.set_last_read_many([(1, 10, str(first)), (1, 20, str(second))])
+
+    assert await cursor(1, 10) == second
+    assert await cursor(1, 20) == second
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from src.core.deps import get_message_service
+from src.core.tasks import background_tasks
+from src.models import OutboxEvent
+from src.models.replications import ChatReplica, UserReplica
+
+
+@pytest.fixture
+async def chat(db):
+    for user_id in (10, 20, 30):
+        await UserReplica(
+            user_id=user_id, username=f"user{user_id}", is_active=True
+        ).insert()
+    await ChatReplica(chat_id=1, members=[10, 20], active_members=[10, 20]).insert()
+    await ChatReplica(
+        chat_id=2, members=[10, 20, 30], active_members=[10, 20, 30]
+    ).insert()
+
+
+async def read_events() -> list[dict]:
+    events = await OutboxEvent.find_all().sort(OutboxEvent.id).to_list()
+    bodies = [json.loads(event.body) for event in events]
+    return [body for body in bodies if body["event_type"] == "MessagesRead"]
+
+
+async def test_author_gets_receipt_when_other_member_reads(chat):
+    service = get_message_service()
+    sent = await service.insert(user_id=10, chat_id=1, content="hi", request_id="r1")
+    await background_tasks.drain()
+
+    await service.mark_as_read(chat_id=1, user_id=20, message_id=str(sent.message.id))
+
+    assert [event["data"] for event in await read_events()] == [
+        [{"id": str(sent.message.id), "sender_id": 10}]
+    ]
+
+
+async def test_no_second_receipt_once_someone_has_read(chat):
+    service = get_message_service()
+    sent = await service.insert(user_id=10, chat_id=2, content="hi", request_id="r1")
+    await background_tasks.drain()
+    message_id = str(sent.message.id)
+
+    await service.mark_as_read(chat_id=2, user_id=20, message_id=message_id)
+    await service.mark_as_read(chat_id=2, user_id=30, message_id=message_id)
+
+    assert len(await read_events()) == 1
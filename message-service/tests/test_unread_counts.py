@@ -0,0 +1,68 @@
+from src.core.deps import get_message_service
+from src.models import Message, ReadProgress
+from src.models.replications import ChatReplica
+
+
+async def add_messages(chat_id: int, user_id: int, count: int) -> list[Message]:
+    messages = []
+    for i in range(count):
+        message = Message(chat_id=chat_id, user_id=user_id, content=str(i))
+        await message.insert()
+        messages.append(message)
+    return messages
+
+
+async def add_chats(*chats: tuple[int, list[int]]) -> None:
+    for chat_id, members in chats:
+        await ChatReplica(
+            chat_id=chat_id, members=members, active_members=members
+        ).insert()
+
+
+async def test_counts_are_computed_once_and_stored(db):
+    service = get_message_service()
+    await add_chats((1, [10, 20]), (2, [10, 20]), (3, [10]))
+    read = await add_messages(chat_id=1, user_id=20, count=3)
+    await add_messages(chat_id=2, user_id=20, count=2)
+    await add_messages(chat_id=2, user_id=10, count=1)
+    await ReadProgress(chat_id=1, user_id=10, last_read_message_id=read[0].id).insert()
+
+    counts = await service.get_unread_counts(user_id=10, chat_ids=[1, 2, 3])
+    assert counts == {1: 2, 2: 2, 3: 0}
+
+    progresses = {
+        progress.chat_id: progress
+        for progress in await ReadProgress.find(ReadProgress.user_id == 10).to_list()
+    }
+    assert {chat_id: p.unread_count for chat_id, p in progresses.items()} == counts
+    assert progresses[1].last_read_message_id == read[0].id
+    assert progresses[2].last_read_message_id is None
+
+    # Второй вызов читает сохраненные счетчики
+    await Message.find(Message.chat_id == 2).delete()
+    assert await service.get_unread_counts(user_id=10, chat_ids=[1, 2, 3]) == counts
+
+
+async def test_existing_counter_is_not_overwritten(db):
+    service = get_message_service()
+    read = await add_messages(chat_id=1, user_id=20, count=3)
+    await ReadProgress(
+        chat_id=1, user_id=10, last_read_message_id=read[0].id, unread_count=5
+    ).insert()
+
+    await service.progress_repo.init_unread_many(10, {1: (read[0].id, 2)})
+    progress = await ReadProgress.find_one(ReadProgress.user_id == 10)
+    assert progress.unread_count == 5
+
+
+async def test_foreign_and_unknown_chats_get_zero_without_progress(db):
+    service = get_message_service()
+    await add_chats((1, [10, 20]), (4, [20, 30]))
+    await add_messages(chat_id=1, user_id=20, count=1)
+    await add_messages(chat_id=4, user_id=20, count=2)
+
+    counts = await service.get_unread_counts(user_id=10, chat_ids=[1, 4, 5])
+
+    assert counts == {1: 1, 4: 0, 5: 0}
+    progresses = await ReadProgress.find(ReadProgress.user_id == 10).to_list()
+    assert [progress.chat_id for progress in progresses] == [1]
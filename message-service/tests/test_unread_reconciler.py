@@ -0,0 +1,68 @@
+from bson import ObjectId
+
+from src.models import Message, ReadProgress
+from src.repositories.lease import LeaseRepository
+from src.repositories.message import MessageRepository
+from src.repositories.outbox import OutboxRepository
+from src.repositories.read_progress import ReadProgressRepository
+from src.services.unread import UnreadCounterReconciler
+
+
+def make_reconciler() -> UnreadCounterReconciler:
+    return UnreadCounterReconciler(
+        repo=MessageRepository(outbox_repo=OutboxRepository()),
+        progress_repo=ReadProgressRepository(),
+        lease_repo=LeaseRepository(),
+        batch_size=10,
+    )
+
+
+async def add_messages(chat_id: int, user_id: int, count: int) -> list[Message]:
+    messages = [
+        Message(chat_id=chat_id, user_id=user_id, content=str(i)) for i in range(count)
+    ]
+    for message in messages:
+        await message.insert()
+    return messages
+
+
+async def test_reconcile_fixes_drifted_counter(db):
+    messages = await add_messages(chat_id=1, user_id=20, count=3)
+    await ReadProgress(
+        chat_id=1, user_id=10, last_read_message_id=messages[0].id, unread_count=7
+    ).insert()
+
+    assert await make_reconciler().reconcile_batch() == 1
+    progress = await ReadProgress.find_one(ReadProgress.user_id == 10)
+    assert progress.unread_count == 2
+
+
+async def test_set_unread_keeps_concurrent_changes(db):
+    cursor = ObjectId()
+    await ReadProgress(
+        chat_id=1, user_id=10, last_read_message_id=cursor, unread_count=5
+    ).insert()
+    repo = ReadProgressRepository()
+    # После чтения записи пришло новое сообщение
+    await repo.increment_unread(chat_id=1, sender_id=20, count=1)
+
+    assert not await repo.set_unread(1, 10, 3, expected=5, cursor=cursor)
+    progress = await ReadProgress.find_one(ReadProgress.user_id == 10)
+    assert progress.unread_count == 6
+
+    assert await repo.set_unread(1, 10, 3, expected=6, cursor=cursor)
+
+
+async def test_lease_has_single_owner(db):
+    leases = LeaseRepository()
+    assert await leases.acquire("job", "a", ttl=60)
+    assert not await leases.acquire("job", "b", ttl=60)
+    # Владелец продлевает свою аренду
+    assert await leases.acquire("job", "a", ttl=60)
+
+
+async def test_expired_lease_moves_to_another_owner(db):
+    leases = LeaseRepository()
+    assert await leases.acquire("job", "a", ttl=-1)
+    assert await leases.acquire("job", "b", ttl=60)
+    assert not await leases.acquire("job", "a", ttl=60)
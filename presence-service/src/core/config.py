@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -31,4 +33,18 @@ class Settings(BaseSettings):
     KAFKA_HOST: str = 'localhost'
     KAFKA_PORT: int = 9092
 
+    # --- KAFKA PRODUCER ---
+    KAFKA_LINGER_MS: int = 5
+    KAFKA_MAX_BATCH_SIZE: int = 128 * 1024
+    KAFKA_COMPRESSION: Optional[Literal['gzip', 'snappy', 'lz4', 'zstd']] = 'gzip'
+
+    # --- PRESENCE ---
+    TTL_BATCH_SIZE: int = 500
+    TTL_WORKERS: int = 8
+    # ZSET дедлайнов как страховка от потерянных keyspace-уведомлений
+    PRESENCE_DEADLINE_SWEEP: bool = False
+    PRESENCE_SWEEP_INTERVAL: float = 5.0
+    # Полная пересборка индекса отношений как страховка от пропущенных событий
+    RELATION_INDEX_REBUILD_INTERVAL: float = 600.0
+
 settings = Settings()
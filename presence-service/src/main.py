@@ -7,12 +7,13 @@ from faststream import FastStream
 from protos import presence_pb2, presence_pb2_grpc
 from src.core.config import settings
 from src.routers.grpc import Presence
-from src.routers.kafka import broker
+from src.routers.kafka import broker, chat_service
 from src.services.ttl_listener import TtlListener
 
 app = FastStream(broker)
 server: grpc.aio.Server | None = None
 ttl_listener_task: asyncio.Task | None = None
+index_rebuild_task: asyncio.Task | None = None
 
 @app.on_startup
 async def startup():
@@ -28,8 +29,22 @@ async def startup():
     logger.info("Фоновая задача для прослушивания истечения срока действия ключа Redis запущена")
 
 
+@app.after_startup
+async def build_index():
+    # Подписчики индекса уже читают события: что придет во время сборки,
+    # попадет в журнал и будет применено поверх снимка из базы
+    global index_rebuild_task
+    await chat_service.build_index()
+    index_rebuild_task = asyncio.create_task(
+        chat_service.rebuild_index_periodically(settings.RELATION_INDEX_REBUILD_INTERVAL)
+    )
+
+
 @app.on_shutdown
 async def shutdown():
+    if index_rebuild_task:
+        index_rebuild_task.cancel()
+
     if ttl_listener_task:
         ttl_listener_task.cancel()
         try:
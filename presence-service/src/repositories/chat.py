@@ -1,7 +1,8 @@
 from loguru import logger
-from sqlalchemy import select, delete
+from sqlalchemy import Integer, any_, delete, func, literal, not_, select
+from sqlalchemy.orm import aliased
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 
 from src.models import ChatMemberReplica
 from src.decorators import with_session
@@ -9,18 +10,38 @@ from src.decorators import with_session
 
 class ChatRepository:
     @with_session
-    async def insert(self, chat_id: int, members: list[int], session: AsyncSession) -> None:
-        delete_stmt = delete(ChatMemberReplica).where(ChatMemberReplica.chat_id == chat_id)
-        await session.execute(delete_stmt)
+    async def insert(self, chat_id: int, members: list[int], session: AsyncSession) -> tuple[list[int], list[int]]:
+        """Приводит реплику чата к списку members, трогая только изменившиеся строки.
 
+        Возвращает (добавленные, удаленные) user_id.
+        """
+        members_param = literal(members, ARRAY(Integer))
+
+        delete_stmt = (
+            delete(ChatMemberReplica)
+            .where(
+                ChatMemberReplica.chat_id == chat_id,
+                not_(ChatMemberReplica.user_id == any_(members_param))
+            )
+            .returning(ChatMemberReplica.user_id)
+        )
+        removed = (await session.execute(delete_stmt)).scalars().all()
+
+        added = []
         if members:
-            stmt = (
+            insert_stmt = (
                 insert(ChatMemberReplica)
-                .values([{'chat_id': chat_id, 'user_id': user_id} for user_id in members])
+                .from_select(
+                    ['chat_id', 'user_id'],
+                    select(literal(chat_id), func.unnest(members_param))
+                )
                 .on_conflict_do_nothing(index_elements=['chat_id', 'user_id'])
+                .returning(ChatMemberReplica.user_id)
             )
-            await session.execute(stmt)
-            await session.commit()
+            added = (await session.execute(insert_stmt)).scalars().all()
+
+        await session.commit()
+        return added, removed
 
     @with_session
     async def get_relations(self, user_id: int, session: AsyncSession) -> list[ChatMemberReplica]:
@@ -37,6 +58,26 @@ class ChatRepository:
             )
         )
         return user_ids.scalars().all()
+
+    @with_session
+    async def get_memberships(self, user_ids: list[int], session: AsyncSession) -> list[tuple[int, int]]:
+        """Все пары (chat_id, user_id) чатов, в которых состоит кто-то из user_ids."""
+        member = aliased(ChatMemberReplica)
+        related = aliased(ChatMemberReplica)
+        rows = await session.execute(
+            select(related.chat_id, related.user_id)
+            .join(member, member.chat_id == related.chat_id)
+            .where(member.user_id.in_(user_ids))
+            .distinct()
+        )
+        return rows.tuples().all()
+
+    @with_session
+    async def get_all_memberships(self, session: AsyncSession) -> list[tuple[int, int]]:
+        rows = await session.execute(
+            select(ChatMemberReplica.chat_id, ChatMemberReplica.user_id)
+        )
+        return rows.tuples().all()
     
     @with_session
     async def delete_chat(self, chat_id: int, session: AsyncSession):
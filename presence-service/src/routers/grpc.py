@@ -25,6 +25,21 @@ class Presence(presence_pb2_grpc.PresenceServicer):
         await self.service.set_offline(request.id, self.broker)
         return empty_pb2.Empty()
     
+    @handle_exceptions
+    async def SetOnlineMany(self, request, context):
+        ids = list(request.ids)
+        logger.info(f"Поступил запрос на установку статуса online для {len(ids)} пользователей")
+        ttl = request.ttl if request.ttl else 60
+        await self.service.set_online_many(ids, self.broker, ttl)
+        return empty_pb2.Empty()
+
+    @handle_exceptions
+    async def SetOfflineMany(self, request, context):
+        ids = list(request.ids)
+        logger.info(f"Поступил запрос на установку статуса offline для {len(ids)} пользователей")
+        await self.service.set_offline_many(ids, self.broker)
+        return empty_pb2.Empty()
+
     @handle_exceptions
     async def RefreshOnline(self, request, context):
         logger.info(f"Поступил запрос на обновление статуса online для пользователя {request.id}")
@@ -32,6 +47,14 @@ class Presence(presence_pb2_grpc.PresenceServicer):
         await self.service.refresh_user_status(request.id, broker, ttl)
         return empty_pb2.Empty()
     
+    @handle_exceptions
+    async def RefreshOnlineMany(self, request, context):
+        ids = list(request.ids)
+        logger.info(f"Поступил запрос на обновление статуса online для {len(ids)} пользователей")
+        ttl = request.ttl if request.ttl else 60
+        await self.service.refresh_many(ids, self.broker, ttl)
+        return empty_pb2.Empty()
+
     @handle_exceptions
     async def GetUserStatus(self, request, context):
         logger.info(f"Поступил запрос на получение статуса для пользователя {request.id}")
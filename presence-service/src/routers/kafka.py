@@ -1,4 +1,5 @@
 from loguru import logger
+from faststream import AckPolicy
 from faststream.kafka import KafkaBroker
 from pydantic import TypeAdapter
 
@@ -6,8 +7,14 @@ from src.core.config import settings
 from src.schemas.chat import ChatEvent
 from src.schemas.user import UserEvent
 from src.services.chat import ChatService
+from src.services.relations import relation_index
 
-broker = KafkaBroker(f"{settings.KAFKA_HOST}:{settings.KAFKA_PORT}")
+broker = KafkaBroker(
+    f"{settings.KAFKA_HOST}:{settings.KAFKA_PORT}",
+    linger_ms=settings.KAFKA_LINGER_MS,
+    max_batch_size=settings.KAFKA_MAX_BATCH_SIZE,
+    compression_type=settings.KAFKA_COMPRESSION,
+)
 chat_service = ChatService()
 
 @broker.subscriber(
@@ -39,3 +46,27 @@ async def chat_event(data: ChatEvent):
         )
     elif event == 'ChatDeleted':
         await chat_service.delete_chat(data.id)
+
+# Индекс отношений есть у каждого экземпляра, поэтому его подписчики читают
+# все партиции без consumer group: ни офсетов, ни брошенных групп после
+# смены хоста. Читаем с конца - состояние на старте дает build_index.
+@broker.subscriber(
+        'user.events',
+        auto_offset_reset='latest',
+        ack_policy=AckPolicy.MANUAL
+    )
+async def user_index_event(data: UserEvent):
+    if data.event_type == 'UserDeactivated':
+        relation_index.remove_user(data.data.id)
+
+@broker.subscriber(
+        'chat.events',
+        auto_offset_reset='latest',
+        ack_policy=AckPolicy.MANUAL
+    )
+async def chat_index_event(data: ChatEvent):
+    data: ChatEvent = TypeAdapter(ChatEvent).validate_python(data)
+    if data.event_type == "ChatCreated" or data.event_type == "ChatUpdated":
+        relation_index.set_chat_members(data.data.id, data.data.members)
+    elif data.event_type == 'ChatDeleted':
+        relation_index.remove_chat(data.data.id)
@@ -1,6 +1,9 @@
+import asyncio
+
 from loguru import logger
 
 from src.repositories.chat import ChatRepository
+from src.services.relations import relation_index
 from src.models import ChatMemberReplica
 from src.schemas.chat import ChatData, IdSchema
 
@@ -8,19 +11,43 @@ from src.schemas.chat import ChatData, IdSchema
 class ChatService():
     def __init__(self):
         self.repo = ChatRepository()
+        self.index = relation_index
 
-    async def insert(self, chat_id: int, members: list) -> None:
+    async def insert(self, chat_id: int, members: list) -> tuple[list[int], list[int]]:
         logger.info(f"Вставляем пользователей в чат {chat_id}")
-        print(chat_id, members)
-        await self.repo.insert(chat_id, members)
-        logger.info(f"Список участников чата {chat_id} обновлен")
+        added, removed = await self.repo.insert(chat_id, members)
+        logger.info(f"Список участников чата {chat_id} обновлен: +{len(added)}, -{len(removed)}")
+        return added, removed
+
+    async def build_index(self) -> None:
+        logger.info("Строим индекс отношений пользователей")
+        self.index.begin_rebuild()
+        try:
+            memberships = await self.repo.get_all_memberships()
+            self.index.rebuild(memberships)
+        finally:
+            self.index.journal = None
+
+    async def rebuild_index_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.build_index()
+            except Exception as e:
+                logger.error(f"Не удалось пересобрать индекс отношений: {e}")
 
     async def get_relations(self, user_id: int) -> list[int]:
-        logger.info(f"Получаем все отношения пользователя {user_id}")
-        result = await self.repo.get_relations(user_id)
-        logger.info(f"Отношения пользователя {user_id} получены")
-        return result
+        result = await self.get_relations_many([user_id])
+        return result[user_id]
     
+    async def get_relations_many(self, user_ids: list[int]) -> dict[int, list[int]]:
+        missing = self.index.missing(user_ids)
+        if missing:
+            logger.info(f"Догружаем отношения для {len(missing)} пользователей из базы")
+            memberships = await self.repo.get_memberships(missing)
+            self.index.load(missing, memberships)
+        return {user_id: self.index.relations(user_id) for user_id in user_ids}
+
     async def delete_chat(self, chat_id: int) -> None:
         logger.info(f"Удаляем чат {chat_id}")
         await self.repo.delete_chat(chat_id)
@@ -1,36 +1,62 @@
+import asyncio
+import time
+
 from loguru import logger
 from faststream.kafka import KafkaBroker
 
 from src.db.redis import redis
+from src.core.config import settings
 from src.services.chat import ChatService
 from src.schemas.presence import PresenceEvent
 
+# ZSET user_id -> unix-время, после которого статус считается истекшим
+DEADLINES_KEY = 'presence_deadlines'
+
 class PresenceService:
-    def __init__(self):
+    def __init__(self, track_deadlines: bool = settings.PRESENCE_DEADLINE_SWEEP):
         self.redis = redis
         self.chat_service = ChatService()
+        self.track_deadlines = track_deadlines
+
+    async def _publish_statuses(self, user_ids: list[int], status: str, broker: KafkaBroker):
+        relations = await self.chat_service.get_relations_many(user_ids)
+        events = [
+            PresenceEvent(
+                user_id=user_id,
+                status=status,
+                recievers=relations[user_id]
+            )
+            for user_id in user_ids if relations.get(user_id)
+        ]
+        if events:
+            # Продюсер сам склеивает одновременные отправки в батчи по партициям
+            # Ключ user_id: статусы одного пользователя не обгоняют друг друга
+            await asyncio.gather(*(
+                broker.publish(event, 'presence.status', key=str(event.user_id).encode())
+                for event in events
+            ))
+            logger.info(f"Отправлено {len(events)} уведомлений об изменении статуса ({status})")
 
     async def set_online(self, user_id: int, broker: KafkaBroker, ttl: int = 60):
+        await self.set_online_many([user_id], broker, ttl)
+
+    async def set_online_many(self, user_ids: list[int], broker: KafkaBroker, ttl: int = 60):
+        if not user_ids:
+            return
+
         try:
-            logger.info(f"Устанавливаем online-сатус для пользователя {user_id}")
-            key = f"user_status:{user_id}"
-            await self.redis.set(key, 'online', ex=ttl)
+            logger.info(f"Устанавливаем online-сатус для {len(user_ids)} пользователей")
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for user_id in user_ids:
+                    pipe.set(f"user_status:{user_id}", 'online', ex=ttl)
+                if self.track_deadlines:
+                    pipe.zadd(DEADLINES_KEY, {user_id: time.time() + ttl for user_id in user_ids})
+                await pipe.execute()
         except Exception as e:
             logger.error(f"{e}")
 
-        logger.info(f"Пользователь {user_id} установлен как онлайн с TTL {ttl}с")
-
-        recievers = await self.chat_service.get_relations(user_id)
-        print(recievers)
-        if recievers:
-            await broker.publish(
-                PresenceEvent(
-                    user_id=user_id,
-                    status='online',
-                    recievers=recievers
-                ), 'presence.status'
-            )
-            logger.info(f"Уведомление об изменении статуса пользователя {user_id} отправлено")
+        logger.info(f"{len(user_ids)} пользователей установлены как онлайн с TTL {ttl}с")
+        await self._publish_statuses(user_ids, 'online', broker)
 
     async def refresh_user_status(self, user_id: int, broker: KafkaBroker, ttl_seconds: int = 60):
         key = f"user_status:{user_id}"
@@ -39,23 +65,72 @@ class PresenceService:
             await self.set_online(user_id, broker, ttl_seconds)
         print(f"TTL пользователя {user_id} обновлен до {ttl_seconds}с")
 
-    
+    async def refresh_many(self, user_ids: list[int], broker: KafkaBroker, ttl_seconds: int = 60):
+        if not user_ids:
+            return
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.expire(f"user_status:{user_id}", ttl_seconds)
+            if self.track_deadlines:
+                # xx: не возвращаем в ZSET тех, кого уже забрал sweep
+                pipe.zadd(DEADLINES_KEY, {user_id: time.time() + ttl_seconds for user_id in user_ids}, xx=True)
+            results = await pipe.execute()
+
+        expired = [user_id for user_id, refreshed in zip(user_ids, results) if not refreshed]
+        await self.set_online_many(expired, broker, ttl_seconds)
+        logger.info(f"TTL обновлен для {len(user_ids)} пользователей, заново в сети: {len(expired)}")
+
     async def set_offline(self, user_id: int, broker: KafkaBroker):
-        logger.info(f"Удаляем online-сатус для пользователя {user_id}")
-        key = f"user_status:{user_id}"
-        await self.redis.delete(key)
-
-        recievers = await self.chat_service.get_relations(user_id)
-        if recievers:
-            event = PresenceEvent(
-                    user_id=user_id,
-                    status='offline',
-                    recievers=recievers
-                )
-            await broker.publish(event, 'presence.status')
-            logger.info(f"Уведомление об изменении статуса пользователя {user_id} отправлено")
-
-        logger.info(f"Пользователь {user_id} теперь оффлайн")
+        await self.set_offline_many([user_id], broker)
+
+    async def set_offline_many(self, user_ids: list[int], broker: KafkaBroker):
+        if not user_ids:
+            return
+
+        logger.info(f"Удаляем online-сатус для {len(user_ids)} пользователей")
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.delete(*[f"user_status:{user_id}" for user_id in user_ids])
+            if self.track_deadlines:
+                pipe.zrem(DEADLINES_KEY, *user_ids)
+            await pipe.execute()
+
+        await self._publish_statuses(user_ids, 'offline', broker)
+        logger.info(f"{len(user_ids)} пользователей теперь оффлайн")
+
+    async def claim_expired(self, user_ids: list[int]) -> list[int]:
+        """Оставляет только тех, чей дедлайн удалось снять из ZSET.
+
+        Так keyspace-уведомление и sweep (или несколько экземпляров сервиса)
+        не переводят одного пользователя в offline дважды.
+        """
+        if not self.track_deadlines or not user_ids:
+            return user_ids
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.zrem(DEADLINES_KEY, user_id)
+            removed = await pipe.execute()
+        return [user_id for user_id, was_removed in zip(user_ids, removed) if was_removed]
+
+    async def pop_overdue(self, limit: int) -> list[int]:
+        """Забирает из ZSET пользователей с просроченным дедлайном."""
+        now = time.time()
+        members = await self.redis.zrangebyscore(DEADLINES_KEY, '-inf', now, start=0, num=limit)
+        claimed = await self.claim_expired([int(member) for member in members])
+        if not claimed:
+            return []
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for user_id in claimed:
+                pipe.pttl(f"user_status:{user_id}")
+            ttls = await pipe.execute()
+
+        # Ключ еще жив (дедлайн отстал от TTL) - возвращаем его в ZSET
+        alive = {user_id: now + pttl / 1000 for user_id, pttl in zip(claimed, ttls) if pttl > 0}
+        if alive:
+            await self.redis.zadd(DEADLINES_KEY, alive)
+        return [user_id for user_id in claimed if user_id not in alive]
 
     async def get_user_status(self, user_id: int) -> str:
         key = f"user_status:{user_id}"
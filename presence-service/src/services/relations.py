@@ -0,0 +1,95 @@
+from collections import defaultdict
+from typing import Callable, Iterable
+
+from loguru import logger
+
+
+class RelationIndex:
+    """Индекс членства в чатах в памяти процесса.
+
+    Хранит chat_id -> участники и user_id -> чаты, так что получатели
+    статуса пользователя собираются из его чатов без запроса в Postgres.
+    Пользователь, которого нет в индексе, считается промахом: его членство
+    догружается из базы, после чего он остается в индексе (в том числе с
+    пустым набором чатов).
+
+    Пока идет пересборка, изменения из Kafka пишутся в журнал и повторяются
+    поверх снимка из базы, чтобы события, пришедшие во время чтения, не
+    потерялись.
+    """
+
+    def __init__(self):
+        self.chat_members: dict[int, set[int]] = {}
+        self.user_chats: dict[int, set[int]] = {}
+        self.journal: list[tuple[Callable, tuple]] | None = None
+
+    def begin_rebuild(self):
+        self.journal = []
+
+    def rebuild(self, memberships: Iterable[tuple[int, int]]):
+        chat_members = defaultdict(set)
+        user_chats = defaultdict(set)
+        for chat_id, user_id in memberships:
+            chat_members[chat_id].add(user_id)
+            user_chats[user_id].add(chat_id)
+        self.chat_members = dict(chat_members)
+        self.user_chats = dict(user_chats)
+        journal, self.journal = self.journal or [], None
+        for method, args in journal:
+            method(*args)
+        logger.info(
+            f"Индекс отношений построен: {len(self.chat_members)} чатов, "
+            f"{len(self.user_chats)} пользователей, "
+            f"событий из журнала {len(journal)}"
+        )
+
+    def load(self, user_ids: list[int], memberships: Iterable[tuple[int, int]]):
+        """Добавляет членство, догруженное из базы для промахнувшихся пользователей.
+
+        Записи user_chats создаются только для запрошенных пользователей:
+        у остальных участников загружены не все чаты, и они должны остаться
+        промахами.
+        """
+        queried = set(user_ids)
+        for user_id in queried:
+            self.user_chats.setdefault(user_id, set())
+        for chat_id, user_id in memberships:
+            self.chat_members.setdefault(chat_id, set()).add(user_id)
+            if user_id in queried:
+                self.user_chats[user_id].add(chat_id)
+
+    def set_chat_members(self, chat_id: int, members: list[int]):
+        if self.journal is not None:
+            self.journal.append((self.set_chat_members, (chat_id, members)))
+        old = self.chat_members.pop(chat_id, set())
+        new = set(members)
+        for user_id in old - new:
+            self.user_chats.get(user_id, set()).discard(chat_id)
+        for user_id in new - old:
+            self.user_chats.setdefault(user_id, set()).add(chat_id)
+        if new:
+            self.chat_members[chat_id] = new
+
+    def remove_chat(self, chat_id: int):
+        self.set_chat_members(chat_id, [])
+
+    def remove_user(self, user_id: int):
+        if self.journal is not None:
+            self.journal.append((self.remove_user, (user_id,)))
+        for chat_id in self.user_chats.pop(user_id, set()):
+            members = self.chat_members.get(chat_id)
+            if members is not None:
+                members.discard(user_id)
+
+    def missing(self, user_ids: list[int]) -> list[int]:
+        return [user_id for user_id in user_ids if user_id not in self.user_chats]
+
+    def relations(self, user_id: int) -> list[int]:
+        related = set()
+        for chat_id in self.user_chats.get(user_id, ()):
+            related.update(self.chat_members.get(chat_id, ()))
+        related.discard(user_id)
+        return list(related)
+
+
+relation_index = RelationIndex()
@@ -3,32 +3,96 @@ from loguru import logger
 from faststream.kafka import KafkaBroker
 
 from src.db.redis import redis
+from src.core.config import settings
 from src.services.presence import PresenceService
 
 
 class TtlListener:
-    def __init__(self, broker: KafkaBroker):
+    """Переводит в offline пользователей с истекшим статусом.
+
+    Keyspace-уведомления вычитываются пачками до `batch_size` штук и
+    складываются в ограниченную очередь, которую разбирают `workers`
+    обработчиков через set_offline_many. При включенном
+    PRESENCE_DEADLINE_SWEEP раз в `sweep_interval` секунд дополнительно
+    просматривается ZSET дедлайнов, так что потерянное уведомление не
+    оставляет пользователя онлайн навсегда.
+    """
+
+    def __init__(
+        self,
+        broker: KafkaBroker,
+        batch_size: int = settings.TTL_BATCH_SIZE,
+        workers: int = settings.TTL_WORKERS,
+        sweep: bool = settings.PRESENCE_DEADLINE_SWEEP,
+        sweep_interval: float = settings.PRESENCE_SWEEP_INTERVAL,
+    ):
         self.redis = redis
         self.pubsub = self.redis.pubsub()
         self.presence_service = PresenceService()
         self.broker = broker
+        self.batch_size = batch_size
+        self.workers = workers
+        self.sweep = sweep
+        self.sweep_interval = sweep_interval
+        self.queue: asyncio.Queue[list[int]] = asyncio.Queue(maxsize=workers * 2)
 
     async def listen(self):
         logger.info("Запуск прослушивания истечения срока действия ключа Redis")
         await self.pubsub.psubscribe("__keyevent@0__:expired")
+        tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if self.sweep:
+            tasks.append(asyncio.create_task(self._sweep()))
+        try:
+            while True:
+                try:
+                    user_ids = await self._read_batch()
+                    if user_ids:
+                        await self.queue.put(await self.presence_service.claim_expired(user_ids))
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Ошибка в прослушивателе TTL: {e}")
+                    await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            logger.info("Прослушиватель TTL остановлен")
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.pubsub.aclose()
+
+    async def _read_batch(self) -> list[int]:
+        # Ждем первое уведомление, остальные забираем из буфера без ожидания
+        user_ids = []
+        message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+        while message is not None:
+            if message['type'] == 'pmessage':
+                key = message['data'].decode('utf-8')
+                if key.startswith("user_status:"):
+                    user_ids.append(int(key.split(":")[1]))
+            if len(user_ids) >= self.batch_size:
+                break
+            message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=0)
+        return user_ids
+
+    async def _worker(self):
         while True:
+            user_ids = await self.queue.get()
             try:
-                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
-                if message and message['type'] == 'pmessage':
-                    key = message['data'].decode('utf-8')
-                    if key.startswith("user_status:"):
-                        user_id = int(key.split(":")[1])
-                        logger.info(f"Срок действия ключа истек для пользователя {user_id}")
-                        await self.presence_service.set_offline(user_id, self.broker)
-                await asyncio.sleep(0.01)
-            except asyncio.CancelledError:
-                logger.info("Прослушиватель TTL остановлен")
-                break
+                if user_ids:
+                    logger.info(f"Срок действия статуса истек для {len(user_ids)} пользователей")
+                    await self.presence_service.set_offline_many(user_ids, self.broker)
             except Exception as e:
-                logger.error(f"Ошибка в прослушивателе TTL: {e}")
+                logger.error(f"Ошибка перевода пользователей в offline: {e}")
+            finally:
+                self.queue.task_done()
 
+    async def _sweep(self):
+        logger.info(f"Проверка дедлайнов присутствия запущена, интервал {self.sweep_interval}с")
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                while user_ids := await self.presence_service.pop_overdue(self.batch_size):
+                    await self.queue.put(user_ids)
+            except Exception as e:
+                logger.error(f"Ошибка проверки дедлайнов присутствия: {e}")
@@ -0,0 +1,11 @@
+import os
+
+# Настройки читаются при импорте модулей сервиса, сами базы в тестах не нужны
+for name, value in {
+    'POSTGRES_USER': 'test',
+    'POSTGRES_PASSWORD': 'test',
+    'POSTGRES_HOST': 'localhost',
+    'POSTGRES_PORT': '5432',
+    'POSTGRES_DB': 'test',
+}.items():
+    os.environ.setdefault(name, value)
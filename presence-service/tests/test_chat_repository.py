@@ -0,0 +1,57 @@
+from sqlalchemy.dialects import postgresql
+
+from src.repositories.chat import ChatRepository
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    # Postgres в тестах нет: проверяем сами запросы и порядок работы с сессией
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return FakeResult(self.results.pop(0))
+
+    async def commit(self):
+        self.commits += 1
+
+
+async def test_insert_touches_only_changed_members():
+    session = FakeSession([12], [13])
+    insert = ChatRepository.insert.__wrapped__
+
+    added, removed = await insert(ChatRepository(), 1, [10, 11, 13], session=session)
+
+    assert (added, removed) == ([13], [12])
+    assert session.commits == 1
+    delete_sql, insert_sql = session.statements
+    # Удаляются только участники, которых нет в новом списке
+    assert 'NOT (chat_member_replica.user_id = ANY' in delete_sql
+    assert delete_sql.endswith('RETURNING chat_member_replica.user_id')
+    assert 'unnest' in insert_sql
+    assert 'ON CONFLICT (chat_id, user_id) DO NOTHING' in insert_sql
+    assert 'RETURNING' in insert_sql
+
+
+async def test_insert_without_members_only_deletes():
+    session = FakeSession([10, 11])
+    insert = ChatRepository.insert.__wrapped__
+
+    added, removed = await insert(ChatRepository(), 1, [], session=session)
+
+    assert (added, removed) == ([], [10, 11])
+    assert len(session.statements) == 1
+    assert session.commits == 1
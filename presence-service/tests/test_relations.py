@@ -0,0 +1,84 @@
+import asyncio
+
+from src.services.chat import ChatService
+from src.services.relations import RelationIndex
+
+
+def test_relations_from_rebuild():
+    index = RelationIndex()
+    index.rebuild([(1, 10), (1, 11), (2, 10), (2, 12)])
+    assert sorted(index.relations(10)) == [11, 12]
+    assert index.missing([10, 13]) == [13]
+
+
+def test_load_keeps_co_members_missing():
+    index = RelationIndex()
+    # Пользователь 10 промахнулся: загружены его чаты со всеми участниками
+    index.load([10], [(1, 10), (1, 11)])
+    assert index.relations(10) == [11]
+    # У 11 могут быть другие чаты, значит он остается промахом
+    assert index.missing([11]) == [11]
+    index.load([11], [(1, 10), (1, 11), (3, 11), (3, 12)])
+    assert sorted(index.relations(11)) == [10, 12]
+
+
+def test_load_remembers_users_without_chats():
+    index = RelationIndex()
+    index.load([10], [])
+    assert index.missing([10]) == []
+    assert index.relations(10) == []
+
+
+def test_set_chat_members_applies_diff():
+    index = RelationIndex()
+    index.rebuild([(1, 10), (1, 11), (2, 11), (2, 12)])
+    index.set_chat_members(1, [10, 12])
+    assert index.relations(11) == [12]
+    assert sorted(index.relations(12)) == [10, 11]
+    index.remove_chat(2)
+    assert index.relations(11) == []
+    index.remove_user(10)
+    assert index.relations(12) == []
+
+
+class SlowRepo:
+    def __init__(self, memberships):
+        self.memberships = memberships
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def get_all_memberships(self):
+        self.started.set()
+        await self.release.wait()
+        return self.memberships
+
+
+async def test_events_during_rebuild_are_replayed():
+    service = ChatService()
+    service.index = RelationIndex()
+    service.repo = SlowRepo([(1, 10), (1, 11)])
+
+    build = asyncio.create_task(service.build_index())
+    await service.repo.started.wait()
+    # Событие из Kafka пришло после чтения снимка из базы
+    service.index.set_chat_members(1, [10, 12])
+    service.repo.release.set()
+    await build
+
+    assert service.index.relations(10) == [12]
+    assert service.index.journal is None
+
+
+async def test_failed_rebuild_stops_journal():
+    class FailingRepo:
+        async def get_all_memberships(self):
+            raise RuntimeError('db down')
+
+    service = ChatService()
+    service.index = RelationIndex()
+    service.repo = FailingRepo()
+    try:
+        await service.build_index()
+    except RuntimeError:
+        pass
+    assert service.index.journal is None
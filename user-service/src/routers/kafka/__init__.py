@@ -2,4 +2,9 @@ from faststream.kafka import KafkaBroker
 
 from src.core.config import settings
 
-broker = KafkaBroker(f"{settings.KAFKA_HOST}:{settings.KAFKA_PORT}")
+broker = KafkaBroker(
+    f"{settings.KAFKA_HOST}:{settings.KAFKA_PORT}",
+    linger_ms=settings.KAFKA_LINGER_MS,
+    max_batch_size=settings.KAFKA_MAX_BATCH_SIZE,
+    compression_type=settings.KAFKA_COMPRESSION,
+)
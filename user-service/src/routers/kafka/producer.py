@@ -12,11 +12,17 @@ class KafkaPublisher:
         self.broker = broker
         self.topic = topic
 
+    @staticmethod
+    def _key(user_id: int) -> bytes:
+        # События одного пользователя попадают в одну партицию по порядку
+        return str(user_id).encode()
+
     async def create(self, data: UserData) -> None:
         event_data = UserCreatedEvent(data=data)
         await self.broker.publish(
             message=event_data,
-            topic=self.topic
+            topic=self.topic,
+            key=self._key(data.id)
         )
         logger.info(f"Уведомление о создании пользователя {data.id} отправлено")
 
@@ -24,7 +30,8 @@ class KafkaPublisher:
         event_data = UserUpdatedEvent(data=data)
         await self.broker.publish(
             message=event_data,
-            topic=self.topic
+            topic=self.topic,
+            key=self._key(data.id)
         )
         logger.info(f"Уведомление об обновлении пользователя {data.id} отправлено")
 
@@ -32,6 +39,7 @@ class KafkaPublisher:
         event_data = UserDeactivateEvent(data=data)
         await self.broker.publish(
             message=event_data,
-            topic=self.topic
+            topic=self.topic,
+            key=self._key(data.id)
         )
         logger.info(f'Отправлено уведомление об удалении пользователя {data.id}')